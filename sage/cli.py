@@ -12,7 +12,7 @@ from rich.table import Table
 from rich.panel import Panel
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
-from .core.sage_main import SageApplication
+from .core.sage_main import SageApplication, use_uvloop
 from .config.loader import ConfigLoader
 
 
@@ -296,6 +296,7 @@ def run(
     
     try:
         sage = SageApplication(config)
+        use_uvloop()
         asyncio.run(sage.run())
     except KeyboardInterrupt:
         console.print("\n[yellow]Received interrupt signal, shutting down...[/yellow]")
@@ -652,6 +653,7 @@ def test(
             'fastapi': 'Web server',
             'uvicorn': 'ASGI server',
             'pydantic': 'Data validation',
+            'orjson': 'Fast JSON serialization',
             'typer': 'CLI framework',
             'rich': 'Terminal formatting'
         }
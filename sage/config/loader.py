@@ -79,7 +79,8 @@ class ConfigLoader:
                 "file_monitor_frequency": 5,
                 "background_frequency": 30,
                 "batch_update_interval": 120,
-                "max_concurrent_ops": 10
+                "max_concurrent_ops": 10,
+                "event_batch_interval": 0.25
             },
             "ui": {
                 "personality": {
@@ -89,7 +90,8 @@ class ConfigLoader:
                 "browser": {
                     "port": 8080,
                     "auto_open": True
-                }
+                },
+                "message_history_limit": 1000
             }
         }
         
@@ -1,5 +1,6 @@
 """Configuration models for Sage using Pydantic."""
 
+from functools import cached_property
 from typing import Dict, List, Optional, Any
 from pathlib import Path
 from pydantic import BaseModel, Field, validator
@@ -20,6 +21,11 @@ class ProjectConfig(BaseModel):
         if not path.is_dir():
             raise ValueError(f"Project path is not a directory: {path}")
         return path
+    
+    @cached_property
+    def path_str(self) -> str:
+        """Project path as a string, computed once."""
+        return str(self.path)
 
 
 class CrewConfig(BaseModel):
@@ -50,6 +56,7 @@ class PerformanceConfig(BaseModel):
     background_frequency: int = Field(default=30, ge=5, le=300)
     batch_update_interval: int = Field(default=120, ge=30, le=600)
     max_concurrent_ops: int = Field(default=10, ge=1, le=50)
+    event_batch_interval: float = Field(default=0.25, gt=0, le=10)
 
 
 class PersonalityConfig(BaseModel):
@@ -73,6 +80,7 @@ class UIConfig(BaseModel):
         "port": 8080,
         "auto_open": True
     })
+    message_history_limit: int = Field(default=1000, ge=10, le=100000)
 
 
 class SageConfig(BaseModel):
@@ -2,9 +2,11 @@
 
 import json
 import logging
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter, defaultdict
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Set
-from datetime import datetime
+from datetime import datetime, timedelta
 import hashlib
 from pydantic import BaseModel
 
@@ -39,6 +41,12 @@ class ContextStore:
             'domains': ['business-logic', 'integrations', 'security'],
             'solutions': ['common-issues', 'troubleshooting', 'best-practices']
         }
+        
+        # Running statistics, kept in step with self.contexts
+        self._category_counts: Dict[str, Counter] = defaultdict(Counter)
+        self._technology_counts: Counter = Counter()
+        self._updated_times: List[datetime] = []
+        
         self._ensure_directory_structure()
         self._load_contexts()
     
@@ -65,6 +73,30 @@ class ContextStore:
         return (self.store_path / context_item.category / 
                 context_item.subcategory / f"{context_item.id}.md")
     
+    def _track_statistics(self, context_item: ContextItem) -> None:
+        """Add a context item to the running statistics."""
+        self._category_counts[context_item.category][context_item.subcategory] += 1
+        self._technology_counts.update(context_item.technologies)
+        insort(self._updated_times, context_item.updated_at)
+    
+    def _untrack_statistics(self, context_item: ContextItem) -> None:
+        """Remove a context item from the running statistics."""
+        subcategories = self._category_counts[context_item.category]
+        subcategories[context_item.subcategory] -= 1
+        if subcategories[context_item.subcategory] <= 0:
+            del subcategories[context_item.subcategory]
+        if not subcategories:
+            del self._category_counts[context_item.category]
+        
+        for tech in context_item.technologies:
+            self._technology_counts[tech] -= 1
+            if self._technology_counts[tech] <= 0:
+                del self._technology_counts[tech]
+        
+        index = bisect_left(self._updated_times, context_item.updated_at)
+        if index < len(self._updated_times) and self._updated_times[index] == context_item.updated_at:
+            del self._updated_times[index]
+    
     def _load_contexts(self) -> None:
         """Load all contexts from the file system."""
         logging.info("Loading contexts from store...")
@@ -82,7 +114,10 @@ class ContextStore:
                     try:
                         context_item = self._load_context_file(context_file)
                         if context_item:
+                            if context_item.id in self.contexts:
+                                self._untrack_statistics(self.contexts[context_item.id])
                             self.contexts[context_item.id] = context_item
+                            self._track_statistics(context_item)
                             context_count += 1
                     except Exception as e:
                         logging.error(f"Error loading context file {context_file}: {e}")
@@ -126,6 +161,7 @@ class ContextStore:
                     
                     # Create context item
                     context_id = file_path.stem
+                    now = datetime.now()
                     return ContextItem(
                         id=context_id,
                         title=metadata.get('title', context_id),
@@ -134,8 +170,10 @@ class ContextStore:
                         subcategory=metadata.get('subcategory', file_path.parent.name),
                         tags=metadata.get('tags', []),
                         technologies=metadata.get('technologies', []),
-                        created_at=datetime.fromisoformat(metadata.get('created_at', datetime.now().isoformat())),
-                        updated_at=datetime.fromisoformat(metadata.get('updated_at', datetime.now().isoformat())),
+                        created_at=(datetime.fromisoformat(metadata['created_at'])
+                                    if 'created_at' in metadata else now),
+                        updated_at=(datetime.fromisoformat(metadata['updated_at'])
+                                    if 'updated_at' in metadata else now),
                         source=metadata.get('source', 'unknown'),
                         relevance_score=metadata.get('relevance_score', 0.0),
                         usage_count=metadata.get('usage_count', 0)
@@ -197,6 +235,7 @@ class ContextStore:
             raise ValueError(f"Invalid subcategory: {subcategory} for category: {category}")
         
         # Create context item
+        now = datetime.now()
         context_item = ContextItem(
             id=context_id,
             title=title,
@@ -205,13 +244,14 @@ class ContextStore:
             subcategory=subcategory,
             tags=tags or [],
             technologies=technologies or [],
-            created_at=datetime.now(),
-            updated_at=datetime.now(),
+            created_at=now,
+            updated_at=now,
             source=source
         )
         
         # Add to memory and save to file
         self.contexts[context_id] = context_item
+        self._track_statistics(context_item)
         self._save_context_file(context_item)
         
         logging.info(f"Added context: {context_id} - {title}")
@@ -223,6 +263,7 @@ class ContextStore:
             return False
         
         context_item = self.contexts[context_id]
+        self._untrack_statistics(context_item)
         
         # Update allowed fields
         allowed_updates = {'title', 'content', 'tags', 'technologies', 'relevance_score'}
@@ -231,6 +272,7 @@ class ContextStore:
                 setattr(context_item, key, value)
         
         context_item.updated_at = datetime.now()
+        self._track_statistics(context_item)
         
         # Save to file
         self._save_context_file(context_item)
@@ -250,8 +292,16 @@ class ContextStore:
         """Search for contexts matching criteria."""
         results = []
         query_lower = query.lower() if query else ""
+        tech_set = set(technologies) if technologies else None
+        tag_set = set(tags) if tags else None
         
         for context_item in self.contexts.values():
+            # Category filtering
+            if category and context_item.category != category:
+                continue
+            if subcategory and context_item.subcategory != subcategory:
+                continue
+            
             score = 0.0
             
             # Text matching
@@ -264,19 +314,13 @@ class ContextStore:
                     score += 2.0
             
             # Technology matching
-            if technologies:
-                tech_matches = len(set(technologies) & set(context_item.technologies))
+            if tech_set:
+                tech_matches = len(tech_set.intersection(context_item.technologies))
                 score += tech_matches * 2.0
             
-            # Category filtering
-            if category and context_item.category != category:
-                continue
-            if subcategory and context_item.subcategory != subcategory:
-                continue
-            
             # Tag matching
-            if tags:
-                tag_matches = len(set(tags) & set(context_item.tags))
+            if tag_set:
+                tag_matches = len(tag_set.intersection(context_item.tags))
                 score += tag_matches * 1.5
             
             if score > 0:
@@ -342,34 +386,22 @@ class ContextStore:
         
         # Remove from memory
         del self.contexts[context_id]
+        self._untrack_statistics(context_item)
         
         logging.info(f"Removed context: {context_id}")
         return True
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get statistics about the context store."""
-        stats = {
+        # Counters are maintained on add/update/remove, so this is a snapshot
+        # rather than a walk over every context item.
+        cutoff = datetime.now() - timedelta(days=7)
+        recent_activity = len(self._updated_times) - bisect_right(self._updated_times, cutoff)
+        
+        return {
             'total_contexts': len(self.contexts),
-            'categories': {},
-            'technologies': {},
-            'recent_activity': len([c for c in self.contexts.values() 
-                                  if (datetime.now() - c.updated_at).days < 7])
+            'categories': {category: dict(subcategories)
+                           for category, subcategories in self._category_counts.items()},
+            'technologies': dict(self._technology_counts),
+            'recent_activity': recent_activity
         }
-        
-        # Category statistics
-        for context_item in self.contexts.values():
-            category = context_item.category
-            subcategory = context_item.subcategory
-            
-            if category not in stats['categories']:
-                stats['categories'][category] = {}
-            if subcategory not in stats['categories'][category]:
-                stats['categories'][category][subcategory] = 0
-            stats['categories'][category][subcategory] += 1
-        
-        # Technology statistics
-        for context_item in self.contexts.values():
-            for tech in context_item.technologies:
-                stats['technologies'][tech] = stats['technologies'].get(tech, 0) + 1
-        
-        return stats
\ No newline at end of file
@@ -1,16 +1,40 @@
 """AWS Bedrock client for Sage LLM integration."""
 
-import json
 import logging
-from typing import Dict, Any, Optional, List
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import blake2b
+from typing import Dict, Any, Optional, List, Iterator, Tuple
 from pathlib import Path
 import boto3
+import orjson
+from botocore.config import Config
 from botocore.exceptions import ClientError, NoCredentialsError
 from pydantic import BaseModel
 
 from ..config.models import AWSConfig
 
 
+# Connection settings for bedrock-runtime: a larger keep-alive pool so
+# concurrent invocations reuse TLS connections, plus adaptive retries.
+_BOTOCORE_CONFIG = Config(
+    retries={"mode": "adaptive", "max_attempts": 5},
+    max_pool_connections=64,
+    tcp_keepalive=True,
+    read_timeout=120,
+)
+
+# bedrock-runtime clients shared by every BedrockClient with the same
+# profile and region, keyed by (profile_name, region)
+_CLIENTS: Dict[Tuple[str, str], Any] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+# System prompt file contents keyed by (path, mtime_ns), so instances only
+# re-read sage.prompt when it changes on disk
+_PROMPT_CACHE: Dict[Tuple[str, int], str] = {}
+
+
 class BedrockResponse(BaseModel):
     """Response from Bedrock API."""
     content: str
@@ -22,12 +46,38 @@ class BedrockResponse(BaseModel):
 class BedrockClient:
     """Client for interacting with AWS Bedrock."""
     
+    # Specialized instructions appended to the Sage base prompt
+    _ANALYZE_INSTRUCTION = (
+        "As an expert code analyst, analyze the provided code and extract "
+        "relevant information for project documentation."
+    )
+    _TECHS_INSTRUCTION = (
+        "As a technology identification expert, analyze project files "
+        "and identify all technologies, frameworks, and tools being used."
+    )
+    _MATCH_INSTRUCTION = (
+        "As a context matching specialist, given a project's technologies "
+        "and available context items, determine which context would be most valuable."
+    )
+    _CONFLICT_INSTRUCTION = (
+        "As a conflict resolution specialist, analyze conflicts objectively "
+        "and provide recommendations for resolution."
+    )
+    _EMOTION_INSTRUCTION = (
+        "As part of your personality system, determine the most appropriate "
+        "emotional expression based on the message and context."
+    )
+    
     def __init__(self, aws_config: AWSConfig):
         """Initialize Bedrock client with AWS configuration."""
         self.config = aws_config
         self.client = None
         self.default_system_prompt = None
+        self._response_cache: "OrderedDict[bytes, BedrockResponse]" = OrderedDict()
+        self._response_cache_size = self.config.bedrock.get("cache_size", 256)
+        self._response_cache_lock = threading.Lock()
         self._load_system_prompt()
+        self._build_system_prompts()
         self._initialize_client()
     
     def _load_system_prompt(self) -> None:
@@ -38,9 +88,14 @@ class BedrockClient:
             prompt_file = current_dir / "sage.prompt"
             
             if prompt_file.exists():
-                with open(prompt_file, 'r', encoding='utf-8') as f:
-                    self.default_system_prompt = f.read()
-                logging.info(f"Loaded system prompt from {prompt_file}")
+                key = (str(prompt_file), prompt_file.stat().st_mtime_ns)
+                cached = _PROMPT_CACHE.get(key)
+                if cached is None:
+                    cached = prompt_file.read_text(encoding='utf-8')
+                    _PROMPT_CACHE.clear()
+                    _PROMPT_CACHE[key] = cached
+                    logging.info(f"Loaded system prompt from {prompt_file}")
+                self.default_system_prompt = cached
             else:
                 logging.warning(f"sage.prompt file not found at {prompt_file}")
                 # Fallback to a basic system prompt
@@ -55,18 +110,35 @@ class BedrockClient:
                 "You provide clear, accurate, and helpful responses."
             )
     
+    def _build_system_prompts(self) -> None:
+        """Combine the Sage base prompt with each specialized instruction once."""
+        base = self.default_system_prompt + "\n\n"
+        self._sp_analyze = base + self._ANALYZE_INSTRUCTION
+        self._sp_techs = base + self._TECHS_INSTRUCTION
+        self._sp_match = base + self._MATCH_INSTRUCTION
+        self._sp_conflict = base + self._CONFLICT_INSTRUCTION
+        self._sp_emotion = base + self._EMOTION_INSTRUCTION
+    
     def _initialize_client(self) -> None:
         """Initialize the Bedrock runtime client using SSO credentials."""
         try:
             # Check if a specific profile is configured
             profile_name = getattr(self.config, 'profile', None) or 'poc'
             
-            # Use the specified profile (defaults to poc for Bedrock access)
-            session = boto3.Session(profile_name=profile_name)
-            self.client = session.client(
-                'bedrock-runtime',
-                region_name=self.config.region
-            )
+            # Reuse the client (and its connection pool) for an identical profile and region
+            key = (profile_name, self.config.region)
+            with _CLIENTS_LOCK:
+                client = _CLIENTS.get(key)
+                if client is None:
+                    # Use the specified profile (defaults to poc for Bedrock access)
+                    session = boto3.Session(profile_name=profile_name)
+                    client = session.client(
+                        'bedrock-runtime',
+                        region_name=self.config.region,
+                        config=_BOTOCORE_CONFIG
+                    )
+                    _CLIENTS[key] = client
+            self.client = client
             logging.info(f"Bedrock client initialized for region: {self.config.region} using profile: {profile_name}")
         except NoCredentialsError:
             logging.error(f"AWS credentials not found for profile '{profile_name}'. Please run 'aws sso login' to authenticate.")
@@ -92,10 +164,41 @@ class BedrockClient:
         
         return request_body
     
+    def _cache_key(self, model_id: str, request_body: Dict[str, Any]) -> bytes:
+        """Build a response cache key from the model and request body."""
+        payload = orjson.dumps(request_body, option=orjson.OPT_SORT_KEYS)
+        return blake2b(model_id.encode('utf-8') + b"\0" + payload, digest_size=16).digest()
+    
+    def _get_cached_response(self, key: bytes) -> Optional[BedrockResponse]:
+        """Return a cached response and mark it as recently used."""
+        with self._response_cache_lock:
+            cached = self._response_cache.get(key)
+            if cached is not None:
+                self._response_cache.move_to_end(key)
+            return cached
+    
+    def _store_cached_response(self, key: bytes, response: BedrockResponse) -> None:
+        """Store a response, evicting the least recently used entries."""
+        with self._response_cache_lock:
+            self._response_cache[key] = response
+            self._response_cache.move_to_end(key)
+            while len(self._response_cache) > self._response_cache_size:
+                self._response_cache.popitem(last=False)
+    
+    def clear_cache(self) -> None:
+        """Drop all cached model responses."""
+        with self._response_cache_lock:
+            self._response_cache.clear()
+    
     def invoke_model(self, prompt: str, 
                     system_prompt: Optional[str] = None,
-                    max_tokens: Optional[int] = None) -> BedrockResponse:
-        """Invoke the configured model with a prompt."""
+                    max_tokens: Optional[int] = None,
+                    use_cache: bool = True) -> BedrockResponse:
+        """Invoke the configured model with a prompt.
+        
+        Identical requests are answered from an in-memory LRU cache unless
+        caching is disabled via ``bedrock.cache`` or ``use_cache=False``.
+        """
         if not self.client:
             raise RuntimeError("Bedrock client not initialized")
         
@@ -111,16 +214,25 @@ class BedrockClient:
             else:
                 raise ValueError(f"Unsupported model: {model_id}")
             
+            # Serve identical requests from the response cache
+            cache_key = None
+            if use_cache and self.config.bedrock.get("cache", True):
+                cache_key = self._cache_key(model_id, request_body)
+                cached = self._get_cached_response(cache_key)
+                if cached is not None:
+                    logging.debug(f"Bedrock response cache hit for {model_id}")
+                    return cached
+            
             # Make the API call
             response = self.client.invoke_model(
                 modelId=model_id,
-                body=json.dumps(request_body),
+                body=orjson.dumps(request_body),
                 contentType="application/json",
                 accept="application/json"
             )
             
             # Parse response
-            response_body = json.loads(response['body'].read())
+            response_body = orjson.loads(response['body'].read())
             
             # Extract content based on model type
             if "anthropic" in model_id.lower() or "claude" in model_id.lower():
@@ -130,13 +242,18 @@ class BedrockClient:
             else:
                 raise ValueError(f"Unsupported model response format: {model_id}")
             
-            return BedrockResponse(
+            result = BedrockResponse(
                 content=content,
                 usage=usage,
                 model=model_id,
                 stop_reason=stop_reason
             )
             
+            if cache_key is not None:
+                self._store_cached_response(cache_key, result)
+            
+            return result
+            
         except ClientError as e:
             error_code = e.response['Error']['Code']
             error_message = e.response['Error']['Message']
@@ -146,14 +263,80 @@ class BedrockClient:
             logging.error(f"Error invoking Bedrock model: {e}")
             raise
     
+    def stream_model(self, prompt: str,
+                     system_prompt: Optional[str] = None,
+                     max_tokens: Optional[int] = None) -> Iterator[str]:
+        """Invoke the configured model and yield response text as it arrives.
+        
+        Uses ``invoke_model_with_response_stream`` so callers can act on the
+        first tokens instead of waiting for the complete response. Streamed
+        responses are not cached.
+        """
+        if not self.client:
+            raise RuntimeError("Bedrock client not initialized")
+        
+        model_id = self.config.bedrock.get("model", "us.anthropic.claude-sonnet-4-20250514-v1:0")
+        
+        # Use the default system prompt if none provided
+        effective_system_prompt = system_prompt or self.default_system_prompt
+        
+        try:
+            if "anthropic" in model_id.lower() or "claude" in model_id.lower():
+                request_body = self._prepare_claude_request(prompt, effective_system_prompt, max_tokens)
+            else:
+                raise ValueError(f"Unsupported model: {model_id}")
+            
+            response = self.client.invoke_model_with_response_stream(
+                modelId=model_id,
+                body=orjson.dumps(request_body),
+                contentType="application/json",
+                accept="application/json"
+            )
+            
+            for event in response['body']:
+                chunk = event.get('chunk')
+                if not chunk:
+                    continue
+                
+                payload = orjson.loads(chunk['bytes'])
+                if payload.get('type') == 'content_block_delta':
+                    text = payload.get('delta', {}).get('text')
+                    if text:
+                        yield text
+            
+        except ClientError as e:
+            error_code = e.response['Error']['Code']
+            error_message = e.response['Error']['Message']
+            logging.error(f"Bedrock API error {error_code}: {error_message}")
+            raise
+        except Exception as e:
+            logging.error(f"Error streaming from Bedrock model: {e}")
+            raise
+    
+    def invoke_model_many(self, prompts: List[str],
+                          system_prompt: Optional[str] = None,
+                          max_tokens: Optional[int] = None,
+                          max_workers: int = 8) -> List[BedrockResponse]:
+        """Invoke the model for several prompts concurrently.
+        
+        boto3 clients are thread-safe, so requests are fanned out over a
+        thread pool. Responses are returned in the same order as ``prompts``.
+        """
+        if not prompts:
+            return []
+        if len(prompts) == 1:
+            return [self.invoke_model(prompts[0], system_prompt, max_tokens)]
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(prompts))) as executor:
+            return list(executor.map(
+                lambda prompt: self.invoke_model(prompt, system_prompt, max_tokens),
+                prompts
+            ))
+    
     def analyze_code(self, code: str, file_path: str, 
                     analysis_type: str = "general") -> BedrockResponse:
         """Analyze code and extract relevant information."""
-        # Combine Sage base prompt with specialized instruction
-        system_prompt = self.default_system_prompt + "\n\n" + (
-            "As an expert code analyst, analyze the provided code and extract "
-            "relevant information for project documentation."
-        )
+        system_prompt = self._sp_analyze
         
         prompt = f"""Analyze the following code file and provide insights:
 
@@ -178,19 +361,32 @@ Format your response as structured information that can be easily processed."""
     
     def extract_technologies(self, project_files: List[Dict[str, str]]) -> BedrockResponse:
         """Extract technologies from project files."""
-        # Combine Sage base prompt with specialized instruction
-        system_prompt = self.default_system_prompt + "\n\n" + (
-            "As a technology identification expert, analyze project files "
-            "and identify all technologies, frameworks, and tools being used."
-        )
+        system_prompt = self._sp_techs
         
-        files_info = []
-        for file_info in project_files:
-            files_info.append(f"File: {file_info['path']}\nContent: {file_info['content'][:1000]}...")
+        # Map: analyze each file concurrently
+        file_prompts = [
+            f"""Identify the technologies used in this project file:
+
+File: {file_info['path']}
+Content:
+{file_info['content']}
+
+List the programming languages, frameworks, libraries, databases, build tools,
+cloud services and testing frameworks you can see, one per line, with a
+confidence level for each."""
+            for file_info in project_files
+        ]
+        file_responses = self.invoke_model_many(file_prompts, system_prompt, max_tokens=512)
+        
+        # Reduce: fold the per-file findings into a single answer
+        findings = "\n\n".join(
+            f"File: {file_info['path']}\n{response.content}"
+            for file_info, response in zip(project_files, file_responses)
+        )
         
-        prompt = f"""Analyze these project files and identify all technologies:
+        prompt = f"""Combine these per-file findings and identify all technologies in the project:
 
-{chr(10).join(files_info)}
+{findings}
 
 Please identify:
 1. Programming languages
@@ -209,11 +405,7 @@ Provide a structured list of technologies with confidence levels."""
     def match_context(self, project_technologies: List[str], 
                      available_context: List[str]) -> BedrockResponse:
         """Match project technologies with available context."""
-        # Combine Sage base prompt with specialized instruction
-        system_prompt = self.default_system_prompt + "\n\n" + (
-            "As a context matching specialist, given a project's technologies "
-            "and available context items, determine which context would be most valuable."
-        )
+        system_prompt = self._sp_match
         
         prompt = f"""Match technologies with relevant context:
 
@@ -236,11 +428,7 @@ Format as a structured list with scores and explanations."""
     def resolve_conflict(self, conflict_description: str, 
                         options: List[str]) -> BedrockResponse:
         """Help resolve conflicts between different context or rules."""
-        # Combine Sage base prompt with specialized instruction
-        system_prompt = self.default_system_prompt + "\n\n" + (
-            "As a conflict resolution specialist, analyze conflicts objectively "
-            "and provide recommendations for resolution."
-        )
+        system_prompt = self._sp_conflict
         
         prompt = f"""Analyze this conflict and suggest resolution:
 
@@ -262,16 +450,12 @@ Focus on maintaining consistency and maximizing value for the user."""
     
     def determine_emotion(self, message: str, context: Dict[str, Any]) -> BedrockResponse:
         """Determine appropriate emotion for Sage's personality system."""
-        # Combine Sage base prompt with specialized instruction
-        system_prompt = self.default_system_prompt + "\n\n" + (
-            "As part of your personality system, determine the most appropriate "
-            "emotional expression based on the message and context."
-        )
+        system_prompt = self._sp_emotion
         
         prompt = f"""Determine appropriate emotion for this interaction:
 
 Message: {message}
-Context: {json.dumps(context, indent=2)}
+Context: {orjson.dumps(context, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()}
 
 Available emotions: neutral, joyful, serious, hopeful, skeptical, shock, 
 sarcastic, ironic, cheeky-wink, sly-wink, frustrated, tired, eyeroll, laughing
@@ -292,7 +476,8 @@ Respond with just the emotion name and brief reasoning."""
         try:
             test_response = self.invoke_model(
                 "Hello, this is a health check. Please respond with 'OK'.",
-                max_tokens=10
+                max_tokens=10,
+                use_cache=False
             )
             return "OK" in test_response.content or "ok" in test_response.content.lower()
         except Exception as e:
@@ -2,12 +2,17 @@
 
 import asyncio
 import logging
+import os
+import queue
+import re
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import Set, Callable, Optional, Dict, List
-from fnmatch import fnmatch
+from typing import Set, Callable, Optional, Dict, List, Pattern, Tuple, Any, Union
+from fnmatch import translate
 from watchdog.observers import Observer
+from watchdog.observers.api import ObservedWatch
 from watchdog.events import FileSystemEventHandler, FileSystemEvent
-from pydantic import BaseModel
 
 from ..config.models import SageConfig, ProjectConfig
 
@@ -19,8 +24,20 @@ class IgnorePatterns:
         """Initialize with optional ignore file path."""
         self.patterns: Set[str] = set()
         self.ignore_file = ignore_file or Path(".sageignore")
+        self._names: Set[str] = set()
+        self._extensions: Tuple[str, ...] = ()
+        self._regex: Optional[Pattern[str]] = None
+        self._cwd = Path.cwd()
+        self._cwd_prefix = os.path.normcase(str(self._cwd)) + os.sep
+        self._compile_patterns()
         self.load_patterns()
     
+    def refresh_cwd(self) -> None:
+        """Re-read the working directory used for relative matching (after a chdir)."""
+        self._cwd = Path.cwd()
+        self._cwd_prefix = os.path.normcase(str(self._cwd)) + os.sep
+        self._compile_patterns()
+    
     def load_patterns(self) -> None:
         """Load ignore patterns from file."""
         if not self.ignore_file.exists():
@@ -34,89 +51,182 @@ class IgnorePatterns:
                         self.patterns.add(line)
         except Exception as e:
             logging.warning(f"Failed to load ignore patterns: {e}")
+        
+        self._compile_patterns()
     
-    def should_ignore(self, path: Path) -> bool:
-        """Check if a path should be ignored."""
-        path_str = str(path)
+    def _compile_patterns(self) -> None:
+        """Partition patterns by kind and compile the remaining globs.
         
-        # Safely get relative path
-        try:
-            relative_path = str(path.relative_to(Path.cwd())) if path.is_absolute() else path_str
-        except ValueError:
-            # Path is not within current working directory, use absolute path
-            relative_path = path_str
+        Literal names (``node_modules/``, ``build``) are matched against path
+        components with a set, ``*.ext`` patterns with a suffix check, and only
+        true globs go through a single alternation regex.
+        """
+        names: Set[str] = set()
+        extensions: Set[str] = set()
+        globs: List[str] = []
+        
+        for pattern in sorted(self.patterns):
+            pattern = os.path.normcase(pattern)
+            literal = pattern.rstrip('/')
+            
+            if not any(c in literal for c in '*?[') and literal and '/' not in literal:
+                names.add(literal)
+            elif (pattern.startswith('*.') and '/' not in pattern
+                  and not any(c in pattern[1:] for c in '*?[')):
+                extensions.add(pattern[1:])
+            else:
+                globs.append(pattern)
+        
+        self._names = names
+        self._extensions = tuple(extensions)
+        self._regex = re.compile("|".join(f"(?:{translate(g)})" for g in globs)) if globs else None
+        
+        # Results depend on the compiled patterns, so start a fresh cache
+        self._cached_should_ignore = lru_cache(maxsize=4096)(self._should_ignore_uncached)
+    
+    def should_ignore(self, path: Union[str, Path]) -> bool:
+        """Check if a path should be ignored.
+        
+        Results are cached per path, since editors emit bursts of events for
+        the same file.
+        """
+        if not self.patterns:
+            return False
+        
+        return self._cached_should_ignore(str(path))
+    
+    def _should_ignore_uncached(self, raw_path: str) -> bool:
+        """Match a path against the compiled ignore patterns."""
+        path_str = os.path.normcase(raw_path)
+        parts = path_str.split(os.sep)
+        
+        # Directory and file names anywhere in the path
+        if not self._names.isdisjoint(parts):
+            return True
+        
+        # Extension patterns, applied to the path and its parents
+        if self._extensions and any(part.endswith(self._extensions) for part in parts):
+            return True
         
-        for pattern in self.patterns:
-            if fnmatch(path_str, pattern) or fnmatch(relative_path, pattern):
+        if self._regex is None:
+            return False
+        
+        match = self._regex.match
+        
+        if match(path_str):
+            return True
+        
+        # Relative to the working directory
+        if path_str.startswith(self._cwd_prefix) and match(path_str[len(self._cwd_prefix):]):
+            return True
+        
+        # Check if any parent directory matches
+        head = path_str
+        while os.sep in head:
+            head = head.rsplit(os.sep, 1)[0]
+            if head and match(head):
                 return True
-            # Check if any parent directory matches
-            for parent in path.parents:
-                if fnmatch(str(parent), pattern):
-                    return True
         
         return False
 
 
-class FileChangeEvent(BaseModel):
+@dataclass(frozen=True)
+class FileChangeEvent:
     """Represents a file change event."""
     event_type: str
-    src_path: Path
-    dest_path: Optional[Path] = None
+    src_path: str
     is_directory: bool
     project_path: Path
+    dest_path: Optional[str] = None
+    project_id: Optional[int] = None  # index into config.projects
+    
+    @cached_property
+    def path(self) -> Path:
+        """Source path as a Path, built on first use."""
+        return Path(self.src_path)
+
+
+# Shared by every handler; extensions are lowercase
+MONITORED_EXTENSIONS = frozenset({
+    '.py', '.js', '.ts', '.jsx', '.tsx', '.java', '.c', '.cpp', '.h', '.hpp',
+    '.go', '.rs', '.rb', '.php', '.swift', '.kt', '.scala', '.clj', '.hs',
+    '.md', '.txt', '.rst', '.adoc',
+    '.json', '.yaml', '.yml', '.toml', '.ini', '.cfg', '.conf',
+    '.xml', '.html', '.css', '.scss', '.sass', '.less',
+    '.sql', '.sh', '.bash', '.zsh', '.ps1', '.bat',
+})
+MONITORED_FILENAMES = frozenset({'Makefile', 'Dockerfile', 'CMakeLists.txt', 'BUILD', 'WORKSPACE'})
+_MONITORED_SUFFIXES = tuple(sorted(MONITORED_EXTENSIONS, key=len, reverse=True))
 
 
 class SageFileHandler(FileSystemEventHandler):
     """Custom file system event handler for Sage."""
     
     def __init__(self, project_path: Path, ignore_patterns: IgnorePatterns, 
-                 callback: Callable[[FileChangeEvent], None]):
+                 callback: Callable[[FileChangeEvent], None], project_id: Optional[int] = None):
         """Initialize handler with project path, ignore patterns, and callback."""
         super().__init__()
         self.project_path = project_path
+        self.project_id = project_id
         self.ignore_patterns = ignore_patterns
         self.callback = callback
-        self.monitored_extensions = {
-            '.py', '.js', '.ts', '.jsx', '.tsx', '.java', '.c', '.cpp', '.h', '.hpp',
-            '.go', '.rs', '.rb', '.php', '.swift', '.kt', '.scala', '.clj', '.hs',
-            '.md', '.txt', '.rst', '.adoc',
-            '.json', '.yaml', '.yml', '.toml', '.ini', '.cfg', '.conf',
-            '.xml', '.html', '.css', '.scss', '.sass', '.less',
-            '.sql', '.sh', '.bash', '.zsh', '.ps1', '.bat',
-            'Makefile', 'Dockerfile', 'CMakeLists.txt', 'BUILD', 'WORKSPACE'
-        }
-    
-    def should_process_file(self, path: Path) -> bool:
+    
+    def should_process_file(self, path: str) -> bool:
         """Check if a file should be processed."""
         if self.ignore_patterns.should_ignore(path):
             return False
         
-        # Check if it's a monitored file type
-        if path.suffix.lower() in self.monitored_extensions:
+        # Monitored file type (one C-level scan over the suffix tuple)
+        if path.endswith(_MONITORED_SUFFIXES):
             return True
         
         # Check for files without extensions that we care about
-        if path.suffix == '' and path.name in ['Makefile', 'Dockerfile', 'BUILD', 'WORKSPACE']:
+        if path.rsplit(os.sep, 1)[-1] in MONITORED_FILENAMES:
             return True
         
-        return False
+        # Uppercase extensions (.PY, .MD) are rare; lowercase only on a miss
+        return path.lower().endswith(_MONITORED_SUFFIXES)
+    
+    def on_created(self, event: FileSystemEvent) -> None:
+        """Handle file creation."""
+        if not event.is_directory:
+            self._dispatch(event)
+    
+    def on_modified(self, event: FileSystemEvent) -> None:
+        """Handle file modification."""
+        if not event.is_directory:
+            self._dispatch(event)
     
-    def on_any_event(self, event: FileSystemEvent) -> None:
-        """Handle any file system event."""
+    def on_deleted(self, event: FileSystemEvent) -> None:
+        """Handle file deletion."""
+        if not event.is_directory:
+            self._dispatch(event)
+    
+    def on_moved(self, event: FileSystemEvent) -> None:
+        """Handle file moves and renames."""
+        if not event.is_directory:
+            self._dispatch(event, event.dest_path)
+    
+    def _dispatch(self, event: FileSystemEvent, dest_path: Optional[str] = None) -> None:
+        """Filter a file event and pass it on to the callback."""
         try:
-            src_path = Path(event.src_path)
+            src_path = event.src_path
             
-            # Skip if we shouldn't process this file
-            if not event.is_directory and not self.should_process_file(src_path):
+            # Skip if we shouldn't process this file; a move counts if either
+            # end is interesting (editors often save via a temp file rename)
+            if not self.should_process_file(src_path) and not (
+                dest_path and self.should_process_file(dest_path)
+            ):
                 return
             
             # Create event object
             change_event = FileChangeEvent(
                 event_type=event.event_type,
                 src_path=src_path,
-                dest_path=Path(event.dest_path) if hasattr(event, 'dest_path') else None,
-                is_directory=event.is_directory,
-                project_path=self.project_path
+                is_directory=False,
+                project_path=self.project_path,
+                dest_path=dest_path,
+                project_id=self.project_id
             )
             
             # Call callback
@@ -132,24 +242,85 @@ class FileMonitor:
     def __init__(self, config: SageConfig):
         """Initialize file monitor with configuration."""
         self.config = config
-        self.observers: Dict[str, Observer] = {}
+        self._observer: Optional[Observer] = None
+        self._watches: Dict[str, ObservedWatch] = {}
         self.ignore_patterns: Dict[str, IgnorePatterns] = {}
         self.event_callbacks: List[Callable[[FileChangeEvent], None]] = []
+        self.batch_callbacks: List[Callable[[List[FileChangeEvent]], Any]] = []
+        self.batch_interval = config.performance.event_batch_interval
         self.is_running = False
+        
+        # Handoff from watchdog threads to the event loop: events go on a
+        # SimpleQueue and the loop is woken once per burst
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._batch_task: Optional[asyncio.Task] = None
     
     def add_event_callback(self, callback: Callable[[FileChangeEvent], None]) -> None:
-        """Add a callback for file events."""
+        """Add a callback for individual file events (called on the watchdog thread)."""
         self.event_callbacks.append(callback)
     
+    def add_batch_callback(self, callback: Callable[[List[FileChangeEvent]], Any]) -> None:
+        """Add a callback for coalesced event batches.
+        
+        Batch callbacks run on the event loop that called start_monitoring and
+        may be coroutine functions.
+        """
+        self.batch_callbacks.append(callback)
+    
     def _handle_file_event(self, event: FileChangeEvent) -> None:
         """Handle a file change event by calling all registered callbacks."""
-        logging.info(f"File {event.event_type}: {event.src_path}")
+        logging.debug(f"File {event.event_type}: {event.src_path}")
         
         for callback in self.event_callbacks:
             try:
                 callback(event)
             except Exception as e:
                 logging.error(f"Error in file event callback: {e}")
+        
+        self._queue.put_nowait(event)
+        
+        # Only wake the loop if the dispatcher isn't already pending
+        loop, wakeup = self._loop, self._wakeup
+        if loop is not None and not wakeup.is_set():
+            try:
+                loop.call_soon_threadsafe(wakeup.set)
+            except RuntimeError:
+                # Loop already closed during shutdown
+                pass
+    
+    def _drain_queue(self) -> List[FileChangeEvent]:
+        """Drain queued events, keeping the last event per path."""
+        pending: Dict[str, FileChangeEvent] = {}
+        while True:
+            try:
+                event = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            pending[event.src_path] = event
+        return list(pending.values())
+    
+    async def _dispatch_batches(self) -> None:
+        """Drain queued events into a single batch callback per burst."""
+        while True:
+            await self._wakeup.wait()
+            
+            # Let the burst settle so repeated events for a file coalesce
+            await asyncio.sleep(self.batch_interval)
+            self._wakeup.clear()
+            
+            events = self._drain_queue()
+            if not events:
+                continue
+            
+            for callback in self.batch_callbacks:
+                try:
+                    result = callback(events)
+                    if asyncio.iscoroutine(result):
+                        await result
+                except Exception as e:
+                    logging.error(f"Error in file batch callback: {e}")
     
     def start_monitoring(self) -> None:
         """Start monitoring all configured projects."""
@@ -159,17 +330,24 @@ class FileMonitor:
         
         logging.info("Starting file monitoring...")
         
-        for project in self.config.projects:
-            self._start_project_monitoring(project)
+        try:
+            self._loop = asyncio.get_running_loop()
+            self._wakeup = asyncio.Event()
+            self._batch_task = self._loop.create_task(self._dispatch_batches())
+        except RuntimeError:
+            logging.warning("No running event loop - file event batches will not be dispatched")
+        
+        for project_id, project in enumerate(self.config.projects):
+            self._start_project_monitoring(project, project_id)
         
         self.is_running = True
         logging.info(f"Monitoring {len(self.config.projects)} projects")
     
-    def _start_project_monitoring(self, project: ProjectConfig) -> None:
+    def _start_project_monitoring(self, project: ProjectConfig, project_id: Optional[int] = None) -> None:
         """Start monitoring a specific project."""
-        project_key = str(project.path)
+        project_key = project.path_str
         
-        if project_key in self.observers:
+        if project_key in self._watches:
             logging.warning(f"Already monitoring project: {project.path}")
             return
         
@@ -177,20 +355,37 @@ class FileMonitor:
         ignore_file = project.path / ".sageignore"
         self.ignore_patterns[project_key] = IgnorePatterns(ignore_file)
         
-        # Create handler and observer
+        # Create handler and schedule it on the shared observer
         handler = SageFileHandler(
             project.path,
             self.ignore_patterns[project_key],
-            self._handle_file_event
+            self._handle_file_event,
+            project_id
         )
         
-        observer = Observer()
-        observer.schedule(handler, str(project.path), recursive=True)
-        observer.start()
+        # On Linux this is watchdog's inotify observer, which already drains the
+        # inotify fd with large batched os.read() calls; coalescing happens in
+        # _dispatch_batches
+        if self._observer is None:
+            self._observer = Observer()
+            self._observer.start()
         
-        self.observers[project_key] = observer
+        self._watches[project_key] = self._observer.schedule(handler, project_key, recursive=True)
         logging.info(f"Started monitoring: {project.path}")
     
+    def stop_project_monitoring(self, project_path: Path) -> None:
+        """Stop monitoring a specific project."""
+        project_key = str(project_path)
+        
+        watch = self._watches.pop(project_key, None)
+        if watch is None:
+            return
+        
+        if self._observer is not None:
+            self._observer.unschedule(watch)
+        self.ignore_patterns.pop(project_key, None)
+        logging.info(f"Stopped monitoring: {project_path}")
+    
     def stop_monitoring(self) -> None:
         """Stop monitoring all projects."""
         if not self.is_running:
@@ -198,12 +393,19 @@ class FileMonitor:
         
         logging.info("Stopping file monitoring...")
         
-        for project_key, observer in self.observers.items():
-            observer.stop()
-            observer.join()
+        if self._batch_task:
+            self._batch_task.cancel()
+            self._batch_task = None
+        self._loop = None
+        
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
         
-        self.observers.clear()
+        self._watches.clear()
         self.ignore_patterns.clear()
+        self._drain_queue()
         self.is_running = False
         logging.info("File monitoring stopped")
     
@@ -216,4 +418,4 @@ class FileMonitor:
     
     def is_monitoring_project(self, project_path: Path) -> bool:
         """Check if a project is currently being monitored."""
-        return str(project_path) in self.observers
+        return str(project_path) in self._watches
@@ -1,11 +1,16 @@
 """Main Sage application orchestrator."""
 
 import asyncio
+import atexit
 import logging
+import os
+import queue
 import signal
 import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Set, Tuple
 from concurrent.futures import ThreadPoolExecutor
 
 from ..config.loader import ConfigLoader
@@ -19,6 +24,49 @@ from ..ui.personality import PersonalitySystem
 from ..ui.web_server import SageWebServer
 
 
+class _BufferedFileHandler(logging.FileHandler):
+    """File handler that writes through a large buffer and flushes periodically.
+    
+    A daemon thread writes the buffer out every flush_interval seconds, so
+    records reach the file promptly even when logging goes quiet.
+    """
+    
+    def __init__(self, filename: str, buffer_size: int = 64 * 1024, flush_interval: float = 1.0):
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self._stop_flushing = threading.Event()
+        super().__init__(filename)
+        threading.Thread(target=self._flush_periodically, name="sage-log-flush", daemon=True).start()
+    
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=self.buffer_size,
+                    encoding=self.encoding, errors=self.errors)
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        super().emit(record)
+        # Errors are written out immediately
+        if record.levelno >= logging.ERROR:
+            self._flush_now()
+    
+    def flush(self) -> None:
+        # Called by StreamHandler.emit after every record; the flusher thread
+        # writes the buffer out instead
+        pass
+    
+    def _flush_now(self) -> None:
+        # StreamHandler.flush takes the handler lock and skips a closed stream
+        super().flush()
+    
+    def _flush_periodically(self) -> None:
+        while not self._stop_flushing.wait(self.flush_interval):
+            self._flush_now()
+    
+    def close(self) -> None:
+        self._stop_flushing.set()
+        self._flush_now()
+        super().close()
+
+
 class SageApplication:
     """Main Sage application class."""
     
@@ -39,23 +87,60 @@ class SageApplication:
         
         # Runtime state
         self.is_running = False
-        self.executor = ThreadPoolExecutor(max_workers=10)
+        # Crew analyses and memory bank writes use separate pools so bursts of
+        # small writes never queue behind long-running analyses
+        self.analysis_executor = ThreadPoolExecutor(
+            max_workers=os.cpu_count() or 4, thread_name_prefix="sage-analysis"
+        )
+        self.io_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="sage-io")
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._shutdown_task: Optional[asyncio.Task] = None
+        
+        # File change analysis: bounded concurrency, one run per project, and
+        # changes that arrive while a run is queued are folded into it
+        self._analysis_semaphore: Optional[asyncio.Semaphore] = None
+        self._project_locks: Dict[str, asyncio.Lock] = {}
+        self._pending_changes: Dict[str, Dict[str, FileChangeEvent]] = {}
+        self._analysis_tasks: Set[asyncio.Task] = set()
+        
+        # (path string, project) pairs, longest path first
+        self._project_index: List[Tuple[str, Any]] = []
         
         # Setup logging
         self._setup_logging()
-        
-        # Setup signal handlers
-        self._setup_signal_handlers()
     
     def _setup_logging(self):
-        """Setup logging configuration."""
+        """Setup logging configuration.
+        
+        Records are queued and written by a background listener so logging on
+        the event path never blocks on file I/O.
+        """
+        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        stream_handler = logging.StreamHandler(sys.stdout)
+        stream_handler.setFormatter(formatter)
+        file_handler = _BufferedFileHandler('sage.log')
+        file_handler.setFormatter(formatter)
+        
+        log_queue = queue.SimpleQueue()
+        self._log_handlers = (stream_handler, file_handler)
+        self._queue_handler = QueueHandler(log_queue)
+        # QueueHandler merges args into msg; without this basicConfig would
+        # give it a formatter and records would be formatted twice
+        self._queue_handler.setFormatter(logging.Formatter('%(message)s'))
+        self._log_listener: Optional[QueueListener] = QueueListener(
+            log_queue, *self._log_handlers, respect_handler_level=True
+        )
+        self._log_listener.start()
+        # Drains the queue even if run() is never reached or exits abnormally
+        atexit.register(self._stop_logging)
+        
+        # Keep a more verbose level chosen before startup (sage run --debug)
+        level = logging.getLogger().level
+        if not logging.NOTSET < level < logging.INFO:
+            level = logging.INFO
         logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.StreamHandler(sys.stdout),
-                logging.FileHandler('sage.log')
-            ]
+            level=level,
+            handlers=[self._queue_handler]
         )
         
         # Reduce verbosity of some libraries
@@ -63,19 +148,45 @@ class SageApplication:
         logging.getLogger('uvicorn').setLevel(logging.WARNING)
         logging.getLogger('fastapi').setLevel(logging.WARNING)
     
-    def _setup_signal_handlers(self):
-        """Setup signal handlers for graceful shutdown."""
-        def signal_handler(signum, frame):
-            logging.info(f"Received signal {signum}, shutting down gracefully...")
-            asyncio.create_task(self.shutdown())
+    def _stop_logging(self):
+        """Drain queued log records and switch the root logger to direct writes.
         
-        signal.signal(signal.SIGINT, signal_handler)
-        signal.signal(signal.SIGTERM, signal_handler)
+        Safe to call more than once; records logged afterwards still reach
+        the console and sage.log.
+        """
+        listener, self._log_listener = self._log_listener, None
+        if listener is None:
+            return
+        
+        root = logging.getLogger()
+        root.removeHandler(self._queue_handler)
+        listener.stop()
+        for handler in self._log_handlers:
+            root.addHandler(handler)
+    
+    def _setup_signal_handlers(self):
+        """Setup signal handlers for graceful shutdown on the running loop."""
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                self._loop.add_signal_handler(signum, self._request_shutdown, signum)
+            except NotImplementedError:
+                # Event loops on Windows don't support add_signal_handler
+                signal.signal(
+                    signum,
+                    lambda s, frame: self._loop.call_soon_threadsafe(self._request_shutdown, s)
+                )
+    
+    def _request_shutdown(self, signum: int):
+        """Schedule a graceful shutdown from a signal."""
+        logging.info(f"Received signal {signum}, shutting down gracefully...")
+        self._shutdown_task = self._loop.create_task(self.shutdown())
     
     async def initialize(self) -> bool:
         """Initialize all Sage components."""
         try:
             logging.info("🚀 Initializing Sage - AI Project Context Assistant")
+            self._loop = asyncio.get_running_loop()
+            self._setup_signal_handlers()
             
             # Load configuration
             if not await self._load_configuration():
@@ -109,6 +220,8 @@ class SageApplication:
         try:
             self.config_loader = ConfigLoader(self.config_path)
             self.config = self.config_loader.load_config()
+            self._build_project_index()
+            self._analysis_semaphore = asyncio.Semaphore(self.config.performance.max_concurrent_ops)
             
             logging.info(f"📋 Configuration loaded from {self.config_loader.config_path}")
             logging.info(f"🎯 Monitoring {len(self.config.projects)} projects")
@@ -119,6 +232,22 @@ class SageApplication:
             logging.error(f"❌ Configuration loading failed: {e}")
             return False
     
+    def _build_project_index(self):
+        """Index project paths so nested projects resolve to the deepest match."""
+        self._project_index = sorted(
+            ((project.path_str.rstrip(os.sep), project) for project in self.config.projects),
+            key=lambda item: -len(item[0])
+        )
+    
+    def _find_project(self, src_path: str):
+        """Return the project configuration that owns a path, if any."""
+        for project_path, project in self._project_index:
+            if src_path.startswith(project_path) and (
+                len(src_path) == len(project_path) or src_path[len(project_path)] == os.sep
+            ):
+                return project
+        return None
+    
     async def _initialize_core_components(self) -> bool:
         """Initialize core Sage components."""
         try:
@@ -195,7 +324,7 @@ class SageApplication:
             self.file_monitor = FileMonitor(self.config)
             
             # Add event callback
-            self.file_monitor.add_event_callback(self._handle_file_change)
+            self.file_monitor.add_batch_callback(self._handle_file_change_batch)
             
             logging.info("👁️  File monitoring system configured")
             
@@ -205,45 +334,81 @@ class SageApplication:
             logging.error(f"❌ File monitoring setup failed: {e}")
             return False
     
-    async def _handle_file_change(self, event: FileChangeEvent):
-        """Handle file change events."""
+    async def _handle_file_change_batch(self, events: List[FileChangeEvent]):
+        """Handle a coalesced batch of file change events."""
         try:
-            logging.info(f"📝 File {event.event_type}: {event.src_path}")
+            logging.info(f"📝 {len(events)} file change(s) detected")
+            
+            # Group events by owning project so each project is analyzed once
+            changes_by_project: Dict[int, List[FileChangeEvent]] = {}
+            for event in events:
+                project_id = event.project_id
+                if project_id is None:
+                    project_config = self._find_project(event.src_path)
+                    if not project_config:
+                        logging.warning(f"No project configuration found for {event.src_path}")
+                        continue
+                    project_id = self.config.projects.index(project_config)
+                
+                changes_by_project.setdefault(project_id, []).append(event)
             
-            # Notify web UI
-            if self.web_server:
-                await self.web_server.send_file_change_notification(
-                    str(event.src_path), 
-                    event.event_type
+            for project_id, project_events in changes_by_project.items():
+                project_config = self.config.projects[project_id]
+                
+                # Notify web UI - one message per file for small batches,
+                # a single summary for large ones
+                if self.web_server:
+                    if len(project_events) <= 5:
+                        for event in project_events:
+                            await self.web_server.send_file_change_notification(
+                                event.src_path,
+                                event.event_type
+                            )
+                    else:
+                        await self.web_server.send_system_notification(
+                            f"Detected {len(project_events)} file changes in {project_config.path.name}",
+                            "processing"
+                        )
+                
+                # Process file changes in the background so batches keep flowing
+                task = asyncio.create_task(
+                    self._process_file_change_async(project_events, project_config)
                 )
-            
-            # Find the project configuration for this file
-            project_config = None
-            for project in self.config.projects:
-                if str(event.src_path).startswith(str(project.path)):
-                    project_config = project
-                    break
-            
-            if not project_config:
-                logging.warning(f"No project configuration found for {event.src_path}")
-                return
-            
-            # Process file change asynchronously
-            await self._process_file_change_async(event, project_config)
+                self._analysis_tasks.add(task)
+                task.add_done_callback(self._analysis_tasks.discard)
             
         except Exception as e:
-            logging.error(f"Error handling file change: {e}")
+            logging.error(f"Error handling file changes: {e}")
     
-    async def _process_file_change_async(self, event: FileChangeEvent, project_config):
-        """Process file change asynchronously."""
+    async def _process_file_change_async(self, events: List[FileChangeEvent], project_config):
+        """Process a batch of file changes for one project asynchronously."""
+        key = project_config.path_str
+        
+        pending = self._pending_changes.get(key)
+        if pending is not None:
+            # An analysis for this project is already waiting to run; merge into it
+            for event in events:
+                pending[event.src_path] = event
+            return
+        
+        self._pending_changes[key] = {event.src_path: event for event in events}
+        lock = self._project_locks.setdefault(key, asyncio.Lock())
+        
+        async with lock:
+            events = list(self._pending_changes.pop(key).values())
+            async with self._analysis_semaphore:
+                await self._run_file_change_analysis(events, project_config)
+    
+    async def _run_file_change_analysis(self, events: List[FileChangeEvent], project_config):
+        """Run crew analysis and memory bank updates for a set of file changes."""
         try:
-            # Run crew analysis for the file change
-            result = await asyncio.get_event_loop().run_in_executor(
-                self.executor,
+            # Run crew analysis for the file changes
+            result = await self._loop.run_in_executor(
+                self.analysis_executor,
                 self.crew_manager.execute_file_change_analysis,
                 project_config,
-                [event],
-                {"file_change_event": event}
+                events,
+                {"file_change_events": events}
             )
             
             if result['status'] == 'success':
@@ -251,12 +416,12 @@ class SageApplication:
                 
                 # Update memory bank if needed
                 if self.memory_bank_manager:
-                    await asyncio.get_event_loop().run_in_executor(
-                        self.executor,
+                    await self._loop.run_in_executor(
+                        self.io_executor,
                         self.memory_bank_manager.update_project_context,
                         project_config.path,
                         [],  # Technologies - could be extracted from analysis
-                        [f"{event.event_type}: {event.src_path}"]
+                        [f"{event.event_type}: {event.src_path}" for event in events]
                     )
             
         except Exception as e:
@@ -264,55 +429,65 @@ class SageApplication:
     
     async def run(self):
         """Run the main Sage application."""
-        if not await self.initialize():
-            logging.error("❌ Failed to initialize Sage")
-            return
-        
         try:
-            self.is_running = True
-            
-            # Start file monitoring
-            self.file_monitor.start_monitoring()
-            
-            # Perform initial project analysis
-            await self._perform_initial_analysis()
-            
-            # Send startup notification
-            if self.web_server:
-                await self.web_server.send_system_notification(
-                    "Sage is now online and monitoring your projects! 🚀",
-                    "startup"
-                )
-            
-            # Start web server (this will block)
-            await self.web_server.start_server()
+            if not await self.initialize():
+                logging.error("❌ Failed to initialize Sage")
+                return
             
-        except Exception as e:
-            logging.error(f"❌ Error running Sage: {e}")
+            try:
+                self.is_running = True
+                
+                # Start file monitoring
+                self.file_monitor.start_monitoring()
+                
+                # Perform initial project analysis
+                await self._perform_initial_analysis()
+                
+                # Send startup notification
+                if self.web_server:
+                    await self.web_server.send_system_notification(
+                        "Sage is now online and monitoring your projects! 🚀",
+                        "startup"
+                    )
+                
+                # Start web server (this will block)
+                await self.web_server.start_server()
+                
+            except Exception as e:
+                logging.error(f"❌ Error running Sage: {e}")
+            finally:
+                await self.shutdown()
         finally:
-            await self.shutdown()
+            # Stop queued logging only once nothing else will run; a signal
+            # may call shutdown() while uvicorn is still serving
+            self._stop_logging()
     
     async def _perform_initial_analysis(self):
         """Perform initial analysis of all configured projects."""
         logging.info("🔍 Performing initial project analysis...")
         
-        for project in self.config.projects:
-            try:
-                # Run project analysis
-                result = await asyncio.get_event_loop().run_in_executor(
-                    self.executor,
+        async def analyze(project):
+            async with self._analysis_semaphore:
+                return await self._loop.run_in_executor(
+                    self.analysis_executor,
                     self.crew_manager.execute_project_analysis,
                     project,
                     {"new_project": True}
                 )
-                
-                if result['status'] == 'success':
-                    logging.info(f"✅ Initial analysis completed for {project.path}")
-                else:
-                    logging.warning(f"⚠️  Initial analysis had issues for {project.path}: {result}")
-                
-            except Exception as e:
-                logging.error(f"❌ Error analyzing project {project.path}: {e}")
+        
+        # Analyze projects concurrently, bounded by max_concurrent_ops
+        results = await asyncio.gather(
+            *(analyze(project) for project in self.config.projects),
+            return_exceptions=True
+        )
+        
+        for project, result in zip(self.config.projects, results):
+            if isinstance(result, Exception):
+                logging.error(f"❌ Error analyzing project {project.path}: {result}")
+            elif result['status'] == 'success':
+                logging.info(f"✅ Initial analysis completed for {project.path}")
+            else:
+                logging.warning(f"⚠️  Initial analysis had issues for {project.path}: {result}")
         
         logging.info("🎯 Initial project analysis complete")
     
@@ -331,14 +506,19 @@ class SageApplication:
                 self.file_monitor.stop_monitoring()
                 logging.info("👁️  File monitoring stopped")
             
+            # Drop queued file change analyses
+            for task in list(self._analysis_tasks):
+                task.cancel()
+            
             # Shutdown crews
             if self.crew_manager:
                 self.crew_manager.shutdown_all_crews()
                 logging.info("👥 All crews shutdown")
             
-            # Shutdown executor
-            self.executor.shutdown(wait=True)
-            logging.info("⚙️  Executor shutdown")
+            # Shutdown executors
+            self.analysis_executor.shutdown(wait=True)
+            self.io_executor.shutdown(wait=True)
+            logging.info("⚙️  Executors shutdown")
             
             # Send shutdown notification
             if self.web_server:
@@ -371,6 +551,20 @@ class SageApplication:
         }
 
 
+def use_uvloop() -> bool:
+    """Run asyncio on uvloop when it is installed (uvicorn[standard] provides it).
+    
+    Must be called before the event loop is created.
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return False
+    
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
+
 async def main():
     """Main entry point for Sage."""
     sage = SageApplication()
@@ -378,4 +572,5 @@ async def main():
 
 
 if __name__ == "__main__":
+    use_uvloop()
     asyncio.run(main())
\ No newline at end of file
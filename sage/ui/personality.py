@@ -1,28 +1,177 @@
 """Personality system for Sage UI."""
 
-import json
 import logging
+import os
 import random
+import re
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, List, Optional
-from pydantic import BaseModel
+from types import MappingProxyType
+from typing import Callable, Dict, Any, Deque, List, NamedTuple, Optional, Set, Tuple
+import orjson
 
 from ..core.bedrock_client import BedrockClient
 
 
-class VideoInfo(BaseModel):
+class VideoInfo(NamedTuple):
     """Represents a video with location and duration."""
     location: str
     duration: float
     weight: int = 10  # Default weight for backward compatibility
+    
+    @classmethod
+    def from_config(cls, data: Dict[str, Any]) -> "VideoInfo":
+        """Build from a config entry, coercing numeric fields."""
+        return cls(data['location'], float(data['duration']), int(data.get('weight', 10)))
 
 
-class PersonalityExpression(BaseModel):
+@dataclass
+class PersonalityExpression:
     """Represents a personality expression."""
     videos: List[VideoInfo]
     description: str
     use_cases: List[str]
+    
+    @classmethod
+    def from_config(cls, data: Dict[str, Any]) -> "PersonalityExpression":
+        """Build from a config entry."""
+        return cls(
+            videos=[VideoInfo.from_config(video) for video in data['videos']],
+            description=data['description'],
+            use_cases=list(data['use_cases'])
+        )
+
+
+# Emotion shown for each UI message type
+_MESSAGE_TYPE_EMOTION = MappingProxyType({
+    'greeting': 'joyful',
+    'error': 'serious',
+    'warning': 'skeptical',
+    'success': 'joyful',
+    'progress': 'hopeful',
+    'question': 'neutral',
+    'conflict': 'serious',
+    'humor': 'laughing',
+    'frustration': 'frustrated',
+    'processing': 'tired'
+})
+
+# Context overrides for system events
+_EVENT_CONTEXT_MAP = MappingProxyType({
+    'startup': {'interaction_type': 'greeting'},
+    'shutdown': {'interaction_type': 'greeting'},
+    'error': {'interaction_type': 'warning', 'error_severity': 'high'},
+    'conflict': {'interaction_type': 'conflict_resolution'},
+    'success': {'interaction_type': 'celebration'},
+    'discovery': {'interaction_type': 'discovery'},
+    'processing': {'interaction_type': 'heavy_processing'}
+})
+
+def _now_ms_str() -> str:
+    """Current wall-clock time in milliseconds, as a JavaScript timestamp string."""
+    return str(time.time_ns() // 1_000_000)
+
+
+@lru_cache(maxsize=32)
+def _file_change_context(change_type: str, has_error_marker: bool) -> Tuple[Tuple[str, str], ...]:
+    """Context items for a file change; callers get a fresh dict built from these."""
+    context = {
+        'interaction_type': 'status_update',
+        'error_severity': 'low'
+    }
+    
+    if change_type in ('deleted', 'moved'):
+        context['error_severity'] = 'medium'
+    elif has_error_marker:
+        context['error_severity'] = 'high'
+        context['interaction_type'] = 'warning'
+    
+    return tuple(context.items())
+
+
+@lru_cache(maxsize=64)
+def _system_event_context(event_type: str, severity: str) -> Tuple[Tuple[str, str], ...]:
+    """Context items for a system event; callers get a fresh dict built from these."""
+    context = {
+        'error_severity': severity,
+        'interaction_type': 'status_update'
+    }
+    
+    event_context = _EVENT_CONTEXT_MAP.get(event_type)
+    if event_context:
+        context.update(event_context)
+    
+    return tuple(context.items())
+
+
+def _list_files(directory: str) -> List[str]:
+    """Paths of the regular files in a directory, joined onto the directory as given."""
+    try:
+        with os.scandir(directory or '.') as entries:
+            return [os.path.join(directory, entry.name) for entry in entries if entry.is_file()]
+    except OSError:
+        # Missing directory - every video in it is reported as missing
+        return []
+
+
+# Skeletons for typed video responses; copied per response
+_IDLE_RESPONSE = {'message': '', 'emotion': 'idle', 'timestamp': None, 'type': 'idle'}
+_TASK_EMOTION_RESPONSE = {'message': '', 'emotion': None, 'timestamp': None, 'type': 'task_emotion'}
+_SLEEP_RESPONSE = {'message': '', 'emotion': 'sleep', 'timestamp': None, 'type': 'sleep'}
+_WAKE_RESPONSE = {'message': '', 'emotion': 'wake', 'timestamp': None, 'type': 'wake'}
+
+# File paths that suggest error handling code
+_ERROR_PATH_RE = re.compile(r'error|exception', re.IGNORECASE)
+
+# Emotions used for positive variety
+_POSITIVE_EMOTIONS = ('joyful', 'hopeful', 'cheeky-wink', 'sly-wink', 'laughing')
+
+# Context keys consulted by rule-based emotion selection, in order
+_CONTEXT_KEYS = ('error_severity', 'interaction_type', 'user_relationship')
+_NO_MAPPING: Dict[str, List[str]] = {}
+
+
+class AliasTable:
+    """Vose alias table for O(1) weighted random sampling."""
+    
+    def __init__(self, weights: List[float]):
+        """Build probability and alias tables from non-negative weights."""
+        n = len(weights)
+        weights = [max(w, 0) for w in weights]
+        total = sum(weights)
+        
+        self.n = n
+        self.prob: List[float] = [1.0] * n
+        self.alias: List[int] = list(range(n))
+        # Equal (or all invalid) weights sample uniformly without the tables
+        self.uniform = total <= 0 or len(set(weights)) == 1
+        
+        if self.uniform:
+            return
+        
+        scaled = [w * n / total for w in weights]
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        
+        while small and large:
+            lo, hi = small.pop(), large.pop()
+            self.prob[lo] = scaled[lo]
+            self.alias[lo] = hi
+            scaled[hi] -= 1.0 - scaled[lo]
+            (small if scaled[hi] < 1.0 else large).append(hi)
+        
+        # Leftovers are 1.0 up to floating point error
+        for i in small + large:
+            self.prob[i] = 1.0
+    
+    def sample(self, _random=random.random) -> int:
+        """Return a weighted random index."""
+        i = int(_random() * self.n)
+        return i if _random() < self.prob[i] else self.alias[i]
 
 
 class PersonalitySystem:
@@ -40,21 +189,35 @@ class PersonalitySystem:
         self.current_state = "idle"  # "idle", "task", "emotion"
         self.current_video_start_time = None
         self.current_video_duration = None
-        self.task_queue = []  # Queue of emotions to show during tasks
+        self.task_queue: Deque[str] = deque()  # Queue of emotions to show during tasks
         self.is_sleeping = False  # Track sleep state
         self.sleep_pending = False  # Track if sleep should happen after current video
+        # Called whenever the current video's timing changes, so a video
+        # scheduler can re-plan its next wakeup
+        self.on_video_schedule_change: Optional[Callable[[], None]] = None
+        
+        # Alias tables keyed by id() of the video list, with the list kept
+        # alongside so a reassigned list never reuses a stale table; None
+        # marks a list with uniform weights
+        self._alias_tables: Dict[int, Tuple[List[VideoInfo], Optional[AliasTable]]] = {}
         
-        self._load_expressions()
+        # Expressions are loaded on first use
+        self._loaded = False
+    
+    def _ensure_loaded(self) -> None:
+        """Load expressions the first time they are needed."""
+        if not self._loaded:
+            self._load_expressions()
     
     def _load_expressions(self) -> None:
         """Load personality expressions from configuration file."""
         try:
-            with open(self.expressions_file, 'r') as f:
-                config = json.load(f)
+            with open(self.expressions_file, 'rb') as f:
+                config = orjson.loads(f.read())
             
             # Load expressions
             for emotion, data in config.get('emotions', {}).items():
-                self.expressions[emotion] = PersonalityExpression(**data)
+                self.expressions[emotion] = PersonalityExpression.from_config(data)
             
             # Load context mapping
             self.context_mapping = config.get('context_mapping', {})
@@ -63,7 +226,7 @@ class PersonalitySystem:
             # Load idle videos
             idle_config = config.get('idle_videos', {})
             idle_videos_data = idle_config.get('videos', [])
-            self.idle_videos = [VideoInfo(**video) for video in idle_videos_data]
+            self.idle_videos = [VideoInfo.from_config(video) for video in idle_videos_data]
             
             # Set default emotion
             self.default_emotion = 'neutral'
@@ -80,9 +243,30 @@ class PersonalitySystem:
                     use_cases=["general communication"]
                 )
             }
+        
+        # Sampling tables are built up front so responses never pay for them
+        self._build_alias_tables()
+        
+        # Context mapping and fallbacks filtered to emotions that actually exist
+        self._valid_mapping = {
+            key: {
+                value: [emotion for emotion in emotions if emotion in self.expressions]
+                for value, emotions in mapping.items()
+            }
+            for key, mapping in self.context_mapping.items()
+            if isinstance(mapping, dict)
+        }
+        self._valid_fallbacks = [e for e in self.fallback_emotions if e in self.expressions]
+        self._positive_pool = tuple(e for e in _POSITIVE_EMOTIONS if e in self.expressions)
+        self._available_emotions = tuple(self.expressions)
+        
+        # Bound lookup for the response paths; rebind if self.expressions is replaced
+        self._get_expr = self.expressions.get
+        self._loaded = True
     
     def get_emotion_for_context(self, message: str, context: Dict[str, Any]) -> str:
         """Determine appropriate emotion based on message and context."""
+        self._ensure_loaded()
         if self.bedrock_client:
             try:
                 # Use AI to determine emotion
@@ -103,164 +287,97 @@ class PersonalitySystem:
     
     def _determine_emotion_by_rules(self, context: Dict[str, Any]) -> str:
         """Determine emotion using rule-based logic."""
+        valid_mapping = self._valid_mapping
         candidates = []
         
-        # Check error severity
-        error_severity = context.get('error_severity')
-        if error_severity in self.context_mapping.get('error_severity', {}):
-            candidates.extend(self.context_mapping['error_severity'][error_severity])
+        # Check error severity, interaction type and user relationship
+        for key in _CONTEXT_KEYS:
+            value = context.get(key)
+            if value is not None:
+                candidates += valid_mapping.get(key, _NO_MAPPING).get(value, ())
         
-        # Check interaction type
-        interaction_type = context.get('interaction_type')
-        if interaction_type in self.context_mapping.get('interaction_type', {}):
-            candidates.extend(self.context_mapping['interaction_type'][interaction_type])
-        
-        # Check user relationship
-        user_relationship = context.get('user_relationship')
-        if user_relationship in self.context_mapping.get('user_relationship', {}):
-            candidates.extend(self.context_mapping['user_relationship'][user_relationship])
-        
-        # Filter candidates to only available expressions
-        valid_candidates = [c for c in candidates if c in self.expressions]
-        
-        if valid_candidates:
+        if candidates:
             # Random selection from valid candidates for variety
-            return random.choice(valid_candidates)
+            return random.choice(candidates)
         
         # Use fallback emotions
-        valid_fallbacks = [e for e in self.fallback_emotions if e in self.expressions]
-        return random.choice(valid_fallbacks) if valid_fallbacks else self.default_emotion
+        return random.choice(self._valid_fallbacks) if self._valid_fallbacks else self.default_emotion
     
     def get_expression_data(self, emotion: str) -> Optional[PersonalityExpression]:
         """Get expression data for a specific emotion."""
-        return self.expressions.get(emotion)
+        self._ensure_loaded()
+        return self._get_expr(emotion)
     
     def get_emotion_for_message_type(self, message_type: str) -> str:
         """Get appropriate emotion for specific message types."""
-        type_mapping = {
-            'greeting': 'joyful',
-            'error': 'serious',
-            'warning': 'skeptical',
-            'success': 'joyful',
-            'progress': 'hopeful',
-            'question': 'neutral',
-            'conflict': 'serious',
-            'humor': 'laughing',
-            'frustration': 'frustrated',
-            'processing': 'tired'
-        }
-        
-        emotion = type_mapping.get(message_type, self.default_emotion)
+        self._ensure_loaded()
+        emotion = _MESSAGE_TYPE_EMOTION.get(message_type, self.default_emotion)
         return emotion if emotion in self.expressions else self.default_emotion
     
     def get_random_positive_emotion(self) -> str:
         """Get a random positive emotion for variety."""
-        positive_emotions = ['joyful', 'hopeful', 'cheeky-wink', 'sly-wink', 'laughing']
-        available_positive = [e for e in positive_emotions if e in self.expressions]
-        
-        if available_positive:
-            return random.choice(available_positive)
+        self._ensure_loaded()
+        if self._positive_pool:
+            return random.choice(self._positive_pool)
         return self.default_emotion
     
     def create_personality_response(self, message: str, emotion: str, 
                                   additional_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Create a complete personality response with emotion and message."""
-        expression = self.get_expression_data(emotion)
-        
+        self._ensure_loaded()
         response = {
             'message': message,
             'emotion': emotion,
-            'timestamp': str(int(time.time() * 1000))  # JavaScript timestamp
+            'timestamp': _now_ms_str()  # JavaScript timestamp
         }
-        
-        if expression:
-            # Select a weighted random video from the available videos for this emotion
-            selected_video = self._weighted_random_selection(expression.videos)
-            if selected_video:
-                response.update({
-                    'video': selected_video.location,
-                    'duration': selected_video.duration,
-                    'description': expression.description
-                })
-                
-                # Update current video tracking
-                self.current_state = "emotion"
-                self.current_video_start_time = time.time()
-                self.current_video_duration = selected_video.duration
-        
-        if additional_data:
-            response.update(additional_data)
-        
-        return response
+        return self._build_video_response(response, emotion, "emotion", additional_data)
     
     def get_context_for_file_change(self, change_type: str, file_path: str) -> Dict[str, Any]:
         """Create context for file change events."""
-        context = {
-            'interaction_type': 'status_update',
-            'error_severity': 'low'
-        }
-        
-        if change_type in ['deleted', 'moved']:
-            context['error_severity'] = 'medium'
-        elif 'error' in file_path.lower() or 'exception' in file_path.lower():
-            context['error_severity'] = 'high'
-            context['interaction_type'] = 'warning'
-        
-        return context
+        return dict(_file_change_context(change_type, _ERROR_PATH_RE.search(file_path) is not None))
     
     def get_context_for_system_event(self, event_type: str, severity: str = 'medium') -> Dict[str, Any]:
         """Create context for system events."""
-        context = {
-            'error_severity': severity,
-            'interaction_type': 'status_update'
-        }
-        
-        event_mappings = {
-            'startup': {'interaction_type': 'greeting'},
-            'shutdown': {'interaction_type': 'greeting'},
-            'error': {'interaction_type': 'warning', 'error_severity': 'high'},
-            'conflict': {'interaction_type': 'conflict_resolution'},
-            'success': {'interaction_type': 'celebration'},
-            'discovery': {'interaction_type': 'discovery'},
-            'processing': {'interaction_type': 'heavy_processing'}
-        }
-        
-        if event_type in event_mappings:
-            context.update(event_mappings[event_type])
-        
-        return context
+        return dict(_system_event_context(event_type, severity))
     
-    def get_available_emotions(self) -> List[str]:
-        """Get list of all available emotions."""
-        return list(self.expressions.keys())
+    def get_available_emotions(self) -> Tuple[str, ...]:
+        """Get all available emotions."""
+        self._ensure_loaded()
+        return self._available_emotions
     
     def _weighted_random_selection(self, videos: List[VideoInfo]) -> Optional[VideoInfo]:
         """Select a video using weighted random selection."""
         if not videos:
             return None
         
-        # Calculate total weight
-        total_weight = sum(video.weight for video in videos)
-        
-        if total_weight <= 0:
-            # Fallback to equal probability if all weights are invalid
+        table = self._get_alias_table(videos)
+        if table is None:
+            # Uniform weights - the common case for emotion videos
             return random.choice(videos)
         
-        # Generate random number within total weight
-        random_value = random.randint(1, total_weight)
-        
-        # Find the video that corresponds to this random value
-        cumulative_weight = 0
-        for video in videos:
-            cumulative_weight += video.weight
-            if random_value <= cumulative_weight:
-                return video
-        
-        # Fallback (should not reach here)
-        return videos[-1]
+        return videos[table.sample()]
+    
+    def _get_alias_table(self, videos: List[VideoInfo]) -> Optional[AliasTable]:
+        """Return the cached alias table for a video list, or None if weights are uniform."""
+        cached = self._alias_tables.get(id(videos))
+        if cached is None or cached[0] is not videos:
+            table = AliasTable([video.weight for video in videos])
+            cached = (videos, None if table.uniform else table)
+            self._alias_tables[id(videos)] = cached
+        return cached[1]
+    
+    def _build_alias_tables(self) -> None:
+        """Precompute alias tables for every expression and the idle videos."""
+        self._alias_tables.clear()
+        for expression in self.expressions.values():
+            if expression.videos:
+                self._get_alias_table(expression.videos)
+        if self.idle_videos:
+            self._get_alias_table(self.idle_videos)
     
     def get_random_idle_video(self) -> Optional[VideoInfo]:
         """Get a weighted random idle video for waiting periods."""
+        self._ensure_loaded()
         if self.idle_videos:
             return self._weighted_random_selection(self.idle_videos)
         return None
@@ -269,12 +386,8 @@ class PersonalitySystem:
         """Create an idle video response for waiting periods."""
         idle_video = self.get_random_idle_video()
         
-        response = {
-            'message': '',
-            'emotion': 'idle',
-            'timestamp': str(int(time.time() * 1000)),
-            'type': 'idle'
-        }
+        response = _IDLE_RESPONSE.copy()
+        response['timestamp'] = _now_ms_str()
         
         if idle_video:
             response['video'] = idle_video.location
@@ -283,13 +396,39 @@ class PersonalitySystem:
             
             # Update current video tracking
             self.current_state = "idle"
-            self.current_video_start_time = time.time()
+            self.current_video_start_time = time.monotonic()
             self.current_video_duration = idle_video.duration
+            self._video_schedule_changed()
         
         return response
     
+    def _scan_video_files(self) -> Set[str]:
+        """List existing files in every directory that holds a configured video.
+        
+        One scandir per directory instead of one stat per video.
+        """
+        directories = {
+            os.path.dirname(os.path.normpath(video.location))
+            for videos in [expression.videos for expression in self.expressions.values()] + [self.idle_videos]
+            for video in videos
+        }
+        
+        existing: Set[str] = set()
+        if len(directories) > 4:
+            # Videos spread over many directories - scandir releases the GIL,
+            # so scan them in parallel
+            with ThreadPoolExecutor(max_workers=min(32, len(directories))) as executor:
+                for files in executor.map(_list_files, directories):
+                    existing.update(files)
+        else:
+            for directory in directories:
+                existing.update(_list_files(directory))
+        
+        return existing
+    
     def validate_expressions_config(self) -> Dict[str, Any]:
         """Validate the expressions configuration and return status."""
+        self._ensure_loaded()
         validation_result = {
             'valid': True,
             'errors': [],
@@ -302,11 +441,13 @@ class PersonalitySystem:
             }
         }
         
+        existing = self._scan_video_files()
+        
         # Check if expression videos exist
         for emotion, expression in self.expressions.items():
             missing_videos = []
             for video_info in expression.videos:
-                if not Path(video_info.location).exists():
+                if os.path.normpath(video_info.location) not in existing:
                     missing_videos.append(video_info.location)
             
             if missing_videos:
@@ -319,7 +460,7 @@ class PersonalitySystem:
         # Check if idle videos exist
         missing_idle_videos = []
         for video_info in self.idle_videos:
-            if not Path(video_info.location).exists():
+            if os.path.normpath(video_info.location) not in existing:
                 missing_idle_videos.append(video_info.location)
         
         if missing_idle_videos:
@@ -342,12 +483,14 @@ class PersonalitySystem:
         """Start a task with the specified emotion."""
         self.current_state = "task"
         self.task_queue.append(emotion)
+        self._video_schedule_changed()
         logging.info(f"Task started with emotion: {emotion}")
     
     def add_task_emotion(self, emotion: str) -> None:
         """Add another emotion to the task queue."""
         if self.current_state == "task":
             self.task_queue.append(emotion)
+            self._video_schedule_changed()
             logging.info(f"Added emotion to task queue: {emotion}")
     
     def complete_task(self) -> None:
@@ -356,6 +499,7 @@ class PersonalitySystem:
         self.task_queue.clear()
         self.current_video_start_time = None
         self.current_video_duration = None
+        self._video_schedule_changed()
         logging.info("Task completed, returning to idle state")
     
     def should_change_video(self) -> bool:
@@ -363,9 +507,22 @@ class PersonalitySystem:
         if self.current_video_start_time is None or self.current_video_duration is None:
             return True
         
-        elapsed_time = time.time() - self.current_video_start_time
+        elapsed_time = time.monotonic() - self.current_video_start_time
         return elapsed_time >= self.current_video_duration
     
+    def time_until_next_change(self) -> Optional[float]:
+        """Seconds until should_change_video() becomes true, or None while asleep."""
+        if self.is_sleeping:
+            # Only wake_up() changes the video again
+            return None
+        if self.current_video_start_time is None or self.current_video_duration is None:
+            return 0.0
+        return max(0.0, self.current_video_start_time + self.current_video_duration - time.monotonic())
+    
+    def _video_schedule_changed(self) -> None:
+        if self.on_video_schedule_change is not None:
+            self.on_video_schedule_change()
+    
     def get_next_video(self) -> Optional[Dict[str, Any]]:
         """Get the next video to display based on current state."""
         # Check if sleep is pending after current video completes
@@ -381,7 +538,7 @@ class PersonalitySystem:
             return self.create_idle_response()
         elif self.current_state == "task" and self.task_queue:
             # Get next emotion from task queue
-            emotion = self.task_queue.pop(0)
+            emotion = self.task_queue.popleft()
             return self.create_task_emotion_response(emotion)
         elif self.current_state == "task" and not self.task_queue:
             # Task queue is empty, return to idle
@@ -400,62 +557,50 @@ class PersonalitySystem:
     
     def create_task_emotion_response(self, emotion: str) -> Dict[str, Any]:
         """Create a response for a task emotion."""
-        expression = self.get_expression_data(emotion)
-        
-        response = {
-            'message': '',
-            'emotion': emotion,
-            'timestamp': str(int(time.time() * 1000)),
-            'type': 'task_emotion'
-        }
-        
-        if expression:
-            # Select a weighted random video from the available videos for this emotion
-            selected_video = self._weighted_random_selection(expression.videos)
-            if selected_video:
-                response.update({
-                    'video': selected_video.location,
-                    'duration': selected_video.duration,
-                    'description': expression.description
-                })
-                
-                # Update current video tracking
-                self.current_state = "task"
-                self.current_video_start_time = time.time()
-                self.current_video_duration = selected_video.duration
-        
-        return response
+        self._ensure_loaded()
+        response = _TASK_EMOTION_RESPONSE.copy()
+        response['emotion'] = emotion
+        response['timestamp'] = _now_ms_str()
+        return self._build_video_response(response, emotion, "task")
     
     def create_enhanced_personality_response(self, message: str, emotion: str, 
                                            additional_data: Optional[Dict[str, Any]] = None,
                                            is_task: bool = False) -> Dict[str, Any]:
         """Create a complete personality response with duration-aware video management."""
-        expression = self.get_expression_data(emotion)
-        
+        self._ensure_loaded()
         response = {
             'message': message,
             'emotion': emotion,
-            'timestamp': str(int(time.time() * 1000))
+            'timestamp': _now_ms_str()
         }
+        return self._build_video_response(
+            response, emotion, "task" if is_task else "emotion", additional_data
+        )
+    
+    def _build_video_response(self, response: Dict[str, Any], emotion: str,
+                              next_state: Optional[str] = None,
+                              additional_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Attach a weighted random video for an emotion to a response.
+        
+        When a video is found, video tracking restarts and the state moves to
+        next_state (if given).
+        """
+        expression = self._get_expr(emotion)
         
         if expression:
             # Select a weighted random video from the available videos for this emotion
             selected_video = self._weighted_random_selection(expression.videos)
             if selected_video:
-                response.update({
-                    'video': selected_video.location,
-                    'duration': selected_video.duration,
-                    'description': expression.description
-                })
+                response['video'] = selected_video.location
+                response['duration'] = selected_video.duration
+                response['description'] = expression.description
                 
                 # Update current video tracking
-                if is_task:
-                    self.current_state = "task"
-                else:
-                    self.current_state = "emotion"
-                
-                self.current_video_start_time = time.time()
+                if next_state:
+                    self.current_state = next_state
+                self.current_video_start_time = time.monotonic()
                 self.current_video_duration = selected_video.duration
+                self._video_schedule_changed()
         
         if additional_data:
             response.update(additional_data)
@@ -464,25 +609,29 @@ class PersonalitySystem:
     
     def get_video_status(self) -> Dict[str, Any]:
         """Get current video status and timing information."""
-        status = {
+        start_time, duration = self.current_video_start_time, self.current_video_duration
+        
+        if start_time and duration:
+            # One clock read serves both the timing fields and should_change
+            elapsed = time.monotonic() - start_time
+            return {
+                'current_state': self.current_state,
+                'task_queue_length': len(self.task_queue),
+                'should_change': elapsed >= duration,
+                'elapsed_time': elapsed,
+                'remaining_time': max(0, duration - elapsed),
+                'total_duration': duration
+            }
+        
+        return {
             'current_state': self.current_state,
             'task_queue_length': len(self.task_queue),
             'should_change': self.should_change_video()
         }
-        
-        if self.current_video_start_time and self.current_video_duration:
-            elapsed = time.time() - self.current_video_start_time
-            remaining = max(0, self.current_video_duration - elapsed)
-            status.update({
-                'elapsed_time': elapsed,
-                'remaining_time': remaining,
-                'total_duration': self.current_video_duration
-            })
-        
-        return status
     
     def go_to_sleep(self) -> Dict[str, Any]:
         """Put Sage to sleep - triggered when page loses focus."""
+        self._ensure_loaded()
         if self.is_sleeping:
             return None  # Already sleeping
         
@@ -497,32 +646,19 @@ class PersonalitySystem:
         self.sleep_pending = False
         self.current_state = "sleep"
         
-        expression = self.get_expression_data("sleep")
-        response = {
-            'message': '',
-            'emotion': 'sleep',
-            'timestamp': str(int(time.time() * 1000)),
-            'type': 'sleep'
-        }
-        
-        if expression:
-            selected_video = self._weighted_random_selection(expression.videos)
-            if selected_video:
-                response.update({
-                    'video': selected_video.location,
-                    'duration': selected_video.duration,
-                    'description': expression.description
-                })
-                
-                # Update current video tracking - sleep video doesn't loop
-                self.current_video_start_time = time.time()
-                self.current_video_duration = selected_video.duration
+        response = _SLEEP_RESPONSE.copy()
+        response['timestamp'] = _now_ms_str()
+        # Sleep video doesn't loop
+        self._build_video_response(response, "sleep")
+        # Wake the scheduler even when no sleep video was found
+        self._video_schedule_changed()
         
         logging.info("Sage went to sleep")
         return response
     
     def wake_up(self) -> Dict[str, Any]:
         """Wake Sage up - triggered when page regains focus."""
+        self._ensure_loaded()
         if not self.is_sleeping:
             return None  # Not sleeping
         
@@ -530,26 +666,11 @@ class PersonalitySystem:
         self.sleep_pending = False
         self.current_state = "emotion"  # Wake up is an emotion, then return to idle
         
-        expression = self.get_expression_data("wake")
-        response = {
-            'message': '',
-            'emotion': 'wake',
-            'timestamp': str(int(time.time() * 1000)),
-            'type': 'wake'
-        }
-        
-        if expression:
-            selected_video = self._weighted_random_selection(expression.videos)
-            if selected_video:
-                response.update({
-                    'video': selected_video.location,
-                    'duration': selected_video.duration,
-                    'description': expression.description
-                })
-                
-                # Update current video tracking
-                self.current_video_start_time = time.time()
-                self.current_video_duration = selected_video.duration
+        response = _WAKE_RESPONSE.copy()
+        response['timestamp'] = _now_ms_str()
+        self._build_video_response(response, "wake")
+        # Without a wake video nothing else would restart the scheduler
+        self._video_schedule_changed()
         
         logging.info("Sage woke up")
         return response
@@ -1,14 +1,101 @@
 // Sage UI JavaScript
+
+// Markdown-like rules used until marked.js has loaded, applied in order
+const MARKDOWN_FALLBACK_RULES = [
+    [/\*\*(.*?)\*\*/g, '<strong>$1</strong>'],
+    [/\*(.*?)\*/g, '<em>$1</em>'],
+    [/`(.*?)`/g, '<code>$1</code>'],
+    [/^# (.*$)/gim, '<h1>$1</h1>'],
+    [/^## (.*$)/gim, '<h2>$1</h2>'],
+    [/^### (.*$)/gim, '<h3>$1</h3>'],
+    [/^- (.*$)/gim, '<li>$1</li>'],
+    [/\n/g, '<br>']
+];
+
+// Server control frames: first byte is the opcode, decoded without JSON.parse
+const CONTROL_FRAMES = {
+    0x01: () => ({ type: 'thinking_start', data: {} }),
+    0x02: (view) => ({
+        type: 'thinking_complete',
+        data: { response_time: `${view.getFloat32(1, true).toFixed(1)}s` }
+    }),
+    0x03: () => ({ type: 'thinking_error', data: { message: 'Hmm, having trouble with that...' } })
+};
+
+// Shared formatter for message times (same output as toLocaleTimeString)
+const TIME_FORMAT = new Intl.DateTimeFormat(undefined, {
+    hour: 'numeric',
+    minute: '2-digit',
+    second: '2-digit'
+});
+
 class SageUI {
     constructor() {
         this.ws = null;
+        this.debug = window.SAGE_DEBUG === true;
+        this.textDecoder = new TextDecoder();
+        this.inbound = Promise.resolve();
+        this.streamingDiv = null;
+        this.streamingText = '';
+        this.thinkingDiv = null;
+        this.pendingMessages = null;
         this.reconnectInterval = 5000;
         this.isOffline = false;
         this.wasOffline = false;
         this.sleepVideoPreloaded = false;
+        this.templates = new Map();
+        this.projectNodes = new Map();
+        this.agentNodes = new Map();
+        
+        // Elements touched on every frame or poll, looked up once; the UI
+        // is created after DOMContentLoaded so they all exist already
+        this.messagesEl = document.getElementById('messages');
+        this.messagesContainerEl = document.getElementById('messages-container');
+        this.faceEl = document.getElementById('sage-face');
+        this.emotionEl = document.getElementById('current-emotion');
+        this.descriptionEl = document.getElementById('emotion-description');
+        this.statusEl = document.getElementById('status-indicator');
+        this.offlineEl = document.getElementById('offline-message');
+        this.toastsEl = document.getElementById('toast-container');
+        this.statsEl = document.getElementById('stats-content');
+        this.projectsEl = document.getElementById('monitored-projects-list');
+        this.agentsEl = document.getElementById('agents-list');
+        
+        // Frame type -> handler, looked up once per incoming frame
+        this.messageHandlers = Object.freeze({
+            batch: (data) => data.items.forEach((item) => this.handleMessage(item)),
+            message: (data) => {
+                this.finishStreamingMessage();
+                this.displayMessage(data.data, 'sage');
+                this.updatePersonality(data.data);
+            },
+            notification: (data) => {
+                this.displayMessage(data.data, 'system');
+                this.updatePersonality(data.data);
+            },
+            file_change: (data) => this.displayFileChange(data.data),
+            conflict_resolution: (data) => this.displayConflictResolution(data.data),
+            video_change: (data) => {
+                this.updatePersonality(data.data);
+                console.log('Video changed:', data.data.emotion, data.data.type);
+            },
+            token: (data) => this.appendStreamingToken(data.data.text),
+            dashboard_update: (data) => this.applyDashboard(data.data),
+            thinking_start: () => this.showThinkingIndicator(),
+            thinking_complete: (data) => {
+                this.removeThinkingIndicator();
+                console.log('Thinking completed:', data.data.response_time);
+            },
+            thinking_error: (data) => {
+                this.removeThinkingIndicator();
+                console.log('Thinking error:', data.data.message);
+            }
+        });
+        
         this.preloadSleepVideo();
         this.connect();
         this.bindEvents();
+        this.bindAutoScroll();
         this.loadMarkdownLibrary();
     }
     
@@ -39,69 +126,42 @@ class SageUI {
             return marked.parse(text);
         } else {
             // Fallback: basic markdown-like formatting
-            return text
-                .replace(/\*\*(.*?)\*\*/g, '<strong>$1</strong>')
-                .replace(/\*(.*?)\*/g, '<em>$1</em>')
-                .replace(/`(.*?)`/g, '<code>$1</code>')
-                .replace(/^# (.*$)/gim, '<h1>$1</h1>')
-                .replace(/^## (.*$)/gim, '<h2>$1</h2>')
-                .replace(/^### (.*$)/gim, '<h3>$1</h3>')
-                .replace(/^- (.*$)/gim, '<li>$1</li>')
-                .replace(/\n/g, '<br>');
+            let html = text;
+            for (const [pattern, replacement] of MARKDOWN_FALLBACK_RULES) {
+                html = html.replace(pattern, replacement);
+            }
+            return html;
         }
     }
     
     preloadSleepVideo() {
-        // Preload both sleep videos so they're cached and available even when offline
+        // Keep both sleep videos in memory so they're available even when offline.
+        // Blob URLs let #sage-face switch to them without touching the network,
+        // and avoid hidden <video> elements that each hold a decoder.
         this.sleepVideosPreloaded = { transition: false, state: false };
+        this.sleepVideoUrls = {
+            transition: '/personality/video/sage-sleeps.mp4',
+            state: '/personality/video/sage-asleep.mp4'
+        };
         
-        // Preload transition video (sage-sleeps.mp4)
-        const sleepTransitionVideo = document.createElement('video');
-        sleepTransitionVideo.preload = 'auto';
-        sleepTransitionVideo.muted = true;
-        sleepTransitionVideo.style.display = 'none';
-        
-        const transitionSource = document.createElement('source');
-        transitionSource.src = '/personality/video/sage-sleeps.mp4';
-        transitionSource.type = 'video/mp4';
-        
-        sleepTransitionVideo.appendChild(transitionSource);
-        document.body.appendChild(sleepTransitionVideo);
-        
-        sleepTransitionVideo.addEventListener('canplaythrough', () => {
-            this.sleepVideosPreloaded.transition = true;
-            console.log('Sleep transition video (sage-sleeps.mp4) preloaded and cached');
-        });
-        
-        sleepTransitionVideo.addEventListener('error', (e) => {
-            console.warn('Failed to preload sleep transition video:', e);
-        });
-        
-        sleepTransitionVideo.load();
-        
-        // Preload sleep state video (sage-asleep.mp4)
-        const sleepStateVideo = document.createElement('video');
-        sleepStateVideo.preload = 'auto';
-        sleepStateVideo.muted = true;
-        sleepStateVideo.style.display = 'none';
-        
-        const stateSource = document.createElement('source');
-        stateSource.src = '/personality/video/sage-asleep.mp4';
-        stateSource.type = 'video/mp4';
-        
-        sleepStateVideo.appendChild(stateSource);
-        document.body.appendChild(sleepStateVideo);
-        
-        sleepStateVideo.addEventListener('canplaythrough', () => {
-            this.sleepVideosPreloaded.state = true;
-            console.log('Sleep state video (sage-asleep.mp4) preloaded and cached');
-        });
-        
-        sleepStateVideo.addEventListener('error', (e) => {
-            console.warn('Failed to preload sleep state video:', e);
+        Object.keys(this.sleepVideoUrls).forEach((key) => {
+            const url = this.sleepVideoUrls[key];
+            fetch(url)
+                .then((response) => {
+                    if (!response.ok) {
+                        throw new Error(`HTTP ${response.status}`);
+                    }
+                    return response.blob();
+                })
+                .then((blob) => {
+                    this.sleepVideoUrls[key] = URL.createObjectURL(blob);
+                    this.sleepVideosPreloaded[key] = true;
+                    console.log(`Sleep ${key} video (${url}) preloaded into memory`);
+                })
+                .catch((error) => {
+                    console.warn(`Failed to preload sleep ${key} video:`, error);
+                });
         });
-        
-        sleepStateVideo.load();
     }
     
     connect() {
@@ -109,6 +169,8 @@ class SageUI {
         const wsUrl = `${protocol}//${window.location.host}/ws`;
         
         this.ws = new WebSocket(wsUrl);
+        // Server frames are binary UTF-8 JSON
+        this.ws.binaryType = 'arraybuffer';
         
         this.ws.onopen = () => {
             console.log('Connected to Sage');
@@ -117,8 +179,11 @@ class SageUI {
         };
         
         this.ws.onmessage = (event) => {
-            const data = JSON.parse(event.data);
-            this.handleMessage(data);
+            // Chain frames so compressed ones cannot overtake plain ones
+            this.inbound = this.inbound
+                .then(() => this.decodeFrame(event.data))
+                .then((data) => this.handleMessage(data))
+                .catch((error) => console.error('Error handling message:', error));
         };
         
         this.ws.onclose = () => {
@@ -164,14 +229,14 @@ class SageUI {
     }
     
     showOfflineMessage() {
-        const offlineMessage = document.getElementById('offline-message');
+        const offlineMessage = this.offlineEl;
         if (offlineMessage) {
             offlineMessage.classList.remove('hidden');
         }
     }
     
     hideOfflineMessage() {
-        const offlineMessage = document.getElementById('offline-message');
+        const offlineMessage = this.offlineEl;
         if (offlineMessage) {
             offlineMessage.classList.add('hidden');
         }
@@ -182,19 +247,13 @@ class SageUI {
     }
     
     showToast(message, type = 'info', icon = 'ℹ️') {
-        const toastContainer = document.getElementById('toast-container');
+        const toastContainer = this.toastsEl;
         if (!toastContainer) return;
         
-        const toast = document.createElement('div');
-        toast.className = `toast ${type}`;
-        
-        toast.innerHTML = `
-            <div class="toast-content">
-                <span class="toast-icon">${icon}</span>
-                <span class="toast-message">${message}</span>
-            </div>
-            <div class="toast-progress"></div>
-        `;
+        const toast = this.cloneTemplate('tpl-toast');
+        toast.classList.add(type);
+        toast.querySelector('.toast-icon').textContent = icon;
+        toast.querySelector('.toast-message').textContent = message;
         
         toastContainer.appendChild(toast);
         
@@ -208,7 +267,7 @@ class SageUI {
     
     putSageToSleepOffline() {
         // When offline, use two-video sleep sequence: transition -> looping sleep state
-        const face = document.getElementById('sage-face');
+        const face = this.faceEl;
         if (face) {
             const source = face.querySelector('source');
             if (source) {
@@ -234,7 +293,7 @@ class SageUI {
                     }
                     
                     // Step 2: Switch to looping sleep state video (sage-asleep.mp4)
-                    source.src = '/personality/video/sage-asleep.mp4';
+                    source.src = this.sleepVideoUrls.state;
                     face.loop = true;
                     face.setAttribute('loop', '');
                     
@@ -250,35 +309,44 @@ class SageUI {
                 
                 face.addEventListener('ended', this.offlineSleepTransitionHandler);
                 
-                // Add debugging event listeners
-                face.addEventListener('loadstart', () => {
-                    console.log('Sleep transition video: loadstart event');
-                });
-                
-                face.addEventListener('canplay', () => {
-                    console.log('Sleep transition video: canplay event');
-                });
-                
-                face.addEventListener('playing', () => {
-                    console.log('Sleep transition video: playing event');
-                });
+                // Add debugging event listeners (fire-once, so they don't pile up)
+                if (this.debug) {
+                    ['loadstart', 'canplay', 'playing'].forEach((eventName) => {
+                        face.addEventListener(eventName, () => {
+                            console.log(`Sleep transition video: ${eventName} event`);
+                        }, { once: true });
+                    });
+                }
                 
-                face.addEventListener('timeupdate', () => {
-                    console.log(`Sleep transition video: timeupdate - currentTime: ${face.currentTime}, duration: ${face.duration}`);
-                });
+                // Fallback in case the ended event doesn't fire: watch for the
+                // last frame once the clip's real duration is known
+                face.addEventListener('loadedmetadata', () => {
+                    const handler = this.offlineSleepTransitionHandler;
+                    if (!handler) {
+                        return;
+                    }
+                    
+                    if ('requestVideoFrameCallback' in face) {
+                        const checkFrame = () => {
+                            if (this.offlineSleepTransitionHandler !== handler) {
+                                return;
+                            }
+                            if (face.currentTime >= face.duration - 0.05) {
+                                handler();
+                            } else {
+                                face.requestVideoFrameCallback(checkFrame);
+                            }
+                        };
+                        face.requestVideoFrameCallback(checkFrame);
+                    } else {
+                        this.offlineSleepTimeout = setTimeout(handler, (face.duration + 0.5) * 1000);
+                    }
+                }, { once: true });
                 
                 // Start with transition video
-                source.src = '/personality/video/sage-sleeps.mp4';
+                source.src = this.sleepVideoUrls.transition;
                 face.load();
                 
-                // Add a timeout fallback in case the ended event doesn't fire
-                this.offlineSleepTimeout = setTimeout(() => {
-                    console.log('Sleep transition timeout reached - forcing switch to sleep state video');
-                    if (this.offlineSleepTransitionHandler) {
-                        this.offlineSleepTransitionHandler();
-                    }
-                }, 8000); // 8 second timeout (sage-sleeps.mp4 should be ~5 seconds)
-                
                 face.play().catch(error => {
                     console.log('Sleep transition video play failed (offline):', error);
                     // If transition video fails, go directly to sleep state
@@ -296,47 +364,43 @@ class SageUI {
     }
     
     updateStatus(status) {
-        const indicator = document.getElementById('status-indicator');
+        const indicator = this.statusEl;
         indicator.className = `status-${status}`;
         indicator.textContent = status.charAt(0).toUpperCase() + status.slice(1);
     }
     
+    async decodeFrame(data) {
+        if (typeof data === 'string') {
+            return JSON.parse(data);
+        }
+        
+        const bytes = new Uint8Array(data);
+        const control = CONTROL_FRAMES[bytes[0]];
+        if (control) {
+            return control(new DataView(data));
+        }
+        if (bytes[0] === 0x5A) {
+            // 'Z' prefix: zlib-compressed broadcast
+            const stream = new Blob([bytes.subarray(1)]).stream()
+                .pipeThrough(new DecompressionStream('deflate'));
+            return JSON.parse(await new Response(stream).text());
+        }
+        return JSON.parse(this.textDecoder.decode(bytes));
+    }
+    
     handleMessage(data) {
-        if (data.type === 'message') {
-            this.displayMessage(data.data, 'sage');
-            this.updatePersonality(data.data);
-        } else if (data.type === 'notification') {
-            this.displayMessage(data.data, 'system');
-            this.updatePersonality(data.data);
-        } else if (data.type === 'file_change') {
-            this.displayFileChange(data.data);
-        } else if (data.type === 'conflict_resolution') {
-            this.displayConflictResolution(data.data);
-        } else if (data.type === 'video_change') {
-            this.updatePersonality(data.data);
-            console.log('Video changed:', data.data.emotion, data.data.type);
-        } else if (data.type === 'thinking_start') {
-            this.showThinkingIndicator();
-        } else if (data.type === 'thinking_complete') {
-            this.removeThinkingIndicator();
-            console.log('Thinking completed:', data.data.response_time);
-            // Ensure scroll after thinking indicator is removed
-            setTimeout(() => this.scrollToBottom(), 100);
-        } else if (data.type === 'thinking_error') {
-            this.removeThinkingIndicator();
-            console.log('Thinking error:', data.data.message);
-            // Ensure scroll after error indicator is removed
-            setTimeout(() => this.scrollToBottom(), 100);
+        const handler = this.messageHandlers[data.type];
+        if (handler) {
+            handler(data);
         }
     }
     
     displayMessage(messageData, sender) {
-        const messagesContainer = document.getElementById('messages');
         const messageDiv = document.createElement('div');
         messageDiv.className = `message ${sender}`;
         
         const senderName = sender === 'sage' ? 'Sage' : sender === 'user' ? 'You' : 'System';
-        const timestamp = new Date(parseInt(messageData.timestamp)).toLocaleTimeString();
+        const timestamp = TIME_FORMAT.format(parseInt(messageData.timestamp));
         
         // Render markdown for Sage messages
         let messageContent = messageData.message;
@@ -350,93 +414,115 @@ class SageUI {
             <div class="message-time">${timestamp}</div>
         `;
         
-        messagesContainer.appendChild(messageDiv);
-        
-        // Ensure scrolling happens after message content is fully rendered
-        // Use multiple timing checks for reliability
-        this.scrollToBottom();
-        setTimeout(() => this.scrollToBottom(), 50);
-        setTimeout(() => this.scrollToBottom(), 150);
-        setTimeout(() => this.scrollToBottom(), 300);
+        // Sending a message always jumps back to the latest content
+        if (sender === 'user') {
+            this.pinnedToBottom = true;
+        }
+        this.appendMessageNode(messageDiv);
     }
     
     showThinkingIndicator() {
-        const messagesContainer = document.getElementById('messages');
-        const thinkingDiv = document.createElement('div');
-        thinkingDiv.className = 'message sage thinking-indicator';
-        thinkingDiv.id = 'thinking-indicator';
-        
-        const timestamp = new Date().toLocaleTimeString();
-        
-        thinkingDiv.innerHTML = `
-            <div class="message-header">Sage</div>
-            <div class="message-content">
-                <div class="thinking-animation">
-                    <span class="thinking-dots">
-                        <span>.</span><span>.</span><span>.</span>
-                    </span>
-                    <span class="thinking-text">Thinking...</span>
-                </div>
-            </div>
-            <div class="message-time">${timestamp}</div>
-        `;
-        
-        messagesContainer.appendChild(thinkingDiv);
-        this.scrollToBottom();
+        const thinkingDiv = this.cloneTemplate('tpl-thinking');
+        thinkingDiv.querySelector('.message-time').textContent = TIME_FORMAT.format(Date.now());
+        this.thinkingDiv = thinkingDiv;
+        this.appendMessageNode(thinkingDiv);
         
         return thinkingDiv;
     }
     
-    scrollToBottom() {
-        const messagesContainer = document.getElementById('messages-container');
-        if (!messagesContainer) {
-            console.log('Messages container not found');
-            return;
+    appendMessageNode(node) {
+        // Nodes added before the next frame (a batch frame, or several frames
+        // in a burst) are inserted together, costing one style recalc and
+        // layout per frame instead of one per message
+        if (!this.pendingMessages) {
+            this.pendingMessages = document.createDocumentFragment();
+            requestAnimationFrame(() => {
+                this.messagesEl.appendChild(this.pendingMessages);
+                this.pendingMessages = null;
+            });
         }
+        this.pendingMessages.appendChild(node);
+    }
+    
+    cloneTemplate(id) {
+        // Copy a prebuilt node from index.html instead of re-parsing HTML
+        let template = this.templates.get(id);
+        if (!template) {
+            template = document.getElementById(id).content.firstElementChild;
+            this.templates.set(id, template);
+        }
+        return template.cloneNode(true);
+    }
+    
+    bindAutoScroll() {
+        // Follow new content while the user is reading the latest messages;
+        // the observer fires once per layout change instead of on timers
+        const messagesContainer = this.messagesContainerEl;
+        this.pinnedToBottom = true;
+        this.scrollFrame = null;
         
-        // Immediate scroll attempt
-        messagesContainer.scrollTop = messagesContainer.scrollHeight;
+        messagesContainer.addEventListener('scroll', () => {
+            this.pinnedToBottom = messagesContainer.scrollTop + messagesContainer.clientHeight
+                >= messagesContainer.scrollHeight - 4;
+        }, { passive: true });
         
-        // Use requestAnimationFrame to ensure DOM has updated before scrolling
-        requestAnimationFrame(() => {
-            const currentScrollHeight = messagesContainer.scrollHeight;
-            const currentScrollTop = messagesContainer.scrollTop;
-            
-            // Force scroll to bottom (immediate)
+        new ResizeObserver(() => {
+            if (this.pinnedToBottom) {
+                this.scrollToBottom();
+            }
+        }).observe(this.messagesEl);
+    }
+    
+    scrollToBottom() {
+        // At most one scroll write per frame
+        if (this.scrollFrame !== null) {
+            return;
+        }
+        this.scrollFrame = requestAnimationFrame(() => {
+            this.scrollFrame = null;
+            const messagesContainer = this.messagesContainerEl;
             messagesContainer.scrollTop = messagesContainer.scrollHeight;
-            
-            // Also try smooth scroll
-            messagesContainer.scrollTo({
-                top: currentScrollHeight,
-                behavior: 'smooth'
-            });
-            
-            console.log(`Scroll - Height: ${currentScrollHeight}, Was: ${currentScrollTop}, Now: ${messagesContainer.scrollTop}`);
         });
+    }
+    
+    appendStreamingToken(text) {
+        // Show partial LLM output until the final message replaces it
+        if (!this.streamingDiv) {
+            this.removeThinkingIndicator();
+            this.streamingDiv = document.createElement('div');
+            this.streamingDiv.className = 'message sage streaming';
+            this.streamingDiv.innerHTML = `
+                <div class="message-header">Sage</div>
+                <div class="message-content"></div>
+            `;
+            this.streamingText = '';
+            this.appendMessageNode(this.streamingDiv);
+        }
         
-        // Additional fallback scrolls
-        setTimeout(() => {
-            messagesContainer.scrollTop = messagesContainer.scrollHeight;
-        }, 100);
-        
-        setTimeout(() => {
-            messagesContainer.scrollTop = messagesContainer.scrollHeight;
-        }, 500);
+        this.streamingText += text;
+        this.streamingDiv.querySelector('.message-content').textContent = this.streamingText;
+    }
+    
+    finishStreamingMessage() {
+        if (this.streamingDiv) {
+            this.streamingDiv.remove();
+            this.streamingDiv = null;
+            this.streamingText = '';
+        }
     }
     
     removeThinkingIndicator() {
-        const thinkingIndicator = document.getElementById('thinking-indicator');
-        if (thinkingIndicator) {
-            thinkingIndicator.remove();
-            // Ensure scroll position is maintained after removing indicator
-            setTimeout(() => this.scrollToBottom(), 10);
+        // Held by reference: it may still be waiting in the pending fragment
+        if (this.thinkingDiv) {
+            this.thinkingDiv.remove();
+            this.thinkingDiv = null;
         }
     }
     
     updatePersonality(messageData) {
-        const face = document.getElementById('sage-face');
-        const emotionSpan = document.getElementById('current-emotion');
-        const descriptionSpan = document.getElementById('emotion-description');
+        const face = this.faceEl;
+        const emotionSpan = this.emotionEl;
+        const descriptionSpan = this.descriptionEl;
         
         if (messageData.video) {
             // Update video source and play the new video
@@ -462,7 +548,7 @@ class SageUI {
                         console.log('Server sleep transition video ended - switching to sleep state video');
                         
                         // Step 2: Switch to looping sleep state video (sage-asleep.mp4)
-                        source.src = '/personality/video/sage-asleep.mp4';
+                        source.src = this.sleepVideoUrls.state;
                         face.loop = true;
                         face.setAttribute('loop', '');
                         
@@ -532,34 +618,23 @@ class SageUI {
     }
     
     displayConflictResolution(data) {
-        const messagesContainer = document.getElementById('messages');
-        const conflictDiv = document.createElement('div');
-        conflictDiv.className = 'message system conflict';
+        // Built from a template with textContent, so option strings are
+        // never parsed as HTML
+        const conflictDiv = this.cloneTemplate('tpl-conflict');
+        conflictDiv.dataset.conflict = data.conflict_description;
         
-        let optionsHtml = '';
+        const options = conflictDiv.querySelector('.conflict-options');
         data.options.forEach((option, index) => {
-            optionsHtml += `<button class="conflict-option" data-option="${index}">${option}</button>`;
+            const button = document.createElement('button');
+            button.className = 'conflict-option';
+            button.dataset.option = index;
+            button.textContent = option;
+            options.appendChild(button);
         });
+        options.before(data.message);
+        conflictDiv.querySelector('.message-time').textContent = TIME_FORMAT.format(parseInt(data.timestamp));
         
-        conflictDiv.innerHTML = `
-            <div class="message-header">Sage - Conflict Resolution Needed</div>
-            <div class="message-content">
-                ${data.message}
-                <div class="conflict-options">${optionsHtml}</div>
-            </div>
-            <div class="message-time">${new Date(parseInt(data.timestamp)).toLocaleTimeString()}</div>
-        `;
-        
-        messagesContainer.appendChild(conflictDiv);
-        messagesContainer.scrollTop = messagesContainer.scrollHeight;
-        
-        // Bind option buttons
-        conflictDiv.querySelectorAll('.conflict-option').forEach(button => {
-            button.addEventListener('click', (e) => {
-                const option = e.target.dataset.option;
-                this.sendConflictResolution(data.conflict_description, option);
-            });
-        });
+        this.appendMessageNode(conflictDiv);
         
         this.updatePersonality(data);
     }
@@ -606,10 +681,20 @@ class SageUI {
             }
         });
         
+        // One delegated listener for controls inside messages, rather than
+        // listeners bound to every message as it is created
+        this.messagesEl.addEventListener('click', (e) => {
+            const button = e.target.closest('.conflict-option');
+            if (button) {
+                const message = button.closest('.message');
+                this.sendConflictResolution(message.dataset.conflict, button.dataset.option);
+            }
+        });
+        
         // Bind Sage toggle functionality
         const sageToggle = document.getElementById('sage-toggle');
         const toggleLabel = document.getElementById('toggle-label');
-        const sageFace = document.getElementById('sage-face');
+        const sageFace = this.faceEl;
         
         sageToggle.addEventListener('change', () => {
             if (sageToggle.checked) {
@@ -623,15 +708,9 @@ class SageUI {
             }
         });
         
-        // Load system stats and project data periodically
-        this.loadStats();
-        this.loadProjects();
-        this.loadAgents();
-        setInterval(() => {
-            this.loadStats();
-            this.loadProjects();
-            this.loadAgents();
-        }, 30000);
+        // Load system stats and project data once; the server pushes
+        // dashboard_update frames whenever they change
+        this.loadDashboard();
         
         // Enable video interaction on first user click to handle autoplay restrictions
         document.addEventListener('click', this.enableVideoAutoplay.bind(this), { once: true });
@@ -641,7 +720,7 @@ class SageUI {
     }
     
     enableVideoAutoplay() {
-        const face = document.getElementById('sage-face');
+        const face = this.faceEl;
         if (face) {
             face.muted = true; // Ensure muted for autoplay
             face.play().catch(error => {
@@ -650,18 +729,23 @@ class SageUI {
         }
     }
     
-    async loadStats() {
+    async loadDashboard() {
         try {
-            const response = await fetch('/api/status');
-            const data = await response.json();
-            this.updateStats(data);
+            const response = await fetch('/api/dashboard');
+            this.applyDashboard(await response.json());
         } catch (error) {
-            console.error('Error loading stats:', error);
+            console.error('Error loading dashboard:', error);
         }
     }
     
+    applyDashboard(data) {
+        this.updateStats(data.status);
+        this.updateProjects(data.projects);
+        this.updateAgents(data.agents);
+    }
+    
     updateStats(data) {
-        const statsContent = document.getElementById('stats-content');
+        const statsContent = this.statsEl;
         statsContent.innerHTML = `
             <div class="stat-item">
                 <span class="stat-label">Status</span>
@@ -736,72 +820,76 @@ class SageUI {
         }
     }
     
-    async loadProjects() {
-        try {
-            const response = await fetch('/api/projects');
-            const data = await response.json();
-            this.updateProjects(data.projects);
-        } catch (error) {
-            console.error('Error loading projects:', error);
-        }
+    updateProjects(projects) {
+        // Keyed by path: projects in different directories can share a name
+        this.syncActivityList(this.projectsEl, this.projectNodes, 'project', projects,
+            (project) => project.path, 'No projects configured', (project) => ({
+                status: `${project.status} • ${project.crew_config} • ${project.priority} priority`,
+                busy: project.is_active,
+                label: project.is_active ? 'Active' : 'Idle'
+            }));
     }
     
-    updateProjects(projects) {
-        const projectsList = document.getElementById('monitored-projects-list');
-        
-        if (projects.length === 0) {
-            projectsList.innerHTML = '<div class="project-item"><div class="project-info"><div class="project-name">No projects configured</div></div></div>';
+    syncActivityList(list, nodes, kind, items, keyOf, emptyText, describe) {
+        // Rows are keyed by keyOf(item) and only changed text/classes are written,
+        // so an unchanged poll leaves the DOM untouched
+        if (items.length === 0) {
+            nodes.clear();
+            list.innerHTML = `<div class="${kind}-item"><div class="${kind}-info"><div class="${kind}-name">${emptyText}</div></div></div>`;
             return;
         }
+        if (nodes.size === 0) {
+            // Drop the empty-state placeholder
+            list.replaceChildren();
+        }
         
-        projectsList.innerHTML = projects.map(project => `
-            <div class="project-item">
-                <div class="project-info">
-                    <div class="project-name">${project.name}</div>
-                    <div class="project-status">${project.status} • ${project.crew_config} • ${project.priority} priority</div>
-                </div>
-                <div class="activity-indicator">
-                    <div class="spinner ${project.is_active ? '' : 'hidden'}"></div>
-                    <span class="status-badge status-${project.is_active ? 'processing' : 'idle'}">
-                        ${project.is_active ? 'Active' : 'Idle'}
-                    </span>
-                </div>
-            </div>
-        `).join('');
-    }
-    
-    async loadAgents() {
-        try {
-            const response = await fetch('/api/agents');
-            const data = await response.json();
-            this.updateAgents(data.agents);
-        } catch (error) {
-            console.error('Error loading agents:', error);
+        const seen = new Set();
+        const fragment = document.createDocumentFragment();
+        for (const item of items) {
+            const key = keyOf(item);
+            seen.add(key);
+            let row = nodes.get(key);
+            if (!row) {
+                const root = this.cloneTemplate(`tpl-${kind}`);
+                root.querySelector(`.${kind}-name`).textContent = item.name;
+                row = {
+                    root,
+                    status: root.querySelector(`.${kind}-status`),
+                    spinner: root.querySelector('.spinner'),
+                    badge: root.querySelector('.status-badge')
+                };
+                nodes.set(key, row);
+                fragment.appendChild(root);
+            }
+            
+            const { status, busy, label } = describe(item);
+            if (row.status.textContent !== status) {
+                row.status.textContent = status;
+            }
+            if (row.badge.textContent !== label) {
+                row.badge.textContent = label;
+            }
+            row.spinner.classList.toggle('hidden', !busy);
+            row.badge.classList.toggle('status-processing', busy);
+            row.badge.classList.toggle('status-idle', !busy);
+        }
+        
+        for (const [key, row] of nodes) {
+            if (!seen.has(key)) {
+                row.root.remove();
+                nodes.delete(key);
+            }
         }
+        list.appendChild(fragment);
     }
     
     updateAgents(agents) {
-        const agentsList = document.getElementById('agents-list');
-        
-        if (agents.length === 0) {
-            agentsList.innerHTML = '<div class="agent-item"><div class="agent-info"><div class="agent-name">No agents configured</div></div></div>';
-            return;
-        }
-        
-        agentsList.innerHTML = agents.map(agent => `
-            <div class="agent-item">
-                <div class="agent-info">
-                    <div class="agent-name">${agent.name}</div>
-                    <div class="agent-status">${agent.status}</div>
-                </div>
-                <div class="activity-indicator">
-                    <div class="spinner ${agent.is_processing ? '' : 'hidden'}"></div>
-                    <span class="status-badge status-${agent.is_processing ? 'processing' : 'idle'}">
-                        ${agent.is_processing ? 'Processing' : 'Idle'}
-                    </span>
-                </div>
-            </div>
-        `).join('');
+        this.syncActivityList(this.agentsEl, this.agentNodes, 'agent', agents,
+            (agent) => agent.name, 'No agents configured', (agent) => ({
+                status: agent.status,
+                busy: agent.is_processing,
+                label: agent.is_processing ? 'Processing' : 'Idle'
+            }));
     }
 }
 
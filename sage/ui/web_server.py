@@ -1,17 +1,27 @@
 """Web server for Sage browser-based UI."""
 
-import json
 import logging
 import asyncio
+import functools
+import gzip
+import hashlib
+import os
+import re
+import secrets
+import struct
+import time
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import AsyncIterator, Deque, Dict, Any, Callable, FrozenSet, Iterator, NamedTuple, Optional, List, Tuple
 import webbrowser
+import zlib
 from datetime import datetime
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Request
+from fastapi import FastAPI, WebSocket, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, JSONResponse, Response
+import orjson
 import uvicorn
 
 from .personality import PersonalitySystem
@@ -19,40 +29,507 @@ from ..core.bedrock_client import BedrockClient
 from ..config.models import SageConfig
 
 
-class ConnectionManager:
-    """Manages WebSocket connections."""
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def _split_keywords(keywords: List[str]) -> Tuple[FrozenSet[str], Tuple[str, ...]]:
+    """Split keywords into single words (matched by token) and phrases (matched by substring)."""
+    words = frozenset(k for k in keywords if " " not in k)
+    phrases = tuple(k for k in keywords if " " in k)
+    return words, phrases
+
+
+def _mentions(text: str, tokens: List[str], keywords: Tuple[FrozenSet[str], Tuple[str, ...]]) -> bool:
+    """Check whether a message mentions any word or phrase from a keyword split."""
+    words, phrases = keywords
+    return not words.isdisjoint(tokens) or any(phrase in text for phrase in phrases)
+
+
+# Messages mentioning any of these are answered locally instead of by the LLM
+_SAGE_KEYWORDS = _split_keywords([
+    # Core functions
+    "status", "monitoring", "projects", "agents", "context", "memory bank",
+    "file changes", "crew", "bedrock", "aws", "configuration", "config",
+    
+    # Agent types
+    "context curator", "project monitor", "technology specialist", 
+    "decision logger", "conflict resolver", "performance monitor",
+    
+    # System operations
+    "analyze", "watch", "track", "update", "process", "crew ai",
+    
+    # Sage-specific
+    "sage", "what can you do", "help", "capabilities", "features",
+    "how are you", "what are you", "who are you"
+])
+
+# Core question topics, checked in order
+_CORE_TOPICS = [
+    ("greeting", _split_keywords(["hello", "hi", "hey"])),
+    ("status", _split_keywords(["status", "how are you"])),
+    ("help", _split_keywords(["help", "what can you do", "capabilities", "features"])),
+    ("projects", _split_keywords(["projects", "monitoring"])),
+    ("agents", _split_keywords(["agents", "crew"])),
+]
+
+
+def _write_asset(path: Path, content: str) -> bool:
+    """Write a generated UI file only if its content changed.
+    
+    Leaving unchanged files alone keeps their mtime, so StaticFiles keeps
+    answering browser revalidation with 304s across restarts.
+    """
+    data = content.encode("utf-8")
+    try:
+        if path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    path.write_bytes(data)
+    return True
+
+
+# Cookie a reverse proxy can use for sticky routing across Sage instances
+_SESSION_COOKIE = "sage_sid"
+
+# Display names for agent types in the UI
+_AGENT_DISPLAY_NAMES = {
+    "project_monitor": "Project Monitor",
+    "context_curator": "Context Curator",
+    "tech_specialist": "Technology Specialist",
+    "performance_monitor": "Performance Monitor",
+    "decision_logger": "Decision Logger",
+    "conflict_resolver": "Conflict Resolver"
+}
+
+# System prompt for general assistance
+_GENERAL_CHAT_SYSTEM_PROMPT = """Your name is Sage, a helpful digital assistant designed to provide clear, relevant responses to a wide variety of questions.
+
+## Response Style and Formatting
+- Use conversational, informal language appropriate for a developer
+- Format your responses with clear structure using headers, ordered lists, unordered lists, blockquotes, and tables when appropriate
+- Always use valid Markdown syntax for formatting
+- If the user asks for a "bulleted list", "dotted list" or similar, return a valid unordered list in Markdown (eg: "-" with new line at the end)
+- IMPORTANT: Only use code blocks (```) when sharing actual programming code or command-line instructions. Never use code block formatting for regular text, quotes, or non-code content
+- For regular text emphasis, use bold, italics, or Markdown list syntax instead of code blocks
+- Present list items on separate lines for clarity
+
+## Handling Technical Content
+- When presenting code examples, use markdown with language-specific prefixes (e.g., jsx for React, python for Python)
+- For technical instructions that aren't code, use numbered lists or bullet points
+- Explain technical concepts in accessible language for non-technical users
+
+## Information Handling
+- Provide accurate, helpful responses based on available information
+- When you don't have specific information, be clear about what you don't know
+- Suggest relevant resources or information sources when appropriate
+
+## Privacy and Data Protection
+- Always prioritize user privacy and data protection
+- Do not retain or reference personally identifiable information
+- Avoid making assumptions about users or their data
+
+Remember to maintain a helpful, informal tone that is appropriate for developers."""
+
+# Main UI page; style.css and app.js ship as static files
+_INDEX_HTML = '''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Sage - AI Project Context Assistant</title>
+    <link rel="stylesheet" href="/static/style.css">
+</head>
+<body>
+    <div id="app">
+        <header>
+            <h1>Sage - AI Project Context Assistant</h1>
+            <div id="status-indicator" class="status-online">Online</div>
+        </header>
+        
+        <main>
+            <div id="chat-container">
+                <div id="messages-container">
+                    <div id="messages"></div>
+                </div>
+                
+                <div id="input-container">
+                    <input type="text" id="message-input" placeholder="Type a message to Sage...">
+                    <button id="send-button">Send</button>
+                </div>
+            </div>
+            
+            <aside id="sidebar">
+                <div id="personality-display">
+                    <div id="sage-toggle-container">
+                        <label class="toggle-switch">
+                            <input type="checkbox" id="sage-toggle" checked>
+                            <span class="toggle-slider"></span>
+                        </label>
+                        <span id="toggle-label">Hide Sage</span>
+                    </div>
+                    <video id="sage-face" autoplay muted loop>
+                        <source src="/personality/video/sage-idle-blink-1.mp4" type="video/mp4">
+                        Your browser does not support the video tag.
+                    </video>
+                    <div id="offline-message" class="offline-message hidden">
+                        Sage server process is offline
+                    </div>
+                </div>
+                
+                <div id="project-status">
+                    <h3>Project Status</h3>
+                    
+                    <div id="monitored-projects-section">
+                        <h4>Monitored Projects</h4>
+                        <div id="monitored-projects-list"></div>
+                    </div>
+                    
+                    <div id="agents-section">
+                        <h4>Agents</h4>
+                        <div id="agents-list"></div>
+                    </div>
+                </div>
+                
+                <div id="system-stats">
+                    <h3>System Stats</h3>
+                    <div id="stats-content"></div>
+                </div>
+            </aside>
+        </main>
+        
+        <!-- Toast notification container -->
+        <div id="toast-container"></div>
+    </div>
+    
+    <!-- Prebuilt nodes cloned by app.js -->
+    <template id="tpl-toast">
+        <div class="toast">
+            <div class="toast-content">
+                <span class="toast-icon"></span>
+                <span class="toast-message"></span>
+            </div>
+            <div class="toast-progress"></div>
+        </div>
+    </template>
+    
+    <template id="tpl-project">
+        <div class="project-item">
+            <div class="project-info">
+                <div class="project-name"></div>
+                <div class="project-status"></div>
+            </div>
+            <div class="activity-indicator">
+                <div class="spinner hidden"></div>
+                <span class="status-badge status-idle"></span>
+            </div>
+        </div>
+    </template>
+    
+    <template id="tpl-agent">
+        <div class="agent-item">
+            <div class="agent-info">
+                <div class="agent-name"></div>
+                <div class="agent-status"></div>
+            </div>
+            <div class="activity-indicator">
+                <div class="spinner hidden"></div>
+                <span class="status-badge status-idle"></span>
+            </div>
+        </div>
+    </template>
+    
+    <template id="tpl-conflict">
+        <div class="message system conflict">
+            <div class="message-header">Sage - Conflict Resolution Needed</div>
+            <div class="message-content">
+                <div class="conflict-options"></div>
+            </div>
+            <div class="message-time"></div>
+        </div>
+    </template>
+    
+    <template id="tpl-thinking">
+        <div class="message sage thinking-indicator" id="thinking-indicator">
+            <div class="message-header">Sage</div>
+            <div class="message-content">
+                <div class="thinking-animation">
+                    <span class="thinking-dots">
+                        <span>.</span><span>.</span><span>.</span>
+                    </span>
+                    <span class="thinking-text">Thinking...</span>
+                </div>
+            </div>
+            <div class="message-time"></div>
+        </div>
+    </template>
+    
+    <script src="/static/app.js"></script>
+</body>
+</html>'''
+
+
+async def _iter_frames(websocket: WebSocket) -> AsyncIterator[Any]:
+    """Yield raw payloads from a client until it disconnects.
+    
+    Like ``WebSocket.iter_text``/``iter_bytes`` but accepts both frame types,
+    so either goes straight to orjson without a decode/encode round-trip.
+    """
+    while True:
+        frame = await websocket.receive()
+        if frame["type"] == "websocket.disconnect":
+            return
+        data = frame.get("bytes")
+        yield data if data is not None else frame["text"]
+
+
+_STREAM_END = object()
+
+# One-byte opcodes for control frames. JSON frames start with '{' and
+# compressed ones with 'Z', so the first byte identifies every frame kind.
+_OP_THINKING_START = 0x01
+_OP_THINKING_COMPLETE = 0x02  # followed by the response time as a little-endian float32
+_OP_THINKING_ERROR = 0x03
+
+
+async def _stream_in_thread(make_iterator: Callable[[], Iterator[Any]],
+                            executor: Optional[Executor] = None) -> AsyncIterator[Any]:
+    """Drive a blocking iterator on a worker thread and yield its items on the event loop."""
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    
+    def pump():
+        try:
+            for item in make_iterator():
+                loop.call_soon_threadsafe(queue.put_nowait, (item, None))
+        except Exception as e:
+            loop.call_soon_threadsafe(queue.put_nowait, (None, e))
+        else:
+            loop.call_soon_threadsafe(queue.put_nowait, (_STREAM_END, None))
+    
+    loop.run_in_executor(executor, pump)
+    while True:
+        item, error = await queue.get()
+        if error is not None:
+            raise error
+        if item is _STREAM_END:
+            return
+        yield item
+
+
+# Generated UI assets served from /static, with their media types
+_STATIC_ASSETS = {
+    "style.css": "text/css; charset=utf-8",
+    "app.js": "text/javascript; charset=utf-8",
+}
+_STATIC_DIR = Path(__file__).parent / "static"
+
+
+_CSS_COMMENT_RE = re.compile(r"/\*.*?\*/", re.S)
+_CSS_SPACE_RE = re.compile(r"\s+")
+_CSS_PUNCT_RE = re.compile(r"\s*([{};,>])\s*")
+_CSS_COLON_RE = re.compile(r":\s+")
+
+
+def _minify_css(css: str) -> str:
+    """Strip comments and redundant whitespace from the generated stylesheet.
     
-    def __init__(self):
+    Only safe for our own CSS: it does not protect string literals, and the
+    only string in style.css is an empty ``content: ""``.
+    """
+    css = _CSS_COMMENT_RE.sub("", css)
+    css = _CSS_SPACE_RE.sub(" ", css)
+    css = _CSS_PUNCT_RE.sub(r"\1", css)
+    css = _CSS_COLON_RE.sub(":", css)
+    return css.replace(";}", "}").strip()
+
+
+class _StaticAsset(NamedTuple):
+    """A UI asset with its precompressed variants."""
+    body: bytes
+    gzip: bytes
+    brotli: Optional[bytes]
+    version: str
+    media_type: str
+    
+    @classmethod
+    def load(cls, name: str) -> "_StaticAsset":
+        body = (_STATIC_DIR / name).read_bytes()
+        if name.endswith(".css"):
+            body = _minify_css(body.decode("utf-8")).encode("utf-8")
+        try:
+            import brotli
+        except ImportError:
+            brotli_body = None
+        else:
+            brotli_body = brotli.compress(body, quality=11)
+        return cls(
+            body=body,
+            gzip=gzip.compress(body, 9),
+            brotli=brotli_body,
+            version=hashlib.blake2b(body, digest_size=8).hexdigest(),
+            media_type=_STATIC_ASSETS[name]
+        )
+
+
+class _PersonalityStaticFiles(StaticFiles):
+    """StaticFiles that lets browsers keep personality videos for a year.
+    
+    Videos are only ever added under new names, so a cached copy never goes
+    stale. Other files (like the expressions map) keep the default headers.
+    """
+    
+    def file_response(self, full_path, stat_result, scope, status_code: int = 200) -> Response:
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        if str(full_path).endswith(".mp4"):
+            response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        return response
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson."""
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+class ConnectionManager:
+    """Manages WebSocket connections.
+    
+    Each connection gets a bounded outbound queue drained by its own sender
+    task, so a slow client never blocks senders or other clients; a client
+    that takes longer than ``send_timeout`` to accept a frame is dropped.
+    Large broadcasts are zlib-compressed once and sent to every client as a
+    binary frame prefixed with ``Z``. Messages queued within ``batch_window``
+    seconds of each other are coalesced into a single ``batch`` frame.
+    """
+    
+    def __init__(self, max_queue: int = 256, compress_min_bytes: int = 1024,
+                 max_batch: int = 140, batch_window: float = 0.05,
+                 send_timeout: float = 5.0):
         self.active_connections: List[WebSocket] = []
+        self.max_queue = max_queue
+        self.max_batch = max_batch
+        self.batch_window = batch_window
+        self.send_timeout = send_timeout
+        self.compress_min_bytes = compress_min_bytes
+        self._outboxes: Dict[WebSocket, asyncio.Queue] = {}
+        self._senders: Dict[WebSocket, asyncio.Task] = {}
     
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
         self.active_connections.append(websocket)
+        outbox = asyncio.Queue(maxsize=self.max_queue)
+        self._outboxes[websocket] = outbox
+        self._senders[websocket] = asyncio.create_task(self._drain(websocket, outbox))
         logging.info(f"WebSocket connection established. Total connections: {len(self.active_connections)}")
     
     def disconnect(self, websocket: WebSocket):
         if websocket in self.active_connections:
             self.active_connections.remove(websocket)
+        self._outboxes.pop(websocket, None)
+        sender = self._senders.pop(websocket, None)
+        if sender is not None and sender is not asyncio.current_task():
+            sender.cancel()
         logging.info(f"WebSocket connection closed. Total connections: {len(self.active_connections)}")
     
-    async def send_personal_message(self, message: dict, websocket: WebSocket):
+    async def _drain(self, websocket: WebSocket, outbox: asyncio.Queue):
+        """Send queued frames to one client until it goes away."""
         try:
-            await websocket.send_text(json.dumps(message))
+            while True:
+                batch = [await outbox.get()]
+                # Give bursts a moment to gather, unless a full batch is already waiting
+                if self.batch_window and outbox.qsize() < self.max_batch - 1:
+                    await asyncio.sleep(self.batch_window)
+                while len(batch) < self.max_batch and not outbox.empty():
+                    batch.append(outbox.get_nowait())
+                for frame in self._coalesce(batch):
+                    await asyncio.wait_for(websocket.send_bytes(frame), self.send_timeout)
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            logging.warning(f"Dropping WebSocket client that stalled for over {self.send_timeout}s")
+            await self._abort(websocket)
         except Exception as e:
             logging.error(f"Error sending message: {e}")
+            await self._abort(websocket)
+    
+    async def _abort(self, websocket: WebSocket):
+        """Deregister a client whose sends failed and close its socket.
+        
+        Closing ends the endpoint's receive loop and lets the browser see
+        onclose and reconnect; a frame cut off by the timeout leaves the
+        stream unusable anyway.
+        """
+        self.disconnect(websocket)
+        try:
+            await asyncio.wait_for(websocket.close(code=1011), self.send_timeout)
+        except Exception as e:
+            logging.debug(f"Error closing WebSocket: {e}")
+    
+    @staticmethod
+    def _coalesce(payloads: List[bytes]) -> List[bytes]:
+        """Join runs of plain JSON payloads into batch frames, keeping order.
+        
+        Payloads are already serialized, so batches are spliced as bytes.
+        Compressed and control payloads are sent on their own.
+        """
+        frames = []
+        run: List[bytes] = []
+        for payload in payloads:
+            if payload[:1] != b"{":
+                frames.extend(ConnectionManager._batch_frame(run))
+                run = []
+                frames.append(payload)
+            else:
+                run.append(payload)
+        frames.extend(ConnectionManager._batch_frame(run))
+        return frames
+    
+    @staticmethod
+    def _batch_frame(run: List[bytes]) -> List[bytes]:
+        if len(run) <= 1:
+            return run
+        return [b'{"type":"batch","items":[' + b",".join(run) + b"]}"]
+    
+    def _enqueue(self, websocket: WebSocket, payload: bytes):
+        outbox = self._outboxes.get(websocket)
+        if outbox is None:
+            return
+        if outbox.full():
+            # Slow client - drop its oldest frame rather than grow without bound
+            outbox.get_nowait()
+        outbox.put_nowait(payload)
+    
+    async def send_personal_message(self, message: dict, websocket: WebSocket):
+        self._enqueue(websocket, orjson.dumps(message))
     
     async def broadcast(self, message: dict):
-        disconnected = []
+        if not self.active_connections:
+            return
+        
+        # Serialize once for every connection
+        await self.broadcast_bytes(orjson.dumps(message))
+    
+    async def broadcast_bytes(self, payload: bytes):
+        """Broadcast a message the caller already serialized with orjson."""
+        if not self.active_connections:
+            return
+        
+        # Compress once for every connection
+        if len(payload) >= self.compress_min_bytes:
+            payload = b"Z" + zlib.compress(payload, 6)
         for connection in self.active_connections:
-            try:
-                await connection.send_text(json.dumps(message))
-            except Exception as e:
-                logging.error(f"Error broadcasting message: {e}")
-                disconnected.append(connection)
+            self._enqueue(connection, payload)
+    
+    async def broadcast_control(self, opcode: int, payload: bytes = b""):
+        """Broadcast a compact binary control frame (see the _OP_* opcodes)."""
+        if not self.active_connections:
+            return
         
-        # Remove disconnected clients
-        for conn in disconnected:
-            self.disconnect(conn)
+        frame = bytes((opcode,)) + payload
+        for connection in self.active_connections:
+            self._enqueue(connection, frame)
 
 
 class SageWebServer:
@@ -64,10 +541,39 @@ class SageWebServer:
         self.config = config
         self.personality = personality_system
         self.bedrock_client = bedrock_client
-        self.app = FastAPI(title="Sage - AI Project Context Assistant")
+        # Blocking LLM calls run here so they never stall the event loop
+        self._llm_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="sage-llm")
+        self.app = FastAPI(
+            title="Sage - AI Project Context Assistant",
+            default_response_class=ORJSONResponse
+        )
         self.manager = ConnectionManager()
-        self.message_history: List[Dict[str, Any]] = []
+        self._index: Optional[Tuple[bytes, str]] = None
+        self._assets: Dict[str, _StaticAsset] = {}
+        self._emotions_body: Optional[bytes] = None
+        self._project_entries, self._agent_entries = self._build_api_entries()
+        # Reply text built from static config
+        self._projects_text = ", ".join(entry["name"] for entry in self._project_entries)
+        self._agents_text = ", ".join(entry["type"] for entry in self._agent_entries)
+        # Core question topic -> reply builder
+        self._core_replies: Dict[str, Callable[[], str]] = {
+            "greeting": self._reply_greeting,
+            "status": self._reply_status,
+            "help": self._reply_help,
+            "projects": self._reply_projects,
+            "agents": self._reply_agents
+        }
+        self.message_history: Deque[Dict[str, Any]] = deque(maxlen=config.ui.message_history_limit)
+        # Serialized API bodies: name -> (expires_at, version, body)
+        self._response_cache: Dict[str, Tuple[float, Any, bytes]] = {}
         self.video_timer_task = None
+        # Set when the personality's video timing changes; created on startup
+        # so it belongs to the server's event loop
+        self._video_kick: Optional[asyncio.Event] = None
+        self.personality.on_video_schedule_change = self._kick_video_timer
+        # Pending debounced dashboard push and the last body pushed
+        self._dashboard_task: Optional[asyncio.Task] = None
+        self._dashboard_sent: Optional[bytes] = None
         
         # Setup static files and templates
         self.setup_static_files()
@@ -77,75 +583,102 @@ class SageWebServer:
         self.start_video_timer()
     
     def setup_static_files(self):
-        """Setup static file serving and templates."""
+        """Setup static file serving."""
         # Create templates directory if it doesn't exist
         templates_dir = Path(__file__).parent / "templates"
         templates_dir.mkdir(exist_ok=True)
         
-        static_dir = Path(__file__).parent / "static"
-        static_dir.mkdir(exist_ok=True)
-        
-        self.templates = Jinja2Templates(directory=str(templates_dir))
+        _STATIC_DIR.mkdir(exist_ok=True)
         
-        # Mount static files
-        self.app.mount("/static", StaticFiles(directory=str(static_dir)), name="static")
-        self.app.mount("/personality", StaticFiles(directory="personality"), name="personality")
+        # Mount static files (generated UI assets are served by static_asset)
+        self.app.mount("/personality", _PersonalityStaticFiles(directory="personality"), name="personality")
     
     def setup_routes(self):
         """Setup web server routes."""
         
         @self.app.get("/", response_class=HTMLResponse)
         async def home(request: Request):
-            return self.templates.TemplateResponse("index.html", {
-                "request": request,
-                "title": "Sage - AI Project Context Assistant"
-            })
+            body, etag = self._load_index()
+            if request.headers.get("if-none-match") == etag:
+                response = Response(status_code=304, headers={"ETag": etag})
+            else:
+                response = HTMLResponse(body, headers={"ETag": etag, "Cache-Control": "no-cache"})
+            
+            # Stable per-browser id a reverse proxy can hash on, so the page and
+            # its websocket land on the same Sage instance
+            if _SESSION_COOKIE not in request.cookies:
+                response.set_cookie(_SESSION_COOKIE, secrets.token_urlsafe(16),
+                                    httponly=True, samesite="lax")
+            return response
+        
+        @self.app.get("/static/{name}")
+        async def static_asset(name: str, request: Request):
+            if name not in _STATIC_ASSETS:
+                return Response(status_code=404)
+            asset = self._load_asset(name)
+            
+            # The index links assets by content hash, so they never change under a URL
+            headers = {
+                "ETag": f'"{asset.version}"',
+                "Cache-Control": "public, max-age=31536000, immutable",
+                "Vary": "Accept-Encoding"
+            }
+            if request.headers.get("if-none-match") == headers["ETag"]:
+                return Response(status_code=304, headers=headers)
+            
+            accept_encoding = request.headers.get("accept-encoding", "")
+            if asset.brotli is not None and "br" in accept_encoding:
+                body = asset.brotli
+                headers["Content-Encoding"] = "br"
+            elif "gzip" in accept_encoding:
+                body = asset.gzip
+                headers["Content-Encoding"] = "gzip"
+            else:
+                body = asset.body
+            return Response(content=body, media_type=asset.media_type, headers=headers)
         
         @self.app.websocket("/ws")
         async def websocket_endpoint(websocket: WebSocket):
             await self.manager.connect(websocket)
+            self.schedule_dashboard_update()
+            self._kick_video_timer()
             
-            # Send initial greeting
+            # Send initial greeting; if it carries no video of its own, bring
+            # the new client's face in line with everyone else's
             greeting = await self.create_greeting_message()
+            if "video" not in greeting["data"] and self.current_video_data:
+                await self.manager.send_personal_message({
+                    "type": "video_change",
+                    "data": self.current_video_data
+                }, websocket)
             await self.manager.send_personal_message(greeting, websocket)
             
             try:
-                while True:
-                    # Receive message from client
-                    data = await websocket.receive_text()
-                    message_data = json.loads(data)
+                async for data in _iter_frames(websocket):
+                    if websocket not in self.manager.active_connections:
+                        # Dropped by its sender; replies could not be delivered
+                        break
+                    message_data = orjson.loads(data)
                     
                     # Process message
-                    response = await self.process_user_message(message_data)
+                    response = await self.process_user_message(message_data, websocket)
                     await self.manager.send_personal_message(response, websocket)
-                    
-            except WebSocketDisconnect:
+            finally:
                 self.manager.disconnect(websocket)
+                self.schedule_dashboard_update()
         
         @self.app.get("/api/status")
         async def get_status():
-            return {
-                "status": "running",
-                "personality": {
-                    "available_emotions": self.personality.get_available_emotions(),
-                    "default_emotion": self.personality.default_emotion
-                },
-                "connections": len(self.manager.active_connections),
-                "message_history_count": len(self.message_history)
-            }
+            counts = self._status_counts()
+            # The counts are part of the cache version, so changes show up immediately
+            return self._cached_json("status", 60, lambda: self._build_status(*counts), counts)
         
         @self.app.get("/api/emotions")
         async def get_emotions():
-            emotions = {}
-            for emotion in self.personality.get_available_emotions():
-                expression = self.personality.get_expression_data(emotion)
-                if expression:
-                    emotions[emotion] = {
-                        "videos": expression.videos,
-                        "description": expression.description,
-                        "use_cases": expression.use_cases
-                    }
-            return emotions
+            # Expressions only change when the personality map is reloaded
+            if self._emotions_body is None:
+                self.rebuild_emotions_cache()
+            return Response(content=self._emotions_body, media_type="application/json")
         
         @self.app.post("/api/test-emotion")
         async def test_emotion(request: Request):
@@ -193,10 +726,7 @@ class SageWebServer:
             sleep_response = self.personality.go_to_sleep()
             if sleep_response:
                 # Broadcast sleep video to all connected clients
-                await self.manager.broadcast({
-                    "type": "video_change",
-                    "data": sleep_response
-                })
+                await self.broadcast_video(sleep_response)
                 return {"status": "sleeping", "response": sleep_response}
             return {"status": "sleep_pending_or_already_sleeping"}
         
@@ -205,10 +735,7 @@ class SageWebServer:
             wake_response = self.personality.wake_up()
             if wake_response:
                 # Broadcast wake video to all connected clients
-                await self.manager.broadcast({
-                    "type": "video_change", 
-                    "data": wake_response
-                })
+                await self.broadcast_video(wake_response)
                 return {"status": "awake", "response": wake_response}
             return {"status": "not_sleeping"}
         
@@ -219,59 +746,143 @@ class SageWebServer:
         @self.app.get("/api/projects")
         async def get_projects():
             """Get monitored projects with their current status."""
-            projects = []
-            for project in self.config.projects:
-                # Simulate activity status - in real implementation this would check actual agent activity
-                is_active = False  # This would be determined by checking if agents are processing files
-                projects.append({
-                    "name": project.path.name,
-                    "path": str(project.path),
-                    "crew_config": project.crew_config,
-                    "priority": project.priority,
-                    "is_active": is_active,
-                    "status": "monitoring"
-                })
-            return {"projects": projects}
+            return self._cached_json("projects", 5, self._build_projects)
         
         @self.app.get("/api/agents")
         async def get_agents():
             """Get active agents with their current status."""
-            # Get crew configuration for the first project (or could be aggregated)
-            if not self.config.projects:
-                return {"agents": []}
-            
-            # Get the crew config from the first project
-            first_project = self.config.projects[0]
-            crew_name = first_project.crew_config
-            crew_config = self.config.crews.get(crew_name)
-            if not crew_config:
-                return {"agents": []}
-            
-            agent_types = crew_config.agents
-            
-            agents = []
-            for agent_type in agent_types:
-                # Simulate processing status - in real implementation this would check actual agent activity
-                is_processing = False  # This would be determined by checking if agent has active tasks
-                
-                # Map agent types to display names
-                display_names = {
-                    "project_monitor": "Project Monitor",
-                    "context_curator": "Context Curator", 
-                    "tech_specialist": "Technology Specialist",
-                    "performance_monitor": "Performance Monitor",
-                    "decision_logger": "Decision Logger",
-                    "conflict_resolver": "Conflict Resolver"
+            return self._cached_json("agents", 5, self._build_agents)
+        
+        @self.app.get("/api/dashboard")
+        async def get_dashboard():
+            """Get status, projects and agents in one response for the UI's initial load."""
+            counts = self._status_counts()
+            return self._cached_json("dashboard", 5, lambda: self._build_dashboard(counts), counts)
+    
+    def _cached_json(self, name: str, ttl: float, builder: Callable[[], Any],
+                     version: Any = None) -> Response:
+        """Serve a JSON body that is rebuilt at most every ttl seconds or when version changes."""
+        now = time.monotonic()
+        entry = self._response_cache.get(name)
+        if entry is None or entry[0] <= now or entry[1] != version:
+            entry = (now + ttl, version, orjson.dumps(builder(), option=orjson.OPT_NON_STR_KEYS))
+            self._response_cache[name] = entry
+        return Response(content=entry[2], media_type="application/json")
+    
+    def rebuild_emotions_cache(self):
+        """Serialize the /api/emotions body; call again after reloading expressions."""
+        emotions = {}
+        for emotion in self.personality.get_available_emotions():
+            expression = self.personality.get_expression_data(emotion)
+            if expression:
+                emotions[emotion] = {
+                    "videos": [video._asdict() for video in expression.videos],
+                    "description": expression.description,
+                    "use_cases": expression.use_cases
                 }
-                
-                agents.append({
-                    "type": agent_type,
-                    "name": display_names.get(agent_type, agent_type.replace("_", " ").title()),
-                    "is_processing": is_processing,
-                    "status": "idle"
-                })
-            
-            return {"agents": agents}
+        self._emotions_body = orjson.dumps(emotions, option=orjson.OPT_NON_STR_KEYS)
+    
+    def _build_api_entries(self) -> Tuple[Tuple[Dict[str, Any], ...], Tuple[Dict[str, Any], ...]]:
+        """Precompute the static part of /api/projects and /api/agents entries."""
+        projects = tuple({
+            "name": project.path.name,
+            "path": project.path_str,
+            "crew_config": project.crew_config,
+            "priority": project.priority,
+            "is_active": False,
+            "status": "monitoring"
+        } for project in self.config.projects)
+        
+        # Agents come from the first project's crew (or could be aggregated)
+        crew_config = None
+        if self.config.projects:
+            crew_config = self.config.crews.get(self.config.projects[0].crew_config)
+        agents = tuple({
+            "type": agent_type,
+            "name": _AGENT_DISPLAY_NAMES.get(agent_type, agent_type.replace("_", " ").title()),
+            "is_processing": False,
+            "status": "idle"
+        } for agent_type in (crew_config.agents if crew_config else ()))
+        
+        return projects, agents
+    
+    def _load_asset(self, name: str) -> _StaticAsset:
+        """Return a generated UI asset, reading and compressing it only once."""
+        asset = self._assets.get(name)
+        if asset is None:
+            asset = self._assets[name] = _StaticAsset.load(name)
+        return asset
+    
+    def _load_index(self) -> Tuple[bytes, str]:
+        """Return the index page body and its ETag, built only once."""
+        if self._index is None:
+            body = _INDEX_HTML.encode("utf-8")
+            # Version asset URLs so browsers can cache them indefinitely
+            for name in _STATIC_ASSETS:
+                url = f"/static/{name}".encode()
+                body = body.replace(url, url + f"?v={self._load_asset(name).version}".encode())
+            etag = '"%s"' % hashlib.blake2b(body, digest_size=8).hexdigest()
+            self._index = (body, etag)
+        return self._index
+    
+    def _status_counts(self) -> Tuple[int, int]:
+        """Return the live (connections, message history) counts shown in status."""
+        return len(self.manager.active_connections), len(self.message_history)
+    
+    def _build_status(self, connections: int, history_count: int) -> Dict[str, Any]:
+        """Build the /api/status body."""
+        return {
+            "status": "running",
+            "personality": {
+                "available_emotions": self.personality.get_available_emotions(),
+                "default_emotion": self.personality.default_emotion
+            },
+            "connections": connections,
+            "message_history_count": history_count
+        }
+    
+    def _build_dashboard(self, counts: Tuple[int, int]) -> Dict[str, Any]:
+        """Build the /api/dashboard body (also pushed as dashboard_update frames)."""
+        return {
+            "status": self._build_status(*counts),
+            "projects": self._build_projects()["projects"],
+            "agents": self._build_agents()["agents"]
+        }
+    
+    def schedule_dashboard_update(self, delay: float = 0.25):
+        """Push the dashboard to clients shortly, coalescing changes made meanwhile."""
+        if self._dashboard_task is None or self._dashboard_task.done():
+            self._dashboard_task = asyncio.create_task(self._push_dashboard(delay))
+    
+    async def _push_dashboard(self, delay: float):
+        await asyncio.sleep(delay)
+        if not self.manager.active_connections:
+            return
+        
+        frame = orjson.dumps({
+            "type": "dashboard_update",
+            "data": self._build_dashboard(self._status_counts())
+        }, option=orjson.OPT_NON_STR_KEYS)
+        # Only send when something visible actually changed; the bytes used
+        # for the comparison are the ones sent
+        if frame != self._dashboard_sent:
+            self._dashboard_sent = frame
+            await self.manager.broadcast_bytes(frame)
+    
+    def record_message(self, entry: Dict[str, Any]):
+        """Add an entry to the message history and refresh the dashboard count."""
+        self.message_history.append(entry)
+        self.schedule_dashboard_update()
+    
+    def _build_projects(self) -> Dict[str, Any]:
+        """Build the /api/projects body."""
+        # Simulate activity status - in real implementation this would check actual agent activity
+        return {"projects": [{**entry, "is_active": False} for entry in self._project_entries]}
+    
+    def _build_agents(self) -> Dict[str, Any]:
+        """Build the /api/agents body."""
+        # Simulate processing status - in real implementation this would check actual agent activity
+        return {"agents": [{**entry, "is_processing": False} for entry in self._agent_entries]}
     
     async def create_greeting_message(self) -> Dict[str, Any]:
         """Create initial greeting message."""
@@ -287,11 +898,16 @@ class SageWebServer:
             "system_status": "ready"
         })
         
-        self.message_history.append(response)
+        self.record_message(response)
         return {"type": "message", "data": response}
     
-    async def process_user_message(self, message_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Process a message from the user."""
+    async def process_user_message(self, message_data: Dict[str, Any],
+                                   websocket: Optional[WebSocket] = None) -> Dict[str, Any]:
+        """Process a message from the user.
+        
+        When the sender's websocket is given, LLM answers are streamed to it
+        as token frames before the final message is returned.
+        """
         user_message = message_data.get("message", "")
         message_type = message_data.get("type", "general")
         
@@ -299,7 +915,7 @@ class SageWebServer:
         context = {"interaction_type": "question", "user_relationship": "regular_user"}
         
         # Simple keyword-based response logic (can be enhanced with AI)
-        response_message = await self.generate_response(user_message, message_type)
+        response_message = await self.generate_response(user_message, message_type, websocket)
         emotion = self.personality.get_emotion_for_context(response_message, context)
         
         response = self.personality.create_personality_response(
@@ -309,75 +925,62 @@ class SageWebServer:
             }
         )
         
-        self.message_history.append(response)
+        self.record_message(response)
         return {"type": "message", "data": response}
     
-    async def generate_response(self, user_message: str, message_type: str) -> str:
+    async def generate_response(self, user_message: str, message_type: str,
+                                websocket: Optional[WebSocket] = None) -> str:
         """Generate response to user message."""
         user_lower = user_message.lower()
+        tokens = _WORD_RE.findall(user_lower)
         
         # Check if this is about Sage's core functions/agents
-        if self._is_sage_core_question(user_lower):
-            return await self._handle_sage_core_question(user_lower)
+        if self._is_sage_core_question(user_lower, tokens):
+            return await self._handle_sage_core_question(user_lower, tokens)
         else:
             # This is a general question - use the backing LLM for general assistance
-            return await self._handle_general_chat(user_message)
+            return await self._handle_general_chat(user_message, websocket)
     
-    def _is_sage_core_question(self, user_message_lower: str) -> bool:
+    def _is_sage_core_question(self, user_message_lower: str, tokens: List[str]) -> bool:
         """Determine if the question is about Sage's core functions or agents."""
-        sage_keywords = [
-            # Core functions
-            "status", "monitoring", "projects", "agents", "context", "memory bank",
-            "file changes", "crew", "bedrock", "aws", "configuration", "config",
-            
-            # Agent types
-            "context curator", "project monitor", "technology specialist", 
-            "decision logger", "conflict resolver", "performance monitor",
-            
-            # System operations
-            "analyze", "watch", "track", "update", "process", "crew ai",
-            
-            # Sage-specific
-            "sage", "what can you do", "help", "capabilities", "features",
-            "how are you", "what are you", "who are you"
-        ]
-        
-        return any(keyword in user_message_lower for keyword in sage_keywords)
+        return _mentions(user_message_lower, tokens, _SAGE_KEYWORDS)
     
-    async def _handle_sage_core_question(self, user_lower: str) -> str:
+    async def _handle_sage_core_question(self, user_lower: str, tokens: List[str]) -> str:
         """Handle questions about Sage's core functions."""
-        if any(word in user_lower for word in ["hello", "hi", "hey"]):
-            return "Hello! Great to see you. What can I help you with today?"
-        
-        elif any(word in user_lower for word in ["status", "how are you"]):
-            active_projects = len(self.config.projects)
-            return f"I'm doing well! Currently monitoring {active_projects} projects and ready to help with context management."
-        
-        elif any(word in user_lower for word in ["help", "what can you do", "capabilities", "features"]):
-            return ("I can help you monitor project files, maintain context stores, "
-                   "and provide intelligent project assistance. I watch for file changes, "
-                   "analyze code patterns, and keep project memory banks updated! "
-                   "I can also answer general questions and provide assistance on a wide variety of topics.")
-        
-        elif any(word in user_lower for word in ["projects", "monitoring"]):
-            project_list = [str(p.path.name) for p in self.config.projects]
-            return f"I'm currently monitoring these projects: {', '.join(project_list)}"
-        
-        elif any(word in user_lower for word in ["agents", "crew"]):
-            if self.config.projects:
-                first_project = self.config.projects[0]
-                crew_name = first_project.crew_config
-                crew_config = self.config.crews.get(crew_name)
-                if crew_config:
-                    agent_types = crew_config.agents
-                    return f"I'm currently running these agents: {', '.join(agent_types)}"
-            return "I have various specialized agents for project monitoring and context management."
+        topic = next(
+            (topic for topic, keywords in _CORE_TOPICS if _mentions(user_lower, tokens, keywords)),
+            None
+        )
         
-        else:
-            return ("I can help with project monitoring, context management, and general questions. "
-                   "Ask me about project status, my capabilities, or anything else you'd like to know!")
+        return self._core_replies.get(topic, self._reply_default)()
+    
+    def _reply_greeting(self) -> str:
+        return "Hello! Great to see you. What can I help you with today?"
+    
+    def _reply_status(self) -> str:
+        active_projects = len(self.config.projects)
+        return f"I'm doing well! Currently monitoring {active_projects} projects and ready to help with context management."
+    
+    def _reply_help(self) -> str:
+        return ("I can help you monitor project files, maintain context stores, "
+               "and provide intelligent project assistance. I watch for file changes, "
+               "analyze code patterns, and keep project memory banks updated! "
+               "I can also answer general questions and provide assistance on a wide variety of topics.")
+    
+    def _reply_projects(self) -> str:
+        return f"I'm currently monitoring these projects: {self._projects_text}"
+    
+    def _reply_agents(self) -> str:
+        if self._agents_text:
+            return f"I'm currently running these agents: {self._agents_text}"
+        return "I have various specialized agents for project monitoring and context management."
     
-    async def _handle_general_chat(self, user_message: str) -> str:
+    def _reply_default(self) -> str:
+        return ("I can help with project monitoring, context management, and general questions. "
+               "Ask me about project status, my capabilities, or anything else you'd like to know!")
+    
+    async def _handle_general_chat(self, user_message: str,
+                                   websocket: Optional[WebSocket] = None) -> str:
         """Handle general chat questions using the backing LLM."""
         if not self.bedrock_client:
             return ("I'd love to help with that, but I don't have access to my general knowledge system right now. "
@@ -387,53 +990,40 @@ class SageWebServer:
         self.personality.start_task("serious")
         
         # Broadcast thinking indicator to show progress
-        await self.manager.broadcast({
-            "type": "thinking_start",
-            "data": {"message": "Let me think about that..."}
-        })
-        
-        # System prompt for general assistance
-        system_prompt = """Your name is Sage, a helpful digital assistant designed to provide clear, relevant responses to a wide variety of questions.
-
-## Response Style and Formatting
-- Use conversational, informal language appropriate for a developer
-- Format your responses with clear structure using headers, ordered lists, unordered lists, blockquotes, and tables when appropriate
-- Always use valid Markdown syntax for formatting
-- If the user asks for a "bulleted list", "dotted list" or similar, return a valid unordered list in Markdown (eg: "-" with new line at the end)
-- IMPORTANT: Only use code blocks (```) when sharing actual programming code or command-line instructions. Never use code block formatting for regular text, quotes, or non-code content
-- For regular text emphasis, use bold, italics, or Markdown list syntax instead of code blocks
-- Present list items on separate lines for clarity
-
-## Handling Technical Content
-- When presenting code examples, use markdown with language-specific prefixes (e.g., jsx for React, python for Python)
-- For technical instructions that aren't code, use numbered lists or bullet points
-- Explain technical concepts in accessible language for non-technical users
-
-## Information Handling
-- Provide accurate, helpful responses based on available information
-- When you don't have specific information, be clear about what you don't know
-- Suggest relevant resources or information sources when appropriate
-
-## Privacy and Data Protection
-- Always prioritize user privacy and data protection
-- Do not retain or reference personally identifiable information
-- Avoid making assumptions about users or their data
-
-Remember to maintain a helpful, informal tone that is appropriate for developers."""
+        await self.manager.broadcast_control(_OP_THINKING_START)
         
         try:
             # Set up a timeout for long-running requests
-            start_time = asyncio.get_event_loop().time()
+            start_time = asyncio.get_running_loop().time()
             
-            # Call the backing LLM with the system prompt
-            response = self.bedrock_client.invoke_model(
-                prompt=user_message,
-                system_prompt=system_prompt,
-                max_tokens=2048
-            )
+            if websocket is not None:
+                # Stream tokens to the asking client as they arrive
+                parts = []
+                async for text in _stream_in_thread(lambda: self.bedrock_client.stream_model(
+                    prompt=user_message,
+                    system_prompt=_GENERAL_CHAT_SYSTEM_PROMPT,
+                    max_tokens=2048
+                ), self._llm_executor):
+                    parts.append(text)
+                    await self.manager.send_personal_message(
+                        {"type": "token", "data": {"text": text}}, websocket
+                    )
+                content = "".join(parts)
+            else:
+                # Call the backing LLM with the system prompt
+                response = await asyncio.get_running_loop().run_in_executor(
+                    self._llm_executor,
+                    functools.partial(
+                        self.bedrock_client.invoke_model,
+                        prompt=user_message,
+                        system_prompt=_GENERAL_CHAT_SYSTEM_PROMPT,
+                        max_tokens=2048
+                    )
+                )
+                content = response.content
             
             # Calculate response time
-            response_time = asyncio.get_event_loop().time() - start_time
+            response_time = asyncio.get_running_loop().time() - start_time
             
             # Complete the thinking task with success emotion
             self.personality.add_task_emotion("hopeful")
@@ -441,12 +1031,9 @@ Remember to maintain a helpful, informal tone that is appropriate for developers
             self.personality.complete_task()
             
             # Broadcast thinking completion
-            await self.manager.broadcast({
-                "type": "thinking_complete",
-                "data": {"message": "Got it!", "response_time": f"{response_time:.1f}s"}
-            })
+            await self.manager.broadcast_control(_OP_THINKING_COMPLETE, struct.pack("<f", response_time))
             
-            return response.content
+            return content
             
         except Exception as e:
             logging.error(f"Error calling backing LLM for general chat: {e}")
@@ -457,10 +1044,7 @@ Remember to maintain a helpful, informal tone that is appropriate for developers
             self.personality.complete_task()
             
             # Broadcast thinking error
-            await self.manager.broadcast({
-                "type": "thinking_error",
-                "data": {"message": "Hmm, having trouble with that..."}
-            })
+            await self.manager.broadcast_control(_OP_THINKING_ERROR)
             
             return ("I'm having trouble accessing my general knowledge system right now. "
                    "You can ask me about my project monitoring capabilities, or try your question again in a moment.")
@@ -468,6 +1052,18 @@ Remember to maintain a helpful, informal tone that is appropriate for developers
     async def send_system_notification(self, message: str, notification_type: str = "info",
                                      additional_data: Optional[Dict[str, Any]] = None):
         """Send system notification to all connected clients."""
+        if not self.manager.active_connections:
+            # Nobody to show it to - keep a plain history record and skip
+            # emotion and video selection
+            self.record_message({
+                "message": message,
+                "timestamp": str(time.time_ns() // 1_000_000),
+                "type": "system_notification",
+                "notification_type": notification_type,
+                **(additional_data or {})
+            })
+            return
+        
         context = self.personality.get_context_for_system_event(notification_type)
         emotion = self.personality.get_emotion_for_context(message, context)
         
@@ -484,10 +1080,13 @@ Remember to maintain a helpful, informal tone that is appropriate for developers
             "data": response
         })
         
-        self.message_history.append(response)
+        self.record_message(response)
     
     async def send_file_change_notification(self, file_path: str, change_type: str):
         """Send notification about file changes."""
+        if not self.manager.active_connections:
+            return
+        
         context = self.personality.get_context_for_file_change(change_type, file_path)
         
         message = f"Detected {change_type} in {Path(file_path).name}. Analyzing for context updates..."
@@ -530,1616 +1129,82 @@ Remember to maintain a helpful, informal tone that is appropriate for developers
         return response
     
     def create_html_template(self):
-        """Create the main HTML template."""
+        """Write the main HTML template to templates/index.html.
+        
+        The page itself is served from _INDEX_HTML in memory; the file is
+        kept in sync for reference and only rewritten when it changed.
+        """
         template_path = Path(__file__).parent / "templates" / "index.html"
         template_path.parent.mkdir(exist_ok=True)
         
-        html_content = '''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{{title}}</title>
-    <link rel="stylesheet" href="/static/style.css">
-</head>
-<body>
-    <div id="app">
-        <header>
-            <h1>Sage - AI Project Context Assistant</h1>
-            <div id="status-indicator" class="status-online">Online</div>
-        </header>
-        
-        <main>
-            <div id="chat-container">
-                <div id="messages-container">
-                    <div id="messages"></div>
-                </div>
-                
-                <div id="input-container">
-                    <input type="text" id="message-input" placeholder="Type a message to Sage...">
-                    <button id="send-button">Send</button>
-                </div>
-            </div>
-            
-            <aside id="sidebar">
-                <div id="personality-display">
-                    <div id="sage-toggle-container">
-                        <label class="toggle-switch">
-                            <input type="checkbox" id="sage-toggle" checked>
-                            <span class="toggle-slider"></span>
-                        </label>
-                        <span id="toggle-label">Hide Sage</span>
-                    </div>
-                    <video id="sage-face" autoplay muted loop>
-                        <source src="/personality/video/sage-idle-blink-1.mp4" type="video/mp4">
-                        Your browser does not support the video tag.
-                    </video>
-                    <div id="offline-message" class="offline-message hidden">
-                        Sage server process is offline
-                    </div>
-                </div>
-                
-                <div id="project-status">
-                    <h3>Project Status</h3>
-                    
-                    <div id="monitored-projects-section">
-                        <h4>Monitored Projects</h4>
-                        <div id="monitored-projects-list"></div>
-                    </div>
-                    
-                    <div id="agents-section">
-                        <h4>Agents</h4>
-                        <div id="agents-list"></div>
-                    </div>
-                </div>
-                
-                <div id="system-stats">
-                    <h3>System Stats</h3>
-                    <div id="stats-content"></div>
-                </div>
-            </aside>
-        </main>
-        
-        <!-- Toast notification container -->
-        <div id="toast-container"></div>
-    </div>
-    
-    <script src="/static/app.js"></script>
-</body>
-</html>'''
-        
-        with open(template_path, 'w') as f:
-            f.write(html_content)
-    
-    def create_css_styles(self):
-        """Create CSS styles for the UI."""
-        css_path = Path(__file__).parent / "static" / "style.css"
-        css_path.parent.mkdir(exist_ok=True)
-        
-        css_content = '''/* Sage UI Styles - Serene Coastline Theme */
-* {
-    margin: 0;
-    padding: 0;
-    box-sizing: border-box;
-}
-
-body {
-    font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-    background: #D1E8E2;
-    color: #19747E;
-    height: 100vh;
-}
-
-header {
-    background: white;
-    padding: 1rem 2rem;
-    display: flex;
-    justify-content: space-between;
-    align-items: center;
-    border-bottom: 1px solid #A9D6E5;
-    box-shadow: 0 2px 4px rgba(25, 116, 126, 0.1);
-}
-
-header h1 {
-    color: #19747E;
-    font-size: 1.5rem;
-    font-weight: 300;
-}
-
-#status-indicator {
-    padding: 0.5rem 1rem;
-    border-radius: 20px;
-    font-size: 0.9rem;
-    font-weight: 500;
-}
-
-.status-online {
-    background: #19747E;
-    color: white;
-}
-
-.status-offline {
-    background: #A9D6E5;
-    color: #19747E;
-}
-
-main {
-    display: flex;
-    height: calc(100vh - 80px);
-    gap: 1rem;
-    padding: 1rem;
-}
-
-#chat-container {
-    flex: 1;
-    background: white;
-    border-radius: 15px;
-    overflow: hidden;
-    display: flex;
-    flex-direction: column;
-    box-shadow: 0 4px 12px rgba(25, 116, 126, 0.1);
-}
-
-#personality-display {
-    background: linear-gradient(135deg, #19747E 0%, #A9D6E5 100%);
-    padding: 1.5rem;
-    display: flex;
-    flex-direction: column;
-    align-items: center;
-    color: white;
-    border-radius: 15px;
-    box-shadow: 0 4px 12px rgba(25, 116, 126, 0.1);
-    margin-bottom: 1rem;
-}
-
-#sage-toggle-container {
-    display: flex;
-    align-items: center;
-    gap: 0.75rem;
-    margin-bottom: 1rem;
-    width: 100%;
-    justify-content: center;
-}
-
-#toggle-label {
-    font-size: 0.9rem;
-    font-weight: 500;
-    color: white;
-}
-
-.toggle-switch {
-    position: relative;
-    display: inline-block;
-    width: 50px;
-    height: 24px;
-}
-
-.toggle-switch input {
-    opacity: 0;
-    width: 0;
-    height: 0;
-}
-
-.toggle-slider {
-    position: absolute;
-    cursor: pointer;
-    top: 0;
-    left: 0;
-    right: 0;
-    bottom: 0;
-    background-color: rgba(255, 255, 255, 0.3);
-    transition: 0.3s;
-    border-radius: 24px;
-}
-
-.toggle-slider:before {
-    position: absolute;
-    content: "";
-    height: 18px;
-    width: 18px;
-    left: 3px;
-    bottom: 3px;
-    background-color: white;
-    transition: 0.3s;
-    border-radius: 50%;
-}
-
-input:checked + .toggle-slider {
-    background-color: rgba(255, 255, 255, 0.6);
-}
-
-input:checked + .toggle-slider:before {
-    transform: translateX(26px);
-}
-
-#sage-face {
-    width: 160px;
-    height: 240px;
-    border-radius: 15px;
-    border: 3px solid white;
-    transition: all 0.3s ease;
-    object-fit: cover;
-}
-
-#sage-face.hidden {
-    display: none;
-}
-
-#messages-container {
-    flex: 1;
-    overflow-y: auto;
-    padding: 1rem;
-}
-
-.message {
-    margin-bottom: 1rem;
-    padding: 1rem;
-    border-radius: 10px;
-    animation: fadeIn 0.3s ease;
-}
-
-.message.system {
-    background: #E2E2E2;
-    border-left: 4px solid #A9D6E5;
-}
-
-.message.user {
-    background: #D1E8E2;
-    border-left: 4px solid #19747E;
-    margin-left: 2rem;
-}
-
-.message.sage {
-    background: #A9D6E5;
-    border-left: 4px solid #19747E;
-    color: #19747E;
-}
-
-.message-header {
-    font-weight: 600;
-    margin-bottom: 0.5rem;
-    font-size: 0.9rem;
-    color: #19747E;
-}
-
-.message-content {
-    line-height: 1.5;
-}
-
-.message-time {
-    font-size: 0.8rem;
-    color: #19747E;
-    opacity: 0.7;
-    margin-top: 0.5rem;
-}
-
-/* Thinking indicator styles */
-.thinking-indicator {
-    opacity: 0.8;
-}
-
-.thinking-animation {
-    display: flex;
-    align-items: center;
-    gap: 0.5rem;
-}
-
-.thinking-dots {
-    display: inline-flex;
-    gap: 0.1rem;
-}
-
-.thinking-dots span {
-    animation: thinkingDot 1.4s infinite ease-in-out;
-    font-size: 1.2rem;
-    font-weight: bold;
-}
-
-.thinking-dots span:nth-child(1) {
-    animation-delay: -0.32s;
-}
-
-.thinking-dots span:nth-child(2) {
-    animation-delay: -0.16s;
-}
-
-.thinking-dots span:nth-child(3) {
-    animation-delay: 0s;
-}
-
-.thinking-text {
-    font-style: italic;
-    color: #19747E;
-    opacity: 0.8;
-}
-
-@keyframes thinkingDot {
-    0%, 80%, 100% {
-        transform: scale(0.8);
-        opacity: 0.5;
-    }
-    40% {
-        transform: scale(1);
-        opacity: 1;
-    }
-}
-
-/* Markdown content styling */
-.message-content h1,
-.message-content h2,
-.message-content h3,
-.message-content h4,
-.message-content h5,
-.message-content h6 {
-    margin: 0.5rem 0;
-    color: #19747E;
-}
-
-.message-content h1 {
-    font-size: 1.5rem;
-    border-bottom: 2px solid #A9D6E5;
-    padding-bottom: 0.25rem;
-}
-
-.message-content h2 {
-    font-size: 1.3rem;
-    border-bottom: 1px solid #A9D6E5;
-    padding-bottom: 0.25rem;
-}
-
-.message-content h3 {
-    font-size: 1.1rem;
-}
-
-.message-content ul,
-.message-content ol {
-    margin: 0.5rem 0;
-    padding-left: 1.5rem;
-}
-
-.message-content li {
-    margin: 0.25rem 0;
-}
-
-.message-content blockquote {
-    border-left: 4px solid #A9D6E5;
-    margin: 0.5rem 0;
-    padding: 0.5rem 1rem;
-    background: rgba(169, 214, 229, 0.1);
-    font-style: italic;
-}
-
-.message-content code {
-    background: rgba(169, 214, 229, 0.2);
-    padding: 0.2rem 0.4rem;
-    border-radius: 4px;
-    font-family: 'Courier New', monospace;
-    font-size: 0.9rem;
-}
-
-.message-content pre {
-    background: rgba(169, 214, 229, 0.1);
-    padding: 1rem;
-    border-radius: 8px;
-    overflow-x: auto;
-    margin: 0.5rem 0;
-}
-
-.message-content pre code {
-    background: none;
-    padding: 0;
-}
-
-.message-content table {
-    border-collapse: collapse;
-    width: 100%;
-    margin: 0.5rem 0;
-}
-
-.message-content th,
-.message-content td {
-    border: 1px solid #A9D6E5;
-    padding: 0.5rem;
-    text-align: left;
-}
-
-.message-content th {
-    background: rgba(169, 214, 229, 0.2);
-    font-weight: 600;
-}
-
-.message-content a {
-    color: #19747E;
-    text-decoration: underline;
-}
-
-.message-content a:hover {
-    color: #145a66;
-}
-
-.message-content strong {
-    font-weight: 600;
-    color: #19747E;
-}
-
-.message-content em {
-    font-style: italic;
-    color: #19747E;
-}
-
-#input-container {
-    padding: 1rem;
-    border-top: 1px solid #A9D6E5;
-    display: flex;
-    gap: 0.5rem;
-}
-
-#message-input {
-    flex: 1;
-    padding: 0.75rem;
-    border: 1px solid #A9D6E5;
-    border-radius: 8px;
-    font-size: 1rem;
-    background: #D1E8E2;
-    color: #19747E;
-}
-
-#message-input:focus {
-    outline: none;
-    border-color: #19747E;
-    background: white;
-}
-
-#send-button {
-    padding: 0.75rem 1.5rem;
-    background: #19747E;
-    color: white;
-    border: none;
-    border-radius: 8px;
-    cursor: pointer;
-    font-size: 1rem;
-    transition: background 0.3s ease;
-}
-
-#send-button:hover {
-    background: #145a66;
-}
-
-#sidebar {
-    width: 300px;
-    display: flex;
-    flex-direction: column;
-    gap: 1rem;
-}
-
-#project-status, #system-stats {
-    background: white;
-    border-radius: 15px;
-    padding: 1.5rem;
-    box-shadow: 0 4px 12px rgba(25, 116, 126, 0.1);
-}
-
-#project-status h3, #system-stats h3 {
-    margin-bottom: 1rem;
-    color: #19747E;
-    font-size: 1.1rem;
-}
-
-#project-status h4 {
-    margin-bottom: 0.75rem;
-    margin-top: 1rem;
-    color: #19747E;
-    font-size: 1rem;
-    font-weight: 500;
-}
-
-#project-status h4:first-of-type {
-    margin-top: 0;
-}
-
-#monitored-projects-section, #agents-section {
-    margin-bottom: 1.5rem;
-}
-
-#monitored-projects-section:last-child, #agents-section:last-child {
-    margin-bottom: 0;
-}
-
-.project-item, .agent-item {
-    padding: 0.75rem;
-    background: #D1E8E2;
-    border-radius: 8px;
-    margin-bottom: 0.5rem;
-    border-left: 4px solid #19747E;
-    display: flex;
-    justify-content: space-between;
-    align-items: center;
-}
-
-.project-info, .agent-info {
-    flex: 1;
-}
-
-.project-name, .agent-name {
-    font-weight: 600;
-    margin-bottom: 0.25rem;
-    color: #19747E;
-}
-
-.project-status, .agent-status {
-    font-size: 0.9rem;
-    color: #19747E;
-    opacity: 0.8;
-}
-
-.activity-indicator {
-    display: flex;
-    align-items: center;
-    gap: 0.5rem;
-}
-
-.spinner {
-    width: 16px;
-    height: 16px;
-    border: 2px solid #A9D6E5;
-    border-top: 2px solid #19747E;
-    border-radius: 50%;
-    animation: spin 1s linear infinite;
-}
-
-.spinner.hidden {
-    display: none;
-}
-
-@keyframes spin {
-    0% { transform: rotate(0deg); }
-    100% { transform: rotate(360deg); }
-}
-
-.status-badge {
-    padding: 0.25rem 0.5rem;
-    border-radius: 12px;
-    font-size: 0.8rem;
-    font-weight: 500;
-}
-
-.status-active {
-    background: #19747E;
-    color: white;
-}
-
-.status-idle {
-    background: #A9D6E5;
-    color: #19747E;
-}
-
-.status-processing {
-    background: #FFA500;
-    color: white;
-}
-
-.stat-item {
-    display: flex;
-    justify-content: space-between;
-    padding: 0.5rem 0;
-    border-bottom: 1px solid #A9D6E5;
-}
-
-.stat-item:last-child {
-    border-bottom: none;
-}
-
-.stat-label {
-    color: #19747E;
-    opacity: 0.8;
-}
-
-.stat-value {
-    font-weight: 600;
-    color: #19747E;
-}
-
-/* Offline message styles */
-.offline-message {
-    font-size: 8pt;
-    color: rgba(255, 255, 255, 0.8);
-    text-align: center;
-    margin-top: 0.5rem;
-    font-weight: 500;
-    transition: opacity 0.3s ease;
-}
-
-.offline-message.hidden {
-    display: none;
-}
-
-/* Toast notification styles */
-#toast-container {
-    position: fixed;
-    top: 20px;
-    right: 20px;
-    z-index: 1000;
-    display: flex;
-    flex-direction: column;
-    gap: 10px;
-}
-
-.toast {
-    background: #19747E;
-    color: white;
-    padding: 1rem 1.5rem;
-    border-radius: 8px;
-    box-shadow: 0 4px 12px rgba(25, 116, 126, 0.3);
-    min-width: 300px;
-    max-width: 400px;
-    animation: slideInRight 0.3s ease, fadeOut 0.3s ease 2.7s;
-    position: relative;
-    overflow: hidden;
-}
-
-.toast.success {
-    background: #28a745;
-}
-
-.toast.error {
-    background: #dc3545;
-}
-
-.toast.warning {
-    background: #ffc107;
-    color: #212529;
-}
-
-.toast-content {
-    display: flex;
-    align-items: center;
-    gap: 0.75rem;
-}
-
-.toast-icon {
-    font-size: 1.2rem;
-    flex-shrink: 0;
-}
-
-.toast-message {
-    flex: 1;
-    font-weight: 500;
-}
-
-.toast-progress {
-    position: absolute;
-    bottom: 0;
-    left: 0;
-    height: 3px;
-    background: rgba(255, 255, 255, 0.3);
-    animation: progressBar 3s linear;
-}
-
-@keyframes slideInRight {
-    from {
-        transform: translateX(100%);
-        opacity: 0;
-    }
-    to {
-        transform: translateX(0);
-        opacity: 1;
-    }
-}
-
-@keyframes fadeOut {
-    from {
-        opacity: 1;
-        transform: translateX(0);
-    }
-    to {
-        opacity: 0;
-        transform: translateX(100%);
-    }
-}
-
-@keyframes progressBar {
-    from {
-        width: 100%;
-    }
-    to {
-        width: 0%;
-    }
-}
-
-@keyframes fadeIn {
-    from { opacity: 0; transform: translateY(10px); }
-    to { opacity: 1; transform: translateY(0); }
-}
-
-/* Responsive design */
-@media (max-width: 768px) {
-    main {
-        flex-direction: column;
-    }
-    
-    #sidebar {
-        width: 100%;
-        flex-direction: column;
-    }
-    
-    #personality-display {
-        flex-direction: row;
-        align-items: center;
-        justify-content: center;
-    }
-    
-    #sage-face {
-        width: 80px;
-        height: 120px;
-    }
-    
-    #project-status, #system-stats {
-        flex: 1;
-    }
-    
-    #toast-container {
-        top: 10px;
-        right: 10px;
-        left: 10px;
-    }
-    
-    .toast {
-        min-width: auto;
-        max-width: none;
-    }
-}'''
-        
-        with open(css_path, 'w') as f:
-            f.write(css_content)
-    
-    def create_javascript(self):
-        """Create JavaScript for the UI."""
-        js_path = Path(__file__).parent / "static" / "app.js"
-        
-        js_content = '''// Sage UI JavaScript
-class SageUI {
-    constructor() {
-        this.ws = null;
-        this.reconnectInterval = 5000;
-        this.isOffline = false;
-        this.wasOffline = false;
-        this.sleepVideoPreloaded = false;
-        this.preloadSleepVideo();
-        this.connect();
-        this.bindEvents();
-        this.loadMarkdownLibrary();
-    }
-    
-    loadMarkdownLibrary() {
-        // Load marked.js for markdown rendering
-        if (!window.marked) {
-            const script = document.createElement('script');
-            script.src = 'https://cdn.jsdelivr.net/npm/marked/marked.min.js';
-            script.onload = () => {
-                console.log('Markdown library loaded');
-                // Configure marked for safe rendering
-                if (window.marked) {
-                    marked.setOptions({
-                        breaks: true,
-                        gfm: true,
-                        sanitize: false, // We trust Sage's responses
-                        smartLists: true,
-                        smartypants: true
-                    });
-                }
-            };
-            document.head.appendChild(script);
-        }
-    }
-    
-    renderMarkdown(text) {
-        if (window.marked) {
-            return marked.parse(text);
-        } else {
-            // Fallback: basic markdown-like formatting
-            return text
-                .replace(/\\*\\*(.*?)\\*\\*/g, '<strong>$1</strong>')
-                .replace(/\\*(.*?)\\*/g, '<em>$1</em>')
-                .replace(/`(.*?)`/g, '<code>$1</code>')
-                .replace(/^# (.*$)/gim, '<h1>$1</h1>')
-                .replace(/^## (.*$)/gim, '<h2>$1</h2>')
-                .replace(/^### (.*$)/gim, '<h3>$1</h3>')
-                .replace(/^- (.*$)/gim, '<li>$1</li>')
-                .replace(/\\n/g, '<br>');
-        }
-    }
-    
-    preloadSleepVideo() {
-        // Preload both sleep videos so they're cached and available even when offline
-        this.sleepVideosPreloaded = { transition: false, state: false };
-        
-        // Preload transition video (sage-sleeps.mp4)
-        const sleepTransitionVideo = document.createElement('video');
-        sleepTransitionVideo.preload = 'auto';
-        sleepTransitionVideo.muted = true;
-        sleepTransitionVideo.style.display = 'none';
-        
-        const transitionSource = document.createElement('source');
-        transitionSource.src = '/personality/video/sage-sleeps.mp4';
-        transitionSource.type = 'video/mp4';
-        
-        sleepTransitionVideo.appendChild(transitionSource);
-        document.body.appendChild(sleepTransitionVideo);
-        
-        sleepTransitionVideo.addEventListener('canplaythrough', () => {
-            this.sleepVideosPreloaded.transition = true;
-            console.log('Sleep transition video (sage-sleeps.mp4) preloaded and cached');
-        });
-        
-        sleepTransitionVideo.addEventListener('error', (e) => {
-            console.warn('Failed to preload sleep transition video:', e);
-        });
-        
-        sleepTransitionVideo.load();
-        
-        // Preload sleep state video (sage-asleep.mp4)
-        const sleepStateVideo = document.createElement('video');
-        sleepStateVideo.preload = 'auto';
-        sleepStateVideo.muted = true;
-        sleepStateVideo.style.display = 'none';
-        
-        const stateSource = document.createElement('source');
-        stateSource.src = '/personality/video/sage-asleep.mp4';
-        stateSource.type = 'video/mp4';
-        
-        sleepStateVideo.appendChild(stateSource);
-        document.body.appendChild(sleepStateVideo);
-        
-        sleepStateVideo.addEventListener('canplaythrough', () => {
-            this.sleepVideosPreloaded.state = true;
-            console.log('Sleep state video (sage-asleep.mp4) preloaded and cached');
-        });
-        
-        sleepStateVideo.addEventListener('error', (e) => {
-            console.warn('Failed to preload sleep state video:', e);
-        });
-        
-        sleepStateVideo.load();
-    }
-    
-    connect() {
-        const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
-        const wsUrl = `${protocol}//${window.location.host}/ws`;
-        
-        this.ws = new WebSocket(wsUrl);
-        
-        this.ws.onopen = () => {
-            console.log('Connected to Sage');
-            this.handleReconnection();
-            this.updateStatus('online');
-        };
-        
-        this.ws.onmessage = (event) => {
-            const data = JSON.parse(event.data);
-            this.handleMessage(data);
-        };
-        
-        this.ws.onclose = () => {
-            console.log('Disconnected from Sage');
-            this.handleDisconnection();
-            this.updateStatus('offline');
-            setTimeout(() => this.connect(), this.reconnectInterval);
-        };
-        
-        this.ws.onerror = (error) => {
-            console.error('WebSocket error:', error);
-        };
-    }
-    
-    handleDisconnection() {
-        this.wasOffline = this.isOffline;
-        
-        // Only trigger offline sleep sequence if we weren't already offline
-        if (!this.isOffline) {
-            this.isOffline = true;
-            
-            // Show offline message
-            this.showOfflineMessage();
-            
-            // Put Sage to sleep when going offline (only once)
-            this.putSageToSleepOffline();
-        }
-    }
-    
-    handleReconnection() {
-        if (this.isOffline) {
-            this.isOffline = false;
-            
-            // Hide offline message
-            this.hideOfflineMessage();
-            
-            // Show reconnection toast
-            this.showReconnectionToast();
-            
-            // Wake Sage up when reconnecting
-            this.wakeSageUpOnline();
-        }
-    }
-    
-    showOfflineMessage() {
-        const offlineMessage = document.getElementById('offline-message');
-        if (offlineMessage) {
-            offlineMessage.classList.remove('hidden');
-        }
-    }
-    
-    hideOfflineMessage() {
-        const offlineMessage = document.getElementById('offline-message');
-        if (offlineMessage) {
-            offlineMessage.classList.add('hidden');
-        }
-    }
-    
-    showReconnectionToast() {
-        this.showToast('Sage is reconnected and ready to help!', 'success', '✅');
-    }
-    
-    showToast(message, type = 'info', icon = 'ℹ️') {
-        const toastContainer = document.getElementById('toast-container');
-        if (!toastContainer) return;
-        
-        const toast = document.createElement('div');
-        toast.className = `toast ${type}`;
-        
-        toast.innerHTML = `
-            <div class="toast-content">
-                <span class="toast-icon">${icon}</span>
-                <span class="toast-message">${message}</span>
-            </div>
-            <div class="toast-progress"></div>
-        `;
-        
-        toastContainer.appendChild(toast);
-        
-        // Auto-remove toast after animation completes
-        setTimeout(() => {
-            if (toast.parentNode) {
-                toast.parentNode.removeChild(toast);
-            }
-        }, 3000);
-    }
-    
-    putSageToSleepOffline() {
-        // When offline, use two-video sleep sequence: transition -> looping sleep state
-        const face = document.getElementById('sage-face');
-        if (face) {
-            const source = face.querySelector('source');
-            if (source) {
-                console.log('Starting offline sleep sequence: transition video first');
-                
-                // Step 1: Play transition video (sage-sleeps.mp4) without looping
-                face.loop = false;
-                face.removeAttribute('loop');
-                
-                // Remove any existing event listeners
-                if (this.offlineSleepTransitionHandler) {
-                    face.removeEventListener('ended', this.offlineSleepTransitionHandler);
-                }
-                
-                // Create event listener to switch to sleep state video when transition ends
-                this.offlineSleepTransitionHandler = () => {
-                    console.log('Offline sleep transition video ended - switching to sleep state video');
-                    
-                    // Clear any existing timeout
-                    if (this.offlineSleepTimeout) {
-                        clearTimeout(this.offlineSleepTimeout);
-                        this.offlineSleepTimeout = null;
-                    }
-                    
-                    // Step 2: Switch to looping sleep state video (sage-asleep.mp4)
-                    source.src = '/personality/video/sage-asleep.mp4';
-                    face.loop = true;
-                    face.setAttribute('loop', '');
-                    
-                    face.load();
-                    face.play().catch(error => {
-                        console.log('Sleep state video play failed (offline):', error);
-                    });
-                    
-                    // Remove the transition event listener
-                    face.removeEventListener('ended', this.offlineSleepTransitionHandler);
-                    this.offlineSleepTransitionHandler = null;
-                };
-                
-                face.addEventListener('ended', this.offlineSleepTransitionHandler);
-                
-                // Add debugging event listeners
-                face.addEventListener('loadstart', () => {
-                    console.log('Sleep transition video: loadstart event');
-                });
-                
-                face.addEventListener('canplay', () => {
-                    console.log('Sleep transition video: canplay event');
-                });
-                
-                face.addEventListener('playing', () => {
-                    console.log('Sleep transition video: playing event');
-                });
-                
-                face.addEventListener('timeupdate', () => {
-                    console.log(`Sleep transition video: timeupdate - currentTime: ${face.currentTime}, duration: ${face.duration}`);
-                });
-                
-                // Start with transition video
-                source.src = '/personality/video/sage-sleeps.mp4';
-                face.load();
-                
-                // Add a timeout fallback in case the ended event doesn't fire
-                this.offlineSleepTimeout = setTimeout(() => {
-                    console.log('Sleep transition timeout reached - forcing switch to sleep state video');
-                    if (this.offlineSleepTransitionHandler) {
-                        this.offlineSleepTransitionHandler();
-                    }
-                }, 8000); // 8 second timeout (sage-sleeps.mp4 should be ~5 seconds)
-                
-                face.play().catch(error => {
-                    console.log('Sleep transition video play failed (offline):', error);
-                    // If transition video fails, go directly to sleep state
-                    if (this.offlineSleepTransitionHandler) {
-                        this.offlineSleepTransitionHandler();
-                    }
-                });
-            }
-        }
-    }
-    
-    wakeSageUpOnline() {
-        // When coming back online, wake Sage up using server API
-        this.wakeSageUp();
-    }
-    
-    updateStatus(status) {
-        const indicator = document.getElementById('status-indicator');
-        indicator.className = `status-${status}`;
-        indicator.textContent = status.charAt(0).toUpperCase() + status.slice(1);
-    }
-    
-    handleMessage(data) {
-        if (data.type === 'message') {
-            this.displayMessage(data.data, 'sage');
-            this.updatePersonality(data.data);
-        } else if (data.type === 'notification') {
-            this.displayMessage(data.data, 'system');
-            this.updatePersonality(data.data);
-        } else if (data.type === 'file_change') {
-            this.displayFileChange(data.data);
-        } else if (data.type === 'conflict_resolution') {
-            this.displayConflictResolution(data.data);
-        } else if (data.type === 'video_change') {
-            this.updatePersonality(data.data);
-            console.log('Video changed:', data.data.emotion, data.data.type);
-        } else if (data.type === 'thinking_start') {
-            this.showThinkingIndicator();
-        } else if (data.type === 'thinking_complete') {
-            this.removeThinkingIndicator();
-            console.log('Thinking completed:', data.data.response_time);
-            // Ensure scroll after thinking indicator is removed
-            setTimeout(() => this.scrollToBottom(), 100);
-        } else if (data.type === 'thinking_error') {
-            this.removeThinkingIndicator();
-            console.log('Thinking error:', data.data.message);
-            // Ensure scroll after error indicator is removed
-            setTimeout(() => this.scrollToBottom(), 100);
-        }
-    }
-    
-    displayMessage(messageData, sender) {
-        const messagesContainer = document.getElementById('messages');
-        const messageDiv = document.createElement('div');
-        messageDiv.className = `message ${sender}`;
-        
-        const senderName = sender === 'sage' ? 'Sage' : sender === 'user' ? 'You' : 'System';
-        const timestamp = new Date(parseInt(messageData.timestamp)).toLocaleTimeString();
-        
-        // Render markdown for Sage messages
-        let messageContent = messageData.message;
-        if (sender === 'sage') {
-            messageContent = this.renderMarkdown(messageData.message);
-        }
-        
-        messageDiv.innerHTML = `
-            <div class="message-header">${senderName}</div>
-            <div class="message-content">${messageContent}</div>
-            <div class="message-time">${timestamp}</div>
-        `;
-        
-        messagesContainer.appendChild(messageDiv);
-        
-        // Ensure scrolling happens after message content is fully rendered
-        // Use multiple timing checks for reliability
-        this.scrollToBottom();
-        setTimeout(() => this.scrollToBottom(), 50);
-        setTimeout(() => this.scrollToBottom(), 150);
-        setTimeout(() => this.scrollToBottom(), 300);
-    }
-    
-    showThinkingIndicator() {
-        const messagesContainer = document.getElementById('messages');
-        const thinkingDiv = document.createElement('div');
-        thinkingDiv.className = 'message sage thinking-indicator';
-        thinkingDiv.id = 'thinking-indicator';
-        
-        const timestamp = new Date().toLocaleTimeString();
-        
-        thinkingDiv.innerHTML = `
-            <div class="message-header">Sage</div>
-            <div class="message-content">
-                <div class="thinking-animation">
-                    <span class="thinking-dots">
-                        <span>.</span><span>.</span><span>.</span>
-                    </span>
-                    <span class="thinking-text">Thinking...</span>
-                </div>
-            </div>
-            <div class="message-time">${timestamp}</div>
-        `;
-        
-        messagesContainer.appendChild(thinkingDiv);
-        this.scrollToBottom();
-        
-        return thinkingDiv;
-    }
-    
-    scrollToBottom() {
-        const messagesContainer = document.getElementById('messages-container');
-        if (!messagesContainer) {
-            console.log('Messages container not found');
-            return;
-        }
-        
-        // Immediate scroll attempt
-        messagesContainer.scrollTop = messagesContainer.scrollHeight;
-        
-        // Use requestAnimationFrame to ensure DOM has updated before scrolling
-        requestAnimationFrame(() => {
-            const currentScrollHeight = messagesContainer.scrollHeight;
-            const currentScrollTop = messagesContainer.scrollTop;
-            
-            // Force scroll to bottom (immediate)
-            messagesContainer.scrollTop = messagesContainer.scrollHeight;
-            
-            // Also try smooth scroll
-            messagesContainer.scrollTo({
-                top: currentScrollHeight,
-                behavior: 'smooth'
-            });
-            
-            console.log(`Scroll - Height: ${currentScrollHeight}, Was: ${currentScrollTop}, Now: ${messagesContainer.scrollTop}`);
-        });
-        
-        // Additional fallback scrolls
-        setTimeout(() => {
-            messagesContainer.scrollTop = messagesContainer.scrollHeight;
-        }, 100);
-        
-        setTimeout(() => {
-            messagesContainer.scrollTop = messagesContainer.scrollHeight;
-        }, 500);
-    }
-    
-    removeThinkingIndicator() {
-        const thinkingIndicator = document.getElementById('thinking-indicator');
-        if (thinkingIndicator) {
-            thinkingIndicator.remove();
-            // Ensure scroll position is maintained after removing indicator
-            setTimeout(() => this.scrollToBottom(), 10);
-        }
-    }
-    
-    updatePersonality(messageData) {
-        const face = document.getElementById('sage-face');
-        const emotionSpan = document.getElementById('current-emotion');
-        const descriptionSpan = document.getElementById('emotion-description');
-        
-        if (messageData.video) {
-            // Update video source and play the new video
-            const source = face.querySelector('source');
-            if (source) {
-                // Check if this is a sleep video (either transition or direct sleep)
-                const isSleepVideo = messageData.video.includes('sage-sleeps') || 
-                                   messageData.video.includes('sage-blink-slow') ||
-                                   (messageData.emotion && messageData.emotion.toLowerCase() === 'sleep');
-                
-                if (isSleepVideo) {
-                    console.log(`Starting server-controlled sleep sequence: transition video - ${messageData.video}`);
-                    
-                    // Step 1: Play transition video (sage-sleeps.mp4) without looping
-                    face.loop = false;
-                    face.removeAttribute('loop');
-                    
-                    // Remove any existing event listeners
-                    face.removeEventListener('ended', this.handleServerSleepTransition);
-                    
-                    // Add event listener to switch to sleep state video when transition ends
-                    this.handleServerSleepTransition = () => {
-                        console.log('Server sleep transition video ended - switching to sleep state video');
-                        
-                        // Step 2: Switch to looping sleep state video (sage-asleep.mp4)
-                        source.src = '/personality/video/sage-asleep.mp4';
-                        face.loop = true;
-                        face.setAttribute('loop', '');
-                        
-                        face.load();
-                        face.play().catch(error => {
-                            console.log('Sleep state video play failed (server):', error);
-                        });
-                        
-                        // Remove the transition event listener
-                        face.removeEventListener('ended', this.handleServerSleepTransition);
-                    };
-                    
-                    face.addEventListener('ended', this.handleServerSleepTransition);
-                    
-                    // Start with transition video
-                    source.src = messageData.video;
-                    face.load();
-                    face.play().catch(error => {
-                        console.log('Server sleep transition video play failed:', error);
-                        // If transition video fails, go directly to sleep state
-                        this.handleServerSleepTransition();
-                    });
-                } else {
-                    // Handle all other videos (idle, emotions, wake, etc.)
-                    face.loop = true;
-                    face.setAttribute('loop', '');
-                    console.log(`Video: Enabled looping for ${messageData.emotion} video - ${messageData.video}`);
-                    
-                    // Remove any sleep transition event listeners for non-sleep videos
-                    if (this.handleServerSleepTransition) {
-                        face.removeEventListener('ended', this.handleServerSleepTransition);
-                        this.handleServerSleepTransition = null;
-                    }
-                    
-                    source.src = messageData.video;
-                    face.load(); // Reload the video element
-                    face.play().catch(error => {
-                        console.log('Video play failed:', error);
-                        // Auto-play might be blocked, try to play on user interaction
-                    });
-                }
-            }
-        }
-        
-        if (messageData.emotion && emotionSpan) {
-            emotionSpan.textContent = messageData.emotion.charAt(0).toUpperCase() + 
-                                    messageData.emotion.slice(1).replace('-', ' ');
-        }
-        
-        if (messageData.description && descriptionSpan) {
-            descriptionSpan.textContent = messageData.description;
-        }
-        
-        // Log video timing information for debugging
-        if (messageData.duration) {
-            console.log(`Video duration: ${messageData.duration}s, Emotion: ${messageData.emotion}, Type: ${messageData.type || 'message'}`);
-        }
-    }
-    
-    displayFileChange(data) {
-        this.displayMessage({
-            message: data.message,
-            timestamp: data.timestamp
-        }, 'system');
-        
-        // Could add special styling for file changes
-    }
-    
-    displayConflictResolution(data) {
-        const messagesContainer = document.getElementById('messages');
-        const conflictDiv = document.createElement('div');
-        conflictDiv.className = 'message system conflict';
-        
-        let optionsHtml = '';
-        data.options.forEach((option, index) => {
-            optionsHtml += `<button class="conflict-option" data-option="${index}">${option}</button>`;
-        });
-        
-        conflictDiv.innerHTML = `
-            <div class="message-header">Sage - Conflict Resolution Needed</div>
-            <div class="message-content">
-                ${data.message}
-                <div class="conflict-options">${optionsHtml}</div>
-            </div>
-            <div class="message-time">${new Date(parseInt(data.timestamp)).toLocaleTimeString()}</div>
-        `;
-        
-        messagesContainer.appendChild(conflictDiv);
-        messagesContainer.scrollTop = messagesContainer.scrollHeight;
-        
-        // Bind option buttons
-        conflictDiv.querySelectorAll('.conflict-option').forEach(button => {
-            button.addEventListener('click', (e) => {
-                const option = e.target.dataset.option;
-                this.sendConflictResolution(data.conflict_description, option);
-            });
-        });
-        
-        this.updatePersonality(data);
-    }
-    
-    sendMessage(message) {
-        if (this.ws && this.ws.readyState === WebSocket.OPEN) {
-            this.ws.send(JSON.stringify({
-                type: 'user_message',
-                message: message
-            }));
-            
-            this.displayMessage({
-                message: message,
-                timestamp: Date.now().toString()
-            }, 'user');
-        }
-    }
-    
-    sendConflictResolution(conflictDescription, selectedOption) {
-        if (this.ws && this.ws.readyState === WebSocket.OPEN) {
-            this.ws.send(JSON.stringify({
-                type: 'conflict_resolution',
-                conflict_description: conflictDescription,
-                selected_option: selectedOption
-            }));
-        }
-    }
-    
-    bindEvents() {
-        const messageInput = document.getElementById('message-input');
-        const sendButton = document.getElementById('send-button');
-        
-        sendButton.addEventListener('click', () => {
-            const message = messageInput.value.trim();
-            if (message) {
-                this.sendMessage(message);
-                messageInput.value = '';
-            }
-        });
-        
-        messageInput.addEventListener('keypress', (e) => {
-            if (e.key === 'Enter') {
-                sendButton.click();
-            }
-        });
-        
-        // Bind Sage toggle functionality
-        const sageToggle = document.getElementById('sage-toggle');
-        const toggleLabel = document.getElementById('toggle-label');
-        const sageFace = document.getElementById('sage-face');
-        
-        sageToggle.addEventListener('change', () => {
-            if (sageToggle.checked) {
-                // Show Sage
-                sageFace.classList.remove('hidden');
-                toggleLabel.textContent = 'Hide Sage';
-            } else {
-                // Hide Sage
-                sageFace.classList.add('hidden');
-                toggleLabel.textContent = 'Show Sage';
-            }
-        });
-        
-        // Load system stats and project data periodically
-        this.loadStats();
-        this.loadProjects();
-        this.loadAgents();
-        setInterval(() => {
-            this.loadStats();
-            this.loadProjects();
-            this.loadAgents();
-        }, 30000);
-        
-        // Enable video interaction on first user click to handle autoplay restrictions
-        document.addEventListener('click', this.enableVideoAutoplay.bind(this), { once: true });
-        
-        // Handle page focus/blur for sleep/wake functionality
-        this.bindFocusEvents();
-    }
-    
-    enableVideoAutoplay() {
-        const face = document.getElementById('sage-face');
-        if (face) {
-            face.muted = true; // Ensure muted for autoplay
-            face.play().catch(error => {
-                console.log('Initial video play failed:', error);
-            });
-        }
-    }
-    
-    async loadStats() {
-        try {
-            const response = await fetch('/api/status');
-            const data = await response.json();
-            this.updateStats(data);
-        } catch (error) {
-            console.error('Error loading stats:', error);
-        }
-    }
-    
-    updateStats(data) {
-        const statsContent = document.getElementById('stats-content');
-        statsContent.innerHTML = `
-            <div class="stat-item">
-                <span class="stat-label">Status</span>
-                <span class="stat-value">${data.status}</span>
-            </div>
-            <div class="stat-item">
-                <span class="stat-label">Connections</span>
-                <span class="stat-value">${data.connections}</span>
-            </div>
-            <div class="stat-item">
-                <span class="stat-label">Messages</span>
-                <span class="stat-value">${data.message_history_count}</span>
-            </div>
-            <div class="stat-item">
-                <span class="stat-label">Emotions</span>
-                <span class="stat-value">${data.personality.available_emotions.length}</span>
-            </div>
-        `;
-    }
-    
-    bindFocusEvents() {
-        // Handle page focus/blur events for sleep/wake functionality
-        window.addEventListener('blur', () => {
-            console.log('Page lost focus - putting Sage to sleep');
-            this.putSageToSleep();
-        });
-        
-        window.addEventListener('focus', () => {
-            console.log('Page gained focus - waking Sage up');
-            this.wakeSageUp();
-        });
-        
-        // Also handle visibility change API for better browser compatibility
-        document.addEventListener('visibilitychange', () => {
-            if (document.hidden) {
-                console.log('Page became hidden - putting Sage to sleep');
-                this.putSageToSleep();
-            } else {
-                console.log('Page became visible - waking Sage up');
-                this.wakeSageUp();
-            }
-        });
-    }
-    
-    async putSageToSleep() {
-        try {
-            const response = await fetch('/api/sleep', {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json'
-                }
-            });
-            const data = await response.json();
-            console.log('Sleep response:', data);
-        } catch (error) {
-            console.error('Error putting Sage to sleep:', error);
-        }
-    }
-    
-    async wakeSageUp() {
-        try {
-            const response = await fetch('/api/wake', {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json'
-                }
-            });
-            const data = await response.json();
-            console.log('Wake response:', data);
-        } catch (error) {
-            console.error('Error waking Sage up:', error);
-        }
-    }
-    
-    async loadProjects() {
-        try {
-            const response = await fetch('/api/projects');
-            const data = await response.json();
-            this.updateProjects(data.projects);
-        } catch (error) {
-            console.error('Error loading projects:', error);
-        }
-    }
-    
-    updateProjects(projects) {
-        const projectsList = document.getElementById('monitored-projects-list');
-        
-        if (projects.length === 0) {
-            projectsList.innerHTML = '<div class="project-item"><div class="project-info"><div class="project-name">No projects configured</div></div></div>';
-            return;
-        }
-        
-        projectsList.innerHTML = projects.map(project => `
-            <div class="project-item">
-                <div class="project-info">
-                    <div class="project-name">${project.name}</div>
-                    <div class="project-status">${project.status} • ${project.crew_config} • ${project.priority} priority</div>
-                </div>
-                <div class="activity-indicator">
-                    <div class="spinner ${project.is_active ? '' : 'hidden'}"></div>
-                    <span class="status-badge status-${project.is_active ? 'processing' : 'idle'}">
-                        ${project.is_active ? 'Active' : 'Idle'}
-                    </span>
-                </div>
-            </div>
-        `).join('');
-    }
-    
-    async loadAgents() {
-        try {
-            const response = await fetch('/api/agents');
-            const data = await response.json();
-            this.updateAgents(data.agents);
-        } catch (error) {
-            console.error('Error loading agents:', error);
-        }
-    }
-    
-    updateAgents(agents) {
-        const agentsList = document.getElementById('agents-list');
-        
-        if (agents.length === 0) {
-            agentsList.innerHTML = '<div class="agent-item"><div class="agent-info"><div class="agent-name">No agents configured</div></div></div>';
-            return;
-        }
-        
-        agentsList.innerHTML = agents.map(agent => `
-            <div class="agent-item">
-                <div class="agent-info">
-                    <div class="agent-name">${agent.name}</div>
-                    <div class="agent-status">${agent.status}</div>
-                </div>
-                <div class="activity-indicator">
-                    <div class="spinner ${agent.is_processing ? '' : 'hidden'}"></div>
-                    <span class="status-badge status-${agent.is_processing ? 'processing' : 'idle'}">
-                        ${agent.is_processing ? 'Processing' : 'Idle'}
-                    </span>
-                </div>
-            </div>
-        `).join('');
-    }
-}
-
-// Initialize the UI when the page loads
-document.addEventListener('DOMContentLoaded', () => {
-    window.sageUI = new SageUI();
-});'''
-        
-        with open(js_path, 'w') as f:
-            f.write(js_content)
+        _write_asset(template_path, _INDEX_HTML)
     
     async def start_server(self, host: str = "127.0.0.1", port: Optional[int] = None):
         """Start the web server."""
         if port is None:
             port = self.config.ui.browser.get("port", 8080)
         
-        # Create UI files
+        # Connections, history and the file monitor all live in this process,
+        # so the UI is served by one worker. Scale out with several Sage
+        # instances behind a proxy that routes on the session cookie.
+        if int(os.getenv("WEB_CONCURRENCY", "1")) > 1:
+            logging.warning("WEB_CONCURRENCY is ignored: Sage serves its UI from a single "
+                           f"worker; run more instances with sticky routing on '{_SESSION_COOKIE}'")
+        
+        # Keep templates/index.html in step with _INDEX_HTML
         self.create_html_template()
-        self.create_css_styles()
-        self.create_javascript()
+        
+        # With a certificate configured the UI is served over TLS, which
+        # lets browsers use HTTP/2 when hypercorn is installed
+        browser = self.config.ui.browser
+        certfile, keyfile = browser.get("ssl_certfile"), browser.get("ssl_keyfile")
+        scheme = "https" if certfile and keyfile else "http"
         
         # Auto-open browser if configured
-        if self.config.ui.browser.get("auto_open", True):
+        if browser.get("auto_open", True):
             def open_browser():
-                webbrowser.open(f"http://{host}:{port}")
+                webbrowser.open(f"{scheme}://{host}:{port}")
             
             # Delay browser opening to ensure server is ready
-            asyncio.get_event_loop().call_later(2, open_browser)
+            asyncio.get_running_loop().call_later(2, open_browser)
         
-        logging.info(f"Starting Sage web server on http://{host}:{port}")
+        logging.info(f"Starting Sage web server on {scheme}://{host}:{port}")
+        
+        if scheme == "https":
+            try:
+                from hypercorn.asyncio import serve
+                from hypercorn.config import Config as HypercornConfig
+            except ImportError:
+                logging.info("hypercorn not installed - serving HTTPS over HTTP/1.1 with uvicorn")
+            else:
+                # One multiplexed connection carries the page, assets and API calls
+                hypercorn_config = HypercornConfig()
+                hypercorn_config.bind = [f"{host}:{port}"]
+                hypercorn_config.certfile = certfile
+                hypercorn_config.keyfile = keyfile
+                hypercorn_config.alpn_protocols = ["h2", "http/1.1"]
+                await serve(self.app, hypercorn_config)
+                return
         
         # Create server config
         config = uvicorn.Config(
             self.app,
             host=host,
             port=port,
-            log_level="info"
+            log_level="info",
+            # A line per request is costly under dashboard and API traffic;
+            # keep access logs for --debug runs
+            access_log=logging.getLogger().isEnabledFor(logging.DEBUG),
+            ssl_certfile=certfile if scheme == "https" else None,
+            ssl_keyfile=keyfile if scheme == "https" else None,
+            # Broadcasts are compressed once up front; per-socket deflate
+            # would compress every frame again for each client
+            ws_per_message_deflate=False
         )
         
-        # Create and serve using the existing event loop
+        # Create and serve using the existing event loop. The loop itself is
+        # chosen before startup (uvloop when available, see use_uvloop), and
+        # uvicorn picks httptools/websockets from uvicorn[standard]
         server = uvicorn.Server(config)
         await server.serve()
     
@@ -2149,24 +1214,34 @@ document.addEventListener('DOMContentLoaded', () => {
         idle_response = self.personality.create_idle_response()
         logging.info(f"Initialized with idle video: {idle_response.get('video', 'unknown')} - Duration: {idle_response.get('duration', 'unknown')}s")
         
-        # Store the initial video data for later use
-        self.initial_video_data = idle_response
+        # New connections are sent the current video when they connect
+        self.current_video_data = idle_response
         
         # Use FastAPI startup event to ensure proper async context
         @self.app.on_event("startup")
         async def startup_video_timer():
             if self.video_timer_task is None:
+                self._video_kick = asyncio.Event()
                 self.video_timer_task = asyncio.create_task(self.video_timer_loop())
-                # Start initial video broadcast after a short delay
-                asyncio.create_task(self.send_initial_video(self.initial_video_data))
                 logging.info("✅ Video timer loop started successfully")
     
+    def _kick_video_timer(self):
+        """Wake video_timer_loop so it re-plans around new video timing or a new client."""
+        if self._video_kick is not None:
+            self._video_kick.set()
+    
     async def video_timer_loop(self):
         """Main video timing loop that checks when to change videos."""
         last_video_path = None
         
         while True:
             try:
+                if not self.manager.active_connections:
+                    # Nobody is watching - sleep until a client connects
+                    self._video_kick.clear()
+                    await self._video_kick.wait()
+                    continue
+                
                 # Check if it's time to change the video
                 if self.personality.should_change_video():
                     next_video_data = self.personality.get_next_video()
@@ -2177,10 +1252,7 @@ document.addEventListener('DOMContentLoaded', () => {
                         # Only broadcast and log if the video actually changed
                         if current_video_path != last_video_path:
                             # Broadcast the video change to all connected clients
-                            await self.manager.broadcast({
-                                "type": "video_change",
-                                "data": next_video_data
-                            })
+                            await self.broadcast_video(next_video_data)
                             
                             # Log with detailed information
                             emotion = next_video_data.get('emotion', 'unknown')
@@ -2195,8 +1267,17 @@ document.addEventListener('DOMContentLoaded', () => {
                             # Video hasn't actually changed, just debug log
                             logging.debug(f"Video timer check - no change needed")
                 
-                # Check every second for video timing
-                await asyncio.sleep(1.0)
+                # Sleep until the current video ends or its timing changes;
+                # timing read below already reflects any earlier kick
+                self._video_kick.clear()
+                delay = self.personality.time_until_next_change()
+                if delay is not None and delay <= 0:
+                    # No new video was scheduled (e.g. none configured) - retry shortly
+                    delay = 1.0
+                try:
+                    await asyncio.wait_for(self._video_kick.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
                 
             except Exception as e:
                 logging.error(f"Error in video timer loop: {e}")
@@ -2241,14 +1322,10 @@ document.addEventListener('DOMContentLoaded', () => {
         await asyncio.sleep(0.5)
         self.personality.complete_task()
     
-    async def send_initial_video(self, video_data: Dict[str, Any]):
-        """Send initial video to connected clients after a short delay."""
-        # Wait a moment for any initial connections
-        await asyncio.sleep(2.0)
-        
-        if self.manager.active_connections:
-            await self.manager.broadcast({
-                "type": "video_change",
-                "data": video_data
-            })
-            logging.info(f"Sent initial video to {len(self.manager.active_connections)} connected clients")
+    async def broadcast_video(self, video_data: Dict[str, Any]):
+        """Switch every client to a new video and remember it for new connections."""
+        self.current_video_data = video_data
+        await self.manager.broadcast({
+            "type": "video_change",
+            "data": video_data
+        })
@@ -53,14 +53,11 @@ def create_test_config():
     return config
 
 
-async def test_crew_creation():
+async def check_crew_creation(crew_manager: CrewManager):
     """Test that crews can be created successfully."""
     logger.info("Testing crew creation...")
     
     try:
-        config = create_test_config()
-        crew_manager = CrewManager(config)
-        
         # Check if crews were created
         if "test_crew" in crew_manager.crews:
             logger.info("✅ Test crew created successfully")
@@ -89,14 +86,11 @@ async def test_crew_creation():
         traceback.print_exc()
 
 
-async def test_task_creation():
+async def check_task_creation(crew_manager: CrewManager):
     """Test that agents can create tasks."""
     logger.info("Testing task creation...")
     
     try:
-        config = create_test_config()
-        crew_manager = CrewManager(config)
-        
         # Test context for task creation
         test_context = {
             "project_path": Path("."),
@@ -108,16 +102,20 @@ async def test_task_creation():
         if "test_crew" in crew_manager.agents:
             agents = crew_manager.agents["test_crew"]
             
-            for agent_name, agent in agents.items():
-                try:
-                    tasks = agent.create_tasks(test_context)
-                    logger.info(f"✅ Agent {agent_name} created {len(tasks)} tasks")
-                    
-                    for i, task in enumerate(tasks):
-                        logger.info(f"   Task {i+1}: {task.description[:100]}...")
-                        
-                except Exception as e:
-                    logger.error(f"❌ Agent {agent_name} failed to create tasks: {e}")
+            # Let the agents build their tasks concurrently
+            results = await asyncio.gather(*(
+                asyncio.to_thread(agent.create_tasks, test_context) for agent in agents.values()
+            ), return_exceptions=True)
+            
+            for agent_name, tasks in zip(agents, results):
+                if isinstance(tasks, Exception):
+                    logger.error(f"❌ Agent {agent_name} failed to create tasks: {tasks}")
+                    continue
+                
+                logger.info(f"✅ Agent {agent_name} created {len(tasks)} tasks")
+                
+                for i, task in enumerate(tasks):
+                    logger.info(f"   Task {i+1}: {task.description[:100]}...")
         else:
             logger.error("❌ No test crew found for task creation test")
             
@@ -127,14 +125,11 @@ async def test_task_creation():
         traceback.print_exc()
 
 
-async def test_tools():
+async def check_tools(crew_manager: CrewManager):
     """Test that agent tools work correctly."""
     logger.info("Testing agent tools...")
     
     try:
-        config = create_test_config()
-        crew_manager = CrewManager(config)
-        
         # Get test crew agents
         if "test_crew" in crew_manager.agents:
             agents = crew_manager.agents["test_crew"]
@@ -168,13 +163,22 @@ async def main():
     logger.info("🚀 Starting Sage Agent Tests")
     logger.info("=" * 50)
     
-    await test_crew_creation()
+    # One crew manager is shared by every test
+    try:
+        crew_manager = CrewManager(create_test_config())
+    except Exception as e:
+        logger.error(f"❌ Error creating crew manager: {e}")
+        import traceback
+        traceback.print_exc()
+        return
+    
+    await check_crew_creation(crew_manager)
     logger.info("-" * 30)
     
-    await test_task_creation()
+    await check_task_creation(crew_manager)
     logger.info("-" * 30)
     
-    await test_tools()
+    await check_tools(crew_manager)
     logger.info("-" * 30)
     
     logger.info("🎯 Sage Agent Tests Complete")
@@ -0,0 +1,55 @@
+"""Tests for the personality video scheduling."""
+
+import orjson
+
+from sage.ui.personality import PersonalitySystem
+
+
+def _neutral_only(tmp_path):
+    """A personality with no sleep or wake expressions configured."""
+    expressions = tmp_path / "expressions.json"
+    expressions.write_bytes(orjson.dumps({
+        "emotions": {
+            "neutral": {
+                "videos": [{"location": "./video/neutral.mp4", "duration": 5.0}],
+                "description": "Neutral",
+                "use_cases": []
+            }
+        },
+        "idle_videos": {"videos": [{"location": "./video/idle.mp4", "duration": 5.0}]}
+    }))
+    
+    personality = PersonalitySystem(expressions)
+    kicks = []
+    personality.on_video_schedule_change = lambda: kicks.append(True)
+    return personality, kicks
+
+
+def test_wake_up_without_wake_video_restarts_scheduling(tmp_path):
+    personality, kicks = _neutral_only(tmp_path)
+    personality.create_idle_response()
+    
+    personality.go_to_sleep()
+    assert personality.time_until_next_change() is None
+    
+    kicks.clear()
+    personality.wake_up()
+    
+    # The timer loop is woken and gets a finite deadline again
+    assert kicks
+    assert personality.time_until_next_change() is not None
+    
+    # Once the current video runs out, idle videos resume
+    personality.current_video_start_time -= personality.current_video_duration
+    next_video = personality.get_next_video()
+    assert next_video is not None
+    assert next_video["video"] == "./video/idle.mp4"
+
+
+def test_task_emotions_kick_the_scheduler(tmp_path):
+    personality, kicks = _neutral_only(tmp_path)
+    
+    personality.start_task("neutral")
+    personality.add_task_emotion("neutral")
+    
+    assert len(kicks) == 2